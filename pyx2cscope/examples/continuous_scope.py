@@ -0,0 +1,44 @@
+"""PyX2CScope continuous acquisition example reference.
+
+This example captures scope data continuously on a background thread. The scope is re-armed right after every
+readout, the main thread only consumes the frames and prints the acquisition figures.
+"""
+
+import logging
+import queue
+
+from pyx2cscope.utils import get_com_port, get_elf_file_path
+from pyx2cscope.x2cscope import X2CScope
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    filename=__file__ + ".log",
+)
+
+# X2C Scope Set up
+x2c_scope = X2CScope(port=get_com_port(), elf_file=get_elf_file_path())
+x2c_scope.add_scope_channel(x2c_scope.get_variable("motor.apiData.velocityMeasured"))
+x2c_scope.add_scope_channel(x2c_scope.get_variable("motor.idq.q"))
+x2c_scope.set_sample_time(1)
+x2c_scope.get_scope_sample_time(50)  # scope task runs every 50 us
+
+acquisition = x2c_scope.start_acquisition()
+frames = acquisition.subscribe(maxsize=4)
+
+for _ in range(50):
+    try:
+        frame = frames.get(timeout=2)
+    except queue.Empty:
+        print("No scope data received")
+        break
+    velocity = frame["motor.apiData.velocityMeasured"]
+    print(f"frame {frame.sequence}: {len(frame)} samples, {frame.duration:.1f} ms, max velocity {velocity.max()}")
+
+x2c_scope.stop_acquisition()
+stats = acquisition.get_stats()
+print(
+    f"{stats.captures_per_second:.1f} captures/s, read time {stats.read_time * 1000:.1f} ms, "
+    f"dead time {stats.dead_time * 1000:.1f} ms, dropped {frames.dropped}"
+)
+x2c_scope.disconnect()
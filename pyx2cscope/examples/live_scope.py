@@ -1,8 +1,6 @@
 """This example can be used to try the scope functionality of pyX2Cscope and save the data acquisition in CSV file."""
 
-import csv
 import logging
-import time
 
 import matplotlib.pyplot as plt
 
@@ -32,6 +30,8 @@ for var in variables:
     x2c_scope.add_scope_channel(x2c_scope.get_variable(var))
 
 x2c_scope.set_sample_time(1)
+# Sample time of the scope task on the firmware in microseconds, used to build the time axis
+x2c_scope.get_scope_sample_time(50)
 
 # Create the plot
 plt.ion()  # Turn on interactive mode
@@ -39,27 +39,23 @@ fig, ax = plt.subplots()
 
 # Main loop
 nr_of_samples = 10  # Increase the number of samples if needed
-data_storage = {}
+frame = None
 
 # request scope to start sampling data
 x2c_scope.request_scope_data()
 
 while nr_of_samples > 0:
-    # check if scope data is already available
-    if x2c_scope.is_scope_data_ready():
+    # wait until the scope data is available, at most one second
+    if x2c_scope.wait_for_scope_data(timeout=1.0):
         logging.info("Scope data is ready.")
 
-        for channel, data in x2c_scope.get_scope_channel_data().items():
-            data_storage[channel] = data
+        frame = x2c_scope.get_scope_frame()
 
         ax.clear()
-        for channel, data in data_storage.items():
-            # Assuming data is sampled at 1 kHz, adjust as needed
-            time_values = [i * 0.001 for i in range(len(data))]  # milliseconds
-            # time_values = [i * 0.000001 for i in range(len(data))]  # microseconds
-            ax.plot(time_values, data, label=f"Channel {channel}")
+        for channel in frame:
+            ax.plot(frame.time, frame[channel], label=f"Channel {channel}")
 
-        ax.set_xlabel("Time (ms)")  # Change axis label accordingly
+        ax.set_xlabel("Time (ms)")
         ax.set_ylabel("Value")
         ax.set_title("Live Plot of Byte Data")
         ax.legend()
@@ -69,9 +65,6 @@ while nr_of_samples > 0:
         nr_of_samples -= 1
         x2c_scope.request_scope_data()
 
-    # wait for 100 ms before calling is_scope_data_ready() again
-    time.sleep(0.1)
-
 plt.ioff()  # Turn off interactive mode after the loop
 plt.show()
 
@@ -79,18 +72,6 @@ logging.info("Data collection complete.")
 
 # Data Storage
 csv_file_path = "scope_data.csv"
-max_length = max(len(data) for data in data_storage.values())
-
-with open(csv_file_path, mode="w", newline="") as file:
-    writer = csv.DictWriter(file, fieldnames=data_storage.keys())
-    writer.writeheader()
-    for i in range(max_length):
-        row = {
-            channel: (
-                data_storage[channel][i] if i < len(data_storage[channel]) else None
-            )
-            for channel in data_storage
-        }
-        writer.writerow(row)
+frame.to_csv(csv_file_path)
 
 logging.info(f"Data saved in {csv_file_path}")
@@ -0,0 +1,32 @@
+"""PyX2CScope memory dump example reference.
+
+This example reads a RAM region of the target in one call and decodes it into named values using the variables
+parsed from the ELF file. This is useful as post-mortem capture after a fault.
+"""
+
+import logging
+
+import numpy as np
+
+from pyx2cscope.utils import get_com_port, get_elf_file_path
+from pyx2cscope.x2cscope import X2CScope
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    filename=__file__ + ".log",
+)
+
+# X2C Scope Set up
+x2c_scope = X2CScope(port=get_com_port(), elf_file=get_elf_file_path())
+
+# Dump 4 KB starting at the address of the motor structure
+start = x2c_scope.get_variable("motor.apiData.velocityMeasured").info.address
+dump = x2c_scope.dump_memory(start, 4096, progress=lambda done, total: print(f"{done}/{total} bytes"))
+
+# Keep the raw data for later analysis
+np.save("memory_dump.npy", dump)
+
+# Decode every variable located inside the dump
+for name, value in x2c_scope.decode_memory(dump, start).items():
+    print(name, value)
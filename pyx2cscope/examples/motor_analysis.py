@@ -0,0 +1,40 @@
+"""PyX2CScope motor analysis example reference.
+
+This example captures two phase currents, a phase voltage and the electrical angle of a running motor and prints
+frequency, RMS, THD and phase angle per electrical cycle, together with the speed derived from the angle.
+"""
+
+import logging
+
+from pyx2cscope.scope.motor import analyze_cycles, get_speed
+from pyx2cscope.utils import get_com_port, get_elf_file_path
+from pyx2cscope.x2cscope import X2CScope
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    filename=__file__ + ".log",
+)
+
+# X2C Scope Set up
+x2c_scope = X2CScope(port=get_com_port(), elf_file=get_elf_file_path())
+for name in ["motor.iabc.a", "motor.iabc.b", "motor.vabc.a", "motor.estimator.qEstimator.qElectricalAngle"]:
+    x2c_scope.add_scope_channel(x2c_scope.get_variable(name))
+x2c_scope.set_sample_time(1)
+x2c_scope.get_scope_sample_time(50)  # scope task runs every 50 us
+
+x2c_scope.request_scope_data()
+if x2c_scope.wait_for_scope_data(timeout=5):
+    frame = x2c_scope.get_scope_frame()
+    analysis = analyze_cycles(frame, "motor.iabc.a", ["motor.iabc.a", "motor.iabc.b", "motor.vabc.a"])
+    for k in range(len(analysis)):
+        print(
+            f"cycle {k}: {analysis.frequency[k]:.1f} Hz, "
+            f"RMS {analysis.rms['motor.iabc.a'][k]:.0f}, "
+            f"THD {analysis.get_thd('motor.iabc.a')[k] * 100:.1f} %, "
+            f"phase {analysis.get_phase('motor.vabc.a', 'motor.iabc.a')[k]:.1f} deg"
+        )
+    # the electrical angle is a 16 bit value, the motor has 5 pole pairs
+    speed = get_speed(frame, "motor.estimator.qEstimator.qElectricalAngle", 65536, pole_pairs=5)
+    print(f"mean speed {speed.mean():.0f} RPM")
+x2c_scope.disconnect()
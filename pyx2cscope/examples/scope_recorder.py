@@ -0,0 +1,39 @@
+"""PyX2CScope scope recorder example reference.
+
+This example streams every capture of a continuous acquisition to disk instead of keeping it in memory, so long
+tests run with constant memory. The recording is read back as memory mapped arrays afterwards.
+"""
+
+import logging
+import time
+
+from pyx2cscope.scope.recorder import ScopeRecorder, iter_recording
+from pyx2cscope.utils import get_com_port, get_elf_file_path
+from pyx2cscope.x2cscope import X2CScope
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    filename=__file__ + ".log",
+)
+
+# X2C Scope Set up
+x2c_scope = X2CScope(port=get_com_port(), elf_file=get_elf_file_path())
+x2c_scope.add_scope_channel(x2c_scope.get_variable("motor.apiData.velocityMeasured"))
+x2c_scope.add_scope_channel(x2c_scope.get_variable("motor.idq.q"))
+x2c_scope.set_sample_time(1)
+x2c_scope.get_scope_sample_time(50)  # scope task runs every 50 us
+
+# Record for 10 seconds, a new file is started every 100 MB. Existing recordings are not overwritten.
+prefix = time.strftime("scope_recording_%Y%m%d_%H%M%S")
+with ScopeRecorder(prefix, max_file_size=100 * 1024 * 1024) as recorder:
+    recorder.attach(x2c_scope.start_acquisition())
+    time.sleep(10)
+    x2c_scope.stop_acquisition()
+print(f"{recorder.captures} captures written to {recorder.files}")
+x2c_scope.disconnect()
+
+# Analyse the recording without loading it into memory
+for recording in iter_recording(prefix):
+    current = recording["motor.idq.q"]  # shape (captures, samples)
+    print(f"{recording.filename}: {len(recording)} captures, max current {current.max()}")
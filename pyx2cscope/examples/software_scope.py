@@ -0,0 +1,52 @@
+"""PyX2CScope software scope example reference.
+
+This example samples more variables than the firmware scope supports from the host, as fast as the link allows.
+Every sample gets a host timestamp, frames around a software trigger event are written to a recording.
+"""
+
+import logging
+import time
+
+from pyx2cscope.scope.recorder import ScopeRecorder
+from pyx2cscope.scope.software import TIME_CHANNEL, SoftwareScope
+from pyx2cscope.utils import get_com_port, get_elf_file_path
+from pyx2cscope.x2cscope import X2CScope
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    filename=__file__ + ".log",
+)
+
+# X2C Scope Set up
+x2c_scope = X2CScope(port=get_com_port(), elf_file=get_elf_file_path())
+names = [
+    "motor.apiData.velocityMeasured",
+    "motor.apiData.velocityReference",
+    "motor.idq.q",
+    "motor.idq.d",
+    "motor.vdq.q",
+    "motor.vdq.d",
+    "motor.iabc.a",
+    "motor.iabc.b",
+    "motor.iabc.c",
+    "motor.vDC",
+]
+software_scope = SoftwareScope(x2c_scope, [x2c_scope.get_variable(name) for name in names])
+
+# Record 200 samples around every time the velocity exceeds the limit
+VELOCITY_LIMIT = 3000  # RPM
+software_scope.set_trigger(lambda sample: sample["motor.apiData.velocityMeasured"] > VELOCITY_LIMIT, pre=100, post=100)
+with ScopeRecorder(time.strftime("software_scope_%Y%m%d_%H%M%S")) as recorder:
+    recorder.attach(software_scope)
+    software_scope.start()
+    time.sleep(60)
+    software_scope.stop()
+
+stats = software_scope.get_stats()
+print(
+    f"{stats.samples_per_second:.0f} samples/s, {stats.triggers} trigger events, latency {stats.latency * 1e3:.2f} ms"
+)
+latest = software_scope.get_samples(last=1000)
+print(f"the last 1000 samples span {latest[TIME_CHANNEL][-1] - latest[TIME_CHANNEL][0]:.3f} s")
+x2c_scope.disconnect()
@@ -0,0 +1,45 @@
+"""PyX2CScope transfer benchmark example reference.
+
+This example measures the throughput of bulk memory reads for different chunk sizes and compares it with the chunk
+size chosen by the transfer planner of the connected interface. Run it once per interface (Serial, TCP/IP, CAN) to
+check the planner picks the fastest chunk size for the link.
+"""
+
+import logging
+import time
+
+from pyx2cscope.transfer import get_link_profile
+from pyx2cscope.utils import get_com_port, get_elf_file_path
+from pyx2cscope.x2cscope import X2CScope
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    filename=__file__ + ".log",
+)
+
+# X2C Scope Set up
+x2c_scope = X2CScope(port=get_com_port(), elf_file=get_elf_file_path())
+profile = get_link_profile(x2c_scope.interface)
+
+# Read the scope data array, it is the largest RAM region available on every X2Cscope firmware
+start = x2c_scope.get_variable("ScopeArray").info.address
+length = 4096
+repetitions = 5
+
+
+def measure(max_chunk_size=None):
+    """Return the throughput in bytes per second of dump_memory for the given chunk size limit."""
+    x2c_scope.set_link_profile(profile, max_chunk_size)
+    begin = time.perf_counter()
+    for _ in range(repetitions):
+        x2c_scope.dump_memory(start, length)
+    return repetitions * length / (time.perf_counter() - begin)
+
+
+print(f"Interface: {profile.name}, planned chunk size: {x2c_scope.get_transfer_planner().read_chunk_size}")
+for chunk_size in (8, 32, 64, 128, 200, 248, 250, 253):
+    print(f"chunk size {chunk_size:3}: {measure(chunk_size):9.0f} bytes/s")
+print(f"planner        : {measure():9.0f} bytes/s")
+
+x2c_scope.disconnect()
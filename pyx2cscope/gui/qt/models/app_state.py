@@ -11,6 +11,8 @@ from typing import Any, Dict, List, Optional
 
 from PyQt5.QtCore import QMutex, QObject, pyqtSignal
 
+from pyx2cscope.scope.frame import ScopeFrame
+from pyx2cscope.scope.progressive import ProgressiveReadout
 from pyx2cscope.variable.variable_factory import FileType
 from pyx2cscope.x2cscope import TriggerConfig, X2CScope
 
@@ -138,6 +140,7 @@ class AppState(QObject):
         self._sample_time_factor: int = 1
         self._scope_sample_time_us: int = 50
         self._real_sample_time: float = 0.0
+        self._scope_readout: Optional[ProgressiveReadout] = None
 
         # Dynamic watch variables (Tab3 - WatchView)
         self._live_watch_vars: List[WatchVariable] = []
@@ -630,6 +633,10 @@ class AppState(QObject):
         try:
             if self._x2cscope:
                 self._x2cscope.request_scope_data()
+                # untriggered captures are read while the firmware is still sampling
+                self._scope_readout = None
+                if ProgressiveReadout.is_supported(self._x2cscope):
+                    self._scope_readout = self._x2cscope.get_progressive_readout()
         finally:
             self._mutex.unlock()
 
@@ -656,6 +663,9 @@ class AppState(QObject):
         self._mutex.lock()
         try:
             if self._x2cscope:
+                # skip the status request while the capture cannot be complete yet
+                if self._x2cscope.get_scope_time_to_ready() > 0:
+                    return False
                 return self._x2cscope.is_scope_data_ready()
         except Exception as e:
             logging.error(f"Error checking scope data ready: {e}")
@@ -668,13 +678,70 @@ class AppState(QObject):
         self._mutex.lock()
         try:
             if self._x2cscope:
-                return self._x2cscope.get_scope_channel_data()
+                return self._x2cscope.get_current_scope_frame().to_dict()
         except Exception as e:
             logging.error(f"Error getting scope data: {e}")
         finally:
             self._mutex.unlock()
         return {}
 
+    def get_scope_frame(self) -> Optional[ScopeFrame]:
+        """Get the scope capture as ScopeFrame (thread-safe)."""
+        self._mutex.lock()
+        try:
+            if self._x2cscope:
+                return self._x2cscope.get_current_scope_frame()
+        except Exception as e:
+            logging.error(f"Error getting scope frame: {e}")
+        finally:
+            self._mutex.unlock()
+        return None
+
+    def get_scope_poll_delay(self, max_delay: float) -> Optional[float]:
+        """Get the time to wait before the next poll_scope_frame (thread-safe).
+
+        Args:
+            max_delay (float): The longest delay in seconds, the regular scope poll interval.
+
+        Returns:
+            float: The delay in seconds, see X2CScope.get_scope_poll_delay. None while an untriggered capture is read
+                progressively or if the capture time cannot be predicted.
+        """
+        self._mutex.lock()
+        try:
+            if self._x2cscope and self._scope_readout is None:
+                return self._x2cscope.get_scope_poll_delay(max_delay)
+        finally:
+            self._mutex.unlock()
+        return None
+
+    def poll_scope_frame(self) -> Optional[ScopeFrame]:
+        """Get the data of the current capture read so far (thread-safe).
+
+        Returns:
+            ScopeFrame: A partial frame of an untriggered capture, the complete frame once the capture is done or
+                None if no new data is available.
+        """
+        self._mutex.lock()
+        try:
+            if not self._x2cscope:
+                return None
+            if self._scope_readout is not None:
+                frame = self._scope_readout.poll()
+                if self._scope_readout.complete:
+                    self._scope_readout = None
+                return frame
+            # skip the status request while the capture cannot be complete yet
+            if self._x2cscope.get_scope_time_to_ready() > 0:
+                return None
+            if self._x2cscope.is_scope_data_ready():
+                return self._x2cscope.get_current_scope_frame()
+        except Exception as e:
+            logging.error(f"Error polling scope frame: {e}")
+        finally:
+            self._mutex.unlock()
+        return None
+
     # ============= Scope Settings Properties =============
 
     @property
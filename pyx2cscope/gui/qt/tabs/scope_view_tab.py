@@ -1,12 +1,12 @@
 """ScopeView tab (Tab2) - Scope capture and trigger configuration."""
 
 import logging
-from typing import TYPE_CHECKING, Dict, List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
 import numpy as np
 import pyqtgraph as pg
 from PyQt5 import QtCore
-from PyQt5.QtCore import QRegExp, Qt, pyqtSignal, pyqtSlot
+from PyQt5.QtCore import QRectF, QRegExp, Qt, pyqtSignal, pyqtSlot
 from PyQt5.QtGui import QColor, QIcon, QPixmap, QRegExpValidator
 from PyQt5.QtWidgets import (
     QCheckBox,
@@ -24,6 +24,11 @@ from PyQt5.QtWidgets import (
 
 from pyx2cscope.gui.qt.dialogs.variable_selection import VariableSelectionDialog
 from pyx2cscope.gui.qt.tabs.base_tab import BaseTab
+from pyx2cscope.scope.computed import parse_definitions
+from pyx2cscope.scope.decimate import LTTB, METHODS, MINMAX
+from pyx2cscope.scope.frame import ScopeFrame
+from pyx2cscope.scope.motor import analyze_cycles, get_speed
+from pyx2cscope.scope.spectrum import HANN, Spectrogram, SpectrumAnalyzer
 from pyx2cscope.x2cscope import TriggerConfig
 
 if TYPE_CHECKING:
@@ -38,12 +43,19 @@ class ScopeViewTab(BaseTab):
     - Configurable trigger mode, edge, level, and delay
     - Single-shot and continuous capture modes
     - Real-time plotting with pyqtgraph
+    - Amplitude spectrum of the channels, averaged over consecutive captures
+    - Spectrogram of one channel over the last captures
+    - Computed channels defined by expressions over the scope channels
+    - Frequency, RMS, THD and phase per electrical cycle, speed from a position channel
     """
 
     # Signal emitted when scope sampling state changes: (is_sampling, is_single_shot)
     scope_sampling_changed = pyqtSignal(bool, bool)
 
     MAX_CHANNELS = 8
+    # spectra shown by the spectrogram and its dynamic range below the peak in dB
+    SPECTROGRAM_ROWS = 100
+    SPECTROGRAM_RANGE_DB = 60
 
     def __init__(self, app_state: "AppState", parent=None):
         """Initialize the ScopeView tab.
@@ -57,6 +69,10 @@ class ScopeViewTab(BaseTab):
         self._trigger_variable: Optional[str] = None
         self._sampling_active: bool = False
         self._real_sampletime: float = 0.0
+        self._decimation: Optional[str] = MINMAX
+        self._spectrum_analyzer = SpectrumAnalyzer(HANN)
+        self._spectrogram: Optional[Spectrogram] = None
+        self._computed_names: List[str] = []
 
         # Widget lists
         self._var_line_edits: List[QLineEdit] = []
@@ -92,8 +108,34 @@ class ScopeViewTab(BaseTab):
         self._plot_widget.setBackground("w")
         self._plot_widget.showGrid(x=True, y=True)
         self._plot_widget.getViewBox().setMouseMode(pg.ViewBox.RectMode)
+        self.set_decimation(self._decimation)
         layout.addWidget(self._plot_widget, stretch=2)
 
+        # Cycle analysis results, shown if enabled in the trigger configuration
+        self._analysis_label = QLabel()
+        self._analysis_label.setWordWrap(True)
+        self._analysis_label.setVisible(False)
+        layout.addWidget(self._analysis_label)
+
+        # Spectrum plot, shown if enabled in the trigger configuration
+        self._spectrum_widget = pg.PlotWidget()
+        self._spectrum_widget.setBackground("w")
+        self._spectrum_widget.showGrid(x=True, y=True)
+        self._spectrum_widget.setLogMode(y=True)
+        self._spectrum_widget.setLabel("left", "Amplitude")
+        self._spectrum_widget.setVisible(False)
+        layout.addWidget(self._spectrum_widget, stretch=1)
+
+        # Spectrogram of one channel, time from left to right and frequency from bottom to top
+        self._spectrogram_widget = pg.PlotWidget()
+        self._spectrogram_widget.setBackground("w")
+        self._spectrogram_widget.setLabel("bottom", "Capture")
+        self._spectrogram_image = pg.ImageItem()
+        self._spectrogram_image.setColorMap(pg.colormap.get("inferno"))
+        self._spectrogram_widget.addItem(self._spectrogram_image)
+        self._spectrogram_widget.setVisible(False)
+        layout.addWidget(self._spectrogram_widget, stretch=1)
+
         # Main grid for trigger config and variable selection (below plot)
         main_grid = QGridLayout()
         layout.addLayout(main_grid)
@@ -162,14 +204,63 @@ class ScopeViewTab(BaseTab):
         self._trigger_delay_combo.setCurrentText("0")
         grid.addWidget(self._trigger_delay_combo, 6, 1)
 
+        row = self._add_analysis_controls(grid, 7)
+
         # Sample button
         self._sample_button = QPushButton("Sample")
         self._sample_button.setFixedSize(100, 30)
         self._sample_button.clicked.connect(self._on_sample_clicked)
-        grid.addWidget(self._sample_button, 7, 0, 1, 2)
+        grid.addWidget(self._sample_button, row, 0, 1, 2)
 
         return group
 
+    def _add_analysis_controls(self, grid: QGridLayout, row: int) -> int:
+        """Add the spectrum, spectrogram and cycle analysis controls to the trigger configuration grid.
+
+        Returns:
+            The first grid row after the controls.
+        """
+        # Spectrum and number of averaged captures
+        self._spectrum_checkbox = QCheckBox("Spectrum")
+        self._spectrum_checkbox.stateChanged.connect(self._on_spectrum_changed)
+        grid.addWidget(self._spectrum_checkbox, row, 0)
+        self._spectrum_averages_spin = QSpinBox()
+        self._spectrum_averages_spin.setMinimum(1)
+        self._spectrum_averages_spin.setMaximum(100)
+        self._spectrum_averages_spin.setPrefix("Averages: ")
+        self._spectrum_averages_spin.valueChanged.connect(self._on_spectrum_changed)
+        grid.addWidget(self._spectrum_averages_spin, row, 1)
+
+        # Spectrogram of the selected channel, the channels of the last capture are offered
+        self._spectrogram_checkbox = QCheckBox("Spectrogram")
+        self._spectrogram_checkbox.stateChanged.connect(self._on_spectrogram_changed)
+        grid.addWidget(self._spectrogram_checkbox, row + 1, 0)
+        self._spectrogram_combo = QComboBox()
+        self._spectrogram_combo.currentTextChanged.connect(self._on_spectrogram_changed)
+        grid.addWidget(self._spectrogram_combo, row + 1, 1)
+
+        # Cycle analysis of the visible channels, cycles and phase referenced to the selected channel
+        self._analysis_checkbox = QCheckBox("Cycle Analysis")
+        self._analysis_checkbox.setToolTip("Frequency, RMS, THD and phase per electrical cycle of the visible channels")
+        self._analysis_checkbox.stateChanged.connect(
+            lambda state: self._analysis_label.setVisible(self._analysis_checkbox.isChecked())
+        )
+        grid.addWidget(self._analysis_checkbox, row + 2, 0)
+        self._reference_combo = QComboBox()
+        self._reference_combo.setToolTip("Channel the cycles are detected on and the phase is measured from")
+        grid.addWidget(self._reference_combo, row + 2, 1)
+
+        # Speed from a position or angle channel, none if the first (empty) item is selected
+        grid.addWidget(QLabel("Speed Position:"), row + 3, 0)
+        self._speed_combo = QComboBox()
+        self._speed_combo.addItem("")
+        grid.addWidget(self._speed_combo, row + 3, 1)
+        grid.addWidget(QLabel("Counts/Revolution:"), row + 4, 0)
+        self._speed_counts_edit = QLineEdit("65536")
+        self._speed_counts_edit.setValidator(self.decimal_validator)
+        grid.addWidget(self._speed_counts_edit, row + 4, 1)
+        return row + 5
+
     def _create_variable_group(self) -> QGroupBox:  # noqa: PLR0915
         """Create the variable selection group box."""
         group = QGroupBox("Variable Selection")
@@ -241,6 +332,15 @@ class ScopeViewTab(BaseTab):
             self._visible_checkboxes.append(visible_cb)
             grid.addWidget(visible_cb, row, 5)
 
+        # Computed channels, e.g. "power = motor.vdq.q * motor.idq.q; error = ref - meas"
+        grid.addWidget(QLabel("Computed"), self.MAX_CHANNELS + 1, 0)
+        self._computed_edit = QLineEdit()
+        self._computed_edit.setPlaceholderText("name = expression; ...")
+        self._computed_edit.setToolTip(
+            "Channels computed from the scope channels, e.g. power = motor.vdq.q * motor.idq.q"
+        )
+        grid.addWidget(self._computed_edit, self.MAX_CHANNELS + 1, 1, 1, 5)
+
         return group
 
     def _populate_color_combo(self, combo: QComboBox):
@@ -338,6 +438,8 @@ class ScopeViewTab(BaseTab):
                         x2cscope.add_scope_channel(variable)
                         logging.debug(f"Added scope channel: {var_name}")
 
+            self._set_computed_channels(x2cscope)
+
             # Set sample time
             sample_time_factor = int(self._sample_time_factor_edit.text() or "1")
             x2cscope.set_sample_time(sample_time_factor)
@@ -350,6 +452,9 @@ class ScopeViewTab(BaseTab):
             self._configure_trigger()
 
             # Start sampling
+            self._spectrum_analyzer.reset()
+            if self._spectrogram is not None:
+                self._spectrogram.reset()
             self._sampling_active = True
             self._sample_button.setText("Stop")
             x2cscope.request_scope_data()
@@ -363,6 +468,22 @@ class ScopeViewTab(BaseTab):
             error_msg = f"Error starting sampling: {e}"
             logging.error(error_msg)
 
+    def _set_computed_channels(self, x2cscope):
+        """Replace the computed channels of x2cscope by the definitions of the computed channel field."""
+        x2cscope.computed_channels.clear()
+        self._computed_names = []
+        try:
+            definitions = parse_definitions(self._computed_edit.text())
+        except ValueError as e:
+            logging.error(f"Error in computed channels: {e}")
+            return
+        for name, expression in definitions.items():
+            try:
+                x2cscope.add_computed_channel(name, expression)
+                self._computed_names.append(name)
+            except ValueError as e:
+                logging.error(f"Error in computed channel {name}: {e}")
+
     def _stop_sampling(self):
         """Stop scope sampling."""
         self._sampling_active = False
@@ -430,47 +551,217 @@ class ScopeViewTab(BaseTab):
         except Exception as e:
             logging.error(f"Error configuring trigger: {e}")
 
-    @pyqtSlot(dict)
-    def on_scope_data_ready(self, data: Dict[str, List[float]]):
+    @pyqtSlot(object)
+    def on_scope_data_ready(self, frame: "ScopeFrame"):
         """Handle scope data ready signal from data poller.
 
         Args:
-            data: Dictionary of channel name to data values.
+            frame: The scope capture with channel data and time axis.
         """
         if not self._sampling_active:
             return
 
         self._plot_widget.clear()
 
-        for i, (channel, values) in enumerate(data.items()):
-            if i >= self.MAX_CHANNELS:
-                break
-
-            if self._visible_checkboxes[i].isChecked():
-                scale_factor = self.safe_float(self._scaling_edits[i].text(), 1.0)
-                offset = self.safe_float(self._offset_edits[i].text(), 0.0)
-                time_values = np.linspace(0, self._real_sampletime, len(values))
-                data_scaled = (np.array(values, dtype=float) * scale_factor) + offset
-
-                # Get color from combo box (RGB tuple)
-                color = self._get_color_from_combo(self._color_combos[i])
-
-                self._plot_widget.plot(
-                    time_values,
-                    data_scaled,
-                    pen=pg.mkPen(color=color, width=2),
-                    name=f"{channel}",
-                )
+        self._update_channel_combo(self._spectrogram_combo, frame.names)
+        self._update_channel_combo(self._reference_combo, [style[0] for style in self._get_channel_styles(frame.names)])
+        self._update_channel_combo(self._speed_combo, [""] + frame.names)
+        if self._spectrum_checkbox.isChecked():
+            self._plot_spectrum(frame)
+        if self._spectrogram_checkbox.isChecked():
+            self._plot_spectrogram(frame)
+        if self._analysis_checkbox.isChecked() and frame.complete:
+            self._show_cycle_analysis(frame)
+
+        if self._decimation == LTTB:
+            # about 2 points per pixel, min/max decimation is done by pyqtgraph depending on the zoom
+            frame = frame.decimate(2 * max(self._plot_widget.width(), 1), LTTB)
+
+        for channel, scale_factor, offset, pen in self._get_channel_styles(frame.names):
+            self._plot_widget.plot(
+                frame.time,
+                frame.scaled(channel, scale_factor, offset),
+                pen=pen,
+                name=f"{channel}",
+            )
 
         self._plot_widget.setLabel("left", "Value")
         self._plot_widget.setLabel("bottom", "Time", units="ms")
         self._plot_widget.showGrid(x=True, y=True)
 
-        # Handle single-shot mode - stop sampling after receiving data
-        if self._single_shot_checkbox.isChecked():
+        # Handle single-shot mode - stop sampling once the capture is complete, untriggered captures are shown
+        # progressively in partial frames before
+        if self._single_shot_checkbox.isChecked() and frame.complete:
             self._stop_sampling()
         # Note: In continuous mode, DataPoller handles requesting next data
 
+    def _plot_spectrum(self, frame: "ScopeFrame"):
+        """Add a complete capture to the averaged spectrum and plot it.
+
+        Args:
+            frame: The scope capture, the frequency axis is derived from its sample period.
+        """
+        spectrum = self._spectrum_analyzer.add(frame)
+        if spectrum is None:
+            return
+
+        self._spectrum_widget.clear()
+        for channel, scale_factor, _, pen in self._get_channel_styles(list(spectrum.amplitudes)):
+            # skip the DC bin, it is removed before the FFT and can't be shown on the log scale
+            self._spectrum_widget.plot(
+                spectrum.frequencies[1:],
+                spectrum.amplitudes[channel][1:] * abs(scale_factor),
+                pen=pen,
+                name=f"{channel}",
+            )
+        if frame.sample_period is None:
+            self._spectrum_widget.setLabel("bottom", "Frequency", units="1/sample")
+        else:
+            self._spectrum_widget.setLabel("bottom", "Frequency", units="Hz")
+
+    def _plot_spectrogram(self, frame: "ScopeFrame"):
+        """Add a complete capture to the spectrogram of the selected channel and show it in dB.
+
+        Args:
+            frame: The scope capture, partial frames and frames without the channel are ignored.
+        """
+        channel = self._spectrogram_combo.currentText()
+        if not channel:
+            return
+        if self._spectrogram is None or self._spectrogram.channel != channel:
+            self._spectrogram = Spectrogram(channel, self.SPECTROGRAM_ROWS, HANN)
+        self._spectrogram.add(frame)
+        if not self._spectrogram.count:
+            return
+
+        image = 20 * np.log10(np.maximum(self._spectrogram.get_image(), 1e-12))
+        peak = image.max()
+        self._spectrogram_image.setImage(image, autoLevels=False, levels=(peak - self.SPECTROGRAM_RANGE_DB, peak))
+        self._spectrogram_image.setRect(QRectF(0, 0, len(image), self._spectrogram.frequencies[-1]))
+        unit = "1/sample" if frame.sample_period is None else "Hz"
+        self._spectrogram_widget.setTitle(f"{channel}, peak {peak:.1f} dB")
+        self._spectrogram_widget.setLabel("left", "Frequency", units=unit)
+
+    @staticmethod
+    def _update_channel_combo(combo: QComboBox, names: List[str]):
+        """Offer the channels of the last capture in a combo box, keeping the selected channel.
+
+        Args:
+            combo: The channel selection.
+            names: The channel names of the frame.
+        """
+        selected = combo.currentText()
+        items = list(names) + ([selected] if selected and selected not in names else [])
+        if items == [combo.itemText(i) for i in range(combo.count())]:
+            return
+        combo.blockSignals(True)
+        combo.clear()
+        combo.addItems(items)
+        combo.setCurrentText(selected)
+        combo.blockSignals(False)
+
+    @staticmethod
+    def _select_channel(combo: QComboBox, channel: str):
+        """Select a channel in a combo box, added if it wasn't part of the last capture.
+
+        Args:
+            combo: The channel selection.
+            channel: The channel name, nothing is selected if empty.
+        """
+        if channel and combo.findText(channel) < 0:
+            combo.addItem(channel)
+        combo.setCurrentText(channel)
+
+    def _show_cycle_analysis(self, frame: "ScopeFrame"):
+        """Show frequency, RMS, THD and phase of the visible channels and the speed of the position channel.
+
+        The cycles are detected on the selected reference channel, on the first visible channel if it isn't
+        visible, and the phase is measured from it.
+
+        Args:
+            frame: The complete scope capture, the channels are scaled by gain and offset before the analysis.
+        """
+        styles = self._get_channel_styles(frame.names)
+        if not styles:
+            self._analysis_label.setText("")
+            return
+        scaled = ScopeFrame(
+            {channel: frame.scaled(channel, gain, offset) for channel, gain, offset, _ in styles},
+            sample_period=frame.sample_period,
+        )
+        reference = self._reference_combo.currentText()
+        summary = analyze_cycles(scaled, reference if reference in scaled else styles[0][0]).get_summary()
+        if not summary["cycles"]:
+            text = [f"No complete cycle of {summary['reference']}"]
+        else:
+            unit = "1/sample" if frame.sample_period is None else "Hz"
+            text = [f"{summary['cycles']} cycles of {summary['reference']}, {summary['frequency']:.4g} {unit}"]
+            for channel, rms in summary["rms"].items():
+                thd = summary["thd"][channel]
+                line = f"{channel}: RMS {rms:.4g}, THD " + ("n/a" if thd is None else f"{thd * 100:.2f} %")
+                if channel != summary["reference"]:
+                    phase = summary["phase"][channel]
+                    line += ", phase " + ("n/a" if phase is None else f"{phase:.1f}°")
+                text.append(line)
+        position = self._speed_combo.currentText()
+        counts = self.safe_float(self._speed_counts_edit.text(), 0.0)
+        if position in frame and frame.sample_period is not None and counts > 0:
+            speed = get_speed(frame, position, counts)
+            text.append(f"speed from {position}: {np.mean(speed):.4g} rpm")
+        self._analysis_label.setText(" | ".join(text))
+
+    def _get_channel_styles(self, names: List[str]) -> List[tuple]:
+        """Get the visible channels to be plotted with their gain, offset and pen.
+
+        Scope channels use the settings of their row, computed channels follow them as dashed lines.
+
+        Args:
+            names: The channel names of the frame.
+
+        Returns:
+            List of (channel, gain, offset, pen) tuples.
+        """
+        styles = []
+        scope_channels = [name for name in names if name not in self._computed_names]
+        for i, channel in enumerate(scope_channels[: self.MAX_CHANNELS]):
+            if self._visible_checkboxes[i].isChecked():
+                scale_factor = self.safe_float(self._scaling_edits[i].text(), 1.0)
+                offset = self.safe_float(self._offset_edits[i].text(), 0.0)
+                # Get color from combo box (RGB tuple)
+                color = self._get_color_from_combo(self._color_combos[i])
+                styles.append((channel, scale_factor, offset, pg.mkPen(color=color, width=2)))
+        colors = list(self._colors.values())
+        for i, channel in enumerate(name for name in self._computed_names if name in names):
+            pen = pg.mkPen(color=colors[i % len(colors)], width=2, style=Qt.DashLine)
+            styles.append((channel, 1.0, 0.0, pen))
+        return styles
+
+    def _on_spectrum_changed(self, *args):
+        """Show or hide the spectrum plot and restart the averaging."""
+        self._spectrum_widget.setVisible(self._spectrum_checkbox.isChecked())
+        self._spectrum_analyzer = SpectrumAnalyzer(HANN, self._spectrum_averages_spin.value())
+
+    def _on_spectrogram_changed(self, *args):
+        """Show or hide the spectrogram and restart it."""
+        self._spectrogram_widget.setVisible(self._spectrogram_checkbox.isChecked())
+        self._spectrogram = None
+        self._spectrogram_image.clear()
+
+    def set_decimation(self, method: Optional[str]):
+        """Select how large captures are reduced for plotting.
+
+        MINMAX uses the peak downsampling of pyqtgraph on the visible range, so zooming shows all samples again.
+        LTTB decimates every capture before plotting, None plots every sample.
+
+        Args:
+            method: MINMAX, LTTB or None.
+        """
+        if method is not None and method not in METHODS:
+            raise ValueError(f"Unknown decimation method: {method}")
+        self._decimation = method
+        self._plot_widget.setDownsampling(auto=method == MINMAX, mode="peak")
+        self._plot_widget.setClipToView(method == MINMAX)
+
     def _update_plot(self):
         """Update the plot (called when scale or visibility changes)."""
         # The plot will be updated on next data ready signal
@@ -503,6 +794,15 @@ class ScopeViewTab(BaseTab):
             "trigger_mode": self._trigger_mode_combo.currentText(),
             "sample_time_factor": self._sample_time_factor_edit.value(),
             "single_shot": self._single_shot_checkbox.isChecked(),
+            "spectrum": self._spectrum_checkbox.isChecked(),
+            "spectrum_averages": self._spectrum_averages_spin.value(),
+            "spectrogram": self._spectrogram_checkbox.isChecked(),
+            "spectrogram_channel": self._spectrogram_combo.currentText(),
+            "computed": self._computed_edit.text(),
+            "cycle_analysis": self._analysis_checkbox.isChecked(),
+            "cycle_reference": self._reference_combo.currentText(),
+            "speed_position": self._speed_combo.currentText(),
+            "speed_counts": self._speed_counts_edit.text(),
         }
 
     def load_config(self, config: dict):
@@ -545,3 +845,12 @@ class ScopeViewTab(BaseTab):
         self._trigger_mode_combo.setCurrentText(config.get("trigger_mode", "Disable"))
         self._sample_time_factor_edit.setValue(int(config.get("sample_time_factor", 1)))
         self._single_shot_checkbox.setChecked(config.get("single_shot", False))
+        self._spectrum_averages_spin.setValue(int(config.get("spectrum_averages", 1)))
+        self._spectrum_checkbox.setChecked(config.get("spectrum", False))
+        self._select_channel(self._spectrogram_combo, config.get("spectrogram_channel", ""))
+        self._spectrogram_checkbox.setChecked(config.get("spectrogram", False))
+        self._computed_edit.setText(config.get("computed", ""))
+        self._analysis_checkbox.setChecked(config.get("cycle_analysis", False))
+        self._select_channel(self._reference_combo, config.get("cycle_reference", ""))
+        self._select_channel(self._speed_combo, config.get("speed_position", ""))
+        self._speed_counts_edit.setText(config.get("speed_counts", "65536"))
@@ -24,7 +24,7 @@ class DataPoller(QThread):
         watch_var_updated: Emitted when a watch variable value is read.
             Args: (index: int, name: str, value: float)
         scope_data_ready: Emitted when scope data is available.
-            Args: (data: dict)
+            Args: (frame: ScopeFrame)
         live_var_updated: Emitted when a Tab3 live variable is read.
             Args: (index: int, name: str, value: float)
         error_occurred: Emitted when an error occurs during polling.
@@ -33,7 +33,7 @@ class DataPoller(QThread):
 
     # Signals for thread-safe UI updates
     watch_var_updated = pyqtSignal(int, str, float)  # index, name, value
-    scope_data_ready = pyqtSignal(dict)  # channel_data
+    scope_data_ready = pyqtSignal(object)  # ScopeFrame
     live_var_updated = pyqtSignal(int, str, float)  # index, name, value
     error_occurred = pyqtSignal(str)  # error message
     plot_data_ready = pyqtSignal()  # signal to update plot
@@ -74,7 +74,7 @@ class DataPoller(QThread):
 
         # Track last poll times
         last_watch_poll = 0.0
-        last_scope_poll = 0.0
+        next_scope_poll = 0.0
         last_live_poll = 0.0
 
         while self._running:
@@ -87,11 +87,11 @@ class DataPoller(QThread):
                         self._poll_watch_variables()
                         last_watch_poll = current_time
 
-                # Poll scope data (Tab2)
+                # Poll scope data (Tab2), scheduled by the predicted end of the capture
                 if self._scope_polling_enabled:
-                    if current_time - last_scope_poll >= self._scope_interval_ms:
+                    if current_time >= next_scope_poll:
                         self._poll_scope_data()
-                        last_scope_poll = current_time
+                        next_scope_poll = current_time + self._get_scope_poll_delay_ms()
 
                 # Poll live variables (Tab3)
                 if self._live_polling_enabled:
@@ -183,21 +183,30 @@ class DataPoller(QThread):
         if not self._app_state.is_connected():
             return
 
-        if self._app_state.is_scope_data_ready():
-            data = self._app_state.get_scope_channel_data()
-            if data:
-                self.scope_data_ready.emit(data)
-
-                # Handle single-shot mode
-                self._mutex.lock()
-                is_single_shot = self._scope_single_shot
-                self._mutex.unlock()
-
-                if is_single_shot:
-                    self.set_scope_polling_enabled(False)
-                else:
-                    # Request next data
-                    self._app_state.request_scope_data()
+        frame = self._app_state.poll_scope_frame()
+        if frame is None or not frame.channels:
+            return
+        self.scope_data_ready.emit(frame)
+
+        # partial frames of a running capture are only plotted
+        if not frame.complete:
+            return
+
+        # Handle single-shot mode
+        self._mutex.lock()
+        is_single_shot = self._scope_single_shot
+        self._mutex.unlock()
+
+        if is_single_shot:
+            self.set_scope_polling_enabled(False)
+        else:
+            # Request next data
+            self._app_state.request_scope_data()
+
+    def _get_scope_poll_delay_ms(self) -> float:
+        """Get the time until the next scope poll, the scope interval if the capture time cannot be predicted."""
+        delay = self._app_state.get_scope_poll_delay(self._scope_interval_ms / 1000)
+        return self._scope_interval_ms if delay is None else delay * 1000
 
     # ============= Live Variables (Tab3) =============
 
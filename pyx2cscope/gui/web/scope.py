@@ -7,9 +7,20 @@ import numbers
 import time
 from pathlib import Path
 
+import numpy as np
+
 from pyx2cscope.gui.web import extensions
+from pyx2cscope.scope.computed import ComputedChannels, parse_definitions
+from pyx2cscope.scope.decimate import METHODS, MINMAX
+from pyx2cscope.scope.frame import ScopeFrame
+from pyx2cscope.scope.motor import analyze_cycles, get_speed
+from pyx2cscope.scope.spectrum import HANN, Spectrogram, SpectrumAnalyzer
 from pyx2cscope.x2cscope import TriggerConfig, X2CScope
 
+# spectra kept by the spectrogram and frequency bins sent per spectrum
+SPECTROGRAM_ROWS = 100
+SPECTROGRAM_BINS = 256
+
 
 class WebScope:
     """WebScope class for managing watch and scope variables in the web GUI."""
@@ -25,6 +36,22 @@ class WebScope:
         self.scope_burst = False
         self.scope_sample_time = 1
         self.scope_time_sampling = 50e-3
+        self.scope_frame = None
+        # decimation method and samples per channel of the scope data sent to each view
+        self.plot_decimation = {"scope": (MINMAX, 2000), "dashboard": (MINMAX, 1000)}
+        # averaged spectrum of the scope channels, None if disabled
+        self.spectrum_analyzer = None
+        # rolling spectrogram of one scope channel, None if disabled
+        self.spectrogram = None
+        # frequency, RMS, THD and phase per electrical cycle sent with the scope data
+        self.cycle_analysis = False
+        # channel the cycles are detected on, the first enabled channel if empty or not captured
+        self.cycle_reference = ""
+        # position channel and its counts per revolution of the speed sent with the cycle analysis
+        self.speed_position = ""
+        self.speed_counts = 65536.0
+        # definitions of the computed channels, "name = expression" separated by semicolons
+        self.computed_channels = ""
         self.variables_file = ""
 
         self.dashboard_vars = {}  # {var_name: Variable object}
@@ -39,7 +66,7 @@ class WebScope:
         if value is None:
             with self._lock:
                 value = variable.get_value()
-        value = round(value, 4) if primitive == "float" else value
+        value = round(value, 4) if isinstance(value, float) else value
         return {
             "live": 0,
             "variable": variable,
@@ -77,7 +104,7 @@ class WebScope:
     @staticmethod
     def _update_watch_fields(data: dict):
         data["scaled_value"] = data["value"] * data["scaling"] + data["offset"]
-        if data["type"] == "float":
+        if isinstance(data["value"], float):
             data["value"] = round(data["value"], 4)
             data["scaled_value"] = round(data["scaled_value"], 4)
 
@@ -369,6 +396,21 @@ class WebScope:
                     self.x2c_scope.request_scope_data()
                 self.scope_trigger = trigger_action
 
+    def get_scope_poll_delay(self, max_delay: float) -> float:
+        """Get the time to wait before the next scope_poll, based on the predicted end of the capture.
+
+        Args:
+            max_delay (float): The regular poll interval in seconds.
+
+        Returns:
+            float: The delay in seconds, max_delay if no capture is running or its time cannot be predicted.
+        """
+        with self._lock:
+            if self.x2c_scope is None or not self.scope_trigger:
+                return max_delay
+            delay = self.x2c_scope.get_scope_poll_delay(max_delay)
+        return max_delay if delay is None else delay
+
     def scope_poll(self):
         """Poll scope data and return datasets when ready.
 
@@ -378,44 +420,27 @@ class WebScope:
                 is a dict of {var_name: [samples]} with raw data for all scope channels.
         """
         with self._lock:
-            if self.scope_trigger:
+            if self.scope_trigger and self.x2c_scope.get_scope_time_to_ready() == 0:
                 if self.x2c_scope.is_scope_data_ready():
-                    channel_data = self.x2c_scope.get_scope_channel_data()
-                    datasets = self._get_scope_datasets(channel_data, self.scope_vars)
-                    size = len(datasets[0]["data"]) if len(datasets) > 0 else 1000
-                    # scope_time_sampling is total buffer time, divide by size to get time per sample
-                    time_per_sample = self.scope_time_sampling / size if size > 0 else self.scope_time_sampling
-                    labels = [round(i * time_per_sample, 1) for i in range(size)]
+                    self.scope_frame = self.x2c_scope.get_current_scope_frame()
+                    plot_frame = self._decimate(self.scope_frame, "scope")
+                    computed = self.x2c_scope.computed_channels.names
+                    datasets = self._get_scope_datasets(plot_frame, self.scope_vars, computed)
+                    labels = plot_frame.cached("labels", lambda: np.round(plot_frame.time, 1).tolist())
+                    scope_data = {"datasets": datasets, "labels": labels}
+                    if self.spectrum_analyzer is not None:
+                        scope_data["spectrum"] = self._get_spectrum_data(self.scope_frame)
+                    if self.spectrogram is not None:
+                        scope_data["spectrogram"] = self._get_spectrogram_data(self.scope_frame)
+                    if self.cycle_analysis:
+                        scope_data["analysis"] = self._get_cycle_analysis(self.scope_frame)
 
                     # Build raw data dict for dashboard (gain/offset applied per channel)
-                    dashboard_data = {}
-                    for channel in self.scope_vars:
-                        name = channel["variable"].info.name
-                        if name in channel_data:
-                            dashboard_data[name] = [
-                                sample * channel["gain"] + channel["offset"]
-                                for sample in channel_data[name]
-                            ]
-
-                    # Build raw data dict for dashboard (gain/offset applied per channel)
-                    dashboard_data = {}
-                    for channel in self.scope_vars:
-                        name = channel["variable"].info.name
-                        if name in channel_data:
-                            dashboard_data[name] = [
-                                sample * channel["gain"] + channel["offset"]
-                                for sample in channel_data[name]
-                            ]
-
-                    # Build raw data dict for dashboard (gain/offset applied per channel)
-                    dashboard_data = {}
-                    for channel in self.scope_vars:
-                        name = channel["variable"].info.name
-                        if name in channel_data:
-                            dashboard_data[name] = [
-                                sample * channel["gain"] + channel["offset"]
-                                for sample in channel_data[name]
-                            ]
+                    dashboard_frame = self._decimate(self.scope_frame, "dashboard")
+                    dashboard_data = {
+                        dataset["label"]: dataset["data"]
+                        for dataset in self._get_scope_datasets(dashboard_frame, self.scope_vars, computed)
+                    }
 
                     if self.scope_burst:
                         self.scope_burst = False
@@ -423,33 +448,211 @@ class WebScope:
                     else:
                         self.x2c_scope.request_scope_data()
 
-                    return {"datasets": datasets, "labels": labels}, dashboard_data
+                    return scope_data, dashboard_data
             return {}, {}
 
+    def _decimate(self, frame, view):
+        method, points = self.plot_decimation[view]
+        return frame.decimate(points, method)
+
+    def set_plot_decimation(self, view: str, method, points: int):
+        """Select how the scope data sent to a view is decimated, exports always hold all samples.
+
+        Args:
+            view (str): "scope" or "dashboard".
+            method (str): "minmax", "lttb" or "none".
+            points (int): The number of samples per channel, about 2 times the chart width in pixels.
+        """
+        method = None if method in (None, "", "none") else method
+        if view not in self.plot_decimation:
+            raise ValueError(f"Unknown view: {view}")
+        if method is not None and method not in METHODS:
+            raise ValueError(f"Unknown decimation method: {method}")
+        with self._lock:
+            self.plot_decimation[view] = (method, max(int(points), 3))
+
+    def set_spectrum(self, enabled: bool, averages: int = 1):
+        """Enable or disable the spectrum of the scope channels sent with the scope data.
+
+        Args:
+            enabled (bool): Send the spectrum with every complete capture.
+            averages (int): The number of captures averaged. Defaults to 1.
+        """
+        with self._lock:
+            self.spectrum_analyzer = SpectrumAnalyzer(HANN, int(averages)) if enabled else None
+
+    def _get_spectrum_data(self, frame):
+        """Add a capture to the averaged spectrum and build the spectrum chart data.
+
+        Args:
+            frame (ScopeFrame): The complete scope capture, not decimated.
+
+        Returns:
+            dict: Datasets, frequency labels and unit, empty if the frame can't be analysed.
+        """
+        spectrum = self.spectrum_analyzer.add(frame)
+        if spectrum is None or len(spectrum.frequencies) < 2:  # noqa: PLR2004
+            return {}
+        gains = {channel["variable"].info.name: channel["gain"] for channel in self.scope_vars}
+        datasets = []
+        for dataset in self._get_scope_datasets(frame, self.scope_vars, self.x2c_scope.computed_channels.names):
+            # the DC bin is removed before the FFT, skip it for the logarithmic axis
+            amplitudes = spectrum.amplitudes[dataset["label"]][1:] * abs(gains.get(dataset["label"], 1))
+            datasets.append({**dataset, "data": amplitudes.tolist()})
+        return {
+            "datasets": datasets,
+            "labels": np.round(spectrum.frequencies[1:], 3).tolist(),
+            "unit": "1/sample" if frame.sample_period is None else "Hz",
+        }
+
+    def set_spectrogram(self, channel: str):
+        """Select the scope channel of the spectrogram sent with the scope data.
+
+        Args:
+            channel (str): The channel name, an empty string disables the spectrogram.
+        """
+        with self._lock:
+            self.spectrogram = Spectrogram(channel, SPECTROGRAM_ROWS, HANN) if channel else None
+
+    def _get_spectrogram_data(self, frame):
+        """Add a capture to the spectrogram and build the heatmap data.
+
+        The frequency bins of every spectrum are reduced to at most SPECTROGRAM_BINS by their maximum, so peaks
+        stay visible.
+
+        Args:
+            frame (ScopeFrame): The complete scope capture, not decimated.
+
+        Returns:
+            dict: The channel, the amplitudes in dB (oldest spectrum first), the highest frequency and its unit,
+                empty if the channel is not part of the capture.
+        """
+        self.spectrogram.add(frame)
+        if not self.spectrogram.count:
+            return {}
+        image = self.spectrogram.get_image()
+        bins = -(-image.shape[1] // SPECTROGRAM_BINS)
+        image = np.maximum.reduceat(image, np.arange(0, image.shape[1], bins), axis=1)
+        return {
+            "channel": self.spectrogram.channel,
+            "image": np.round(20 * np.log10(np.maximum(image, 1e-12)), 1).tolist(),
+            "max_frequency": float(self.spectrogram.frequencies[-1]),
+            "unit": "1/sample" if frame.sample_period is None else "Hz",
+        }
+
+    def set_cycle_analysis(
+        self, enabled: bool, reference: str = "", position: str = "", counts_per_revolution: float = 65536.0
+    ):
+        """Enable or disable the cycle analysis sent with the scope data.
+
+        Args:
+            enabled (bool): Send frequency, RMS, THD and phase per electrical cycle with every capture.
+            reference (str): The channel the cycles are detected on and the phase is measured from. Defaults to
+                the first enabled channel.
+            position (str): The position or angle channel the speed is derived from. Defaults to no speed.
+            counts_per_revolution (float): The position change of one revolution. Defaults to 65536.
+
+        Raises:
+            ValueError: If counts_per_revolution is not positive.
+        """
+        counts_per_revolution = float(counts_per_revolution)
+        if counts_per_revolution <= 0:
+            raise ValueError("Counts per revolution must be positive")
+        with self._lock:
+            self.cycle_analysis = bool(enabled)
+            self.cycle_reference = reference or ""
+            self.speed_position = position or ""
+            self.speed_counts = counts_per_revolution
+
+    def _get_cycle_analysis(self, frame):
+        """Analyse the cycles of the enabled scope channels, detected on the selected reference channel.
+
+        Args:
+            frame (ScopeFrame): The complete scope capture, the channels are scaled by gain and offset first.
+
+        Returns:
+            dict: The summary of CycleAnalysis with the phase relative to the reference, the frequency unit and
+                the mean speed in rpm if a position channel is selected, empty if no channel is enabled.
+        """
+        channels = [
+            channel for channel in self.scope_vars
+            if channel["enable"] and channel["variable"].info.name in frame
+        ]
+        if not channels:
+            return {}
+        scaled = ScopeFrame(
+            {
+                channel["variable"].info.name: frame.scaled(
+                    channel["variable"].info.name, channel["gain"], channel["offset"]
+                )
+                for channel in channels
+            },
+            sample_period=frame.sample_period,
+        )
+        reference = self.cycle_reference if self.cycle_reference in scaled else scaled.names[0]
+        summary = analyze_cycles(scaled, reference).get_summary()
+        summary["unit"] = "1/sample" if frame.sample_period is None else "Hz"
+        if self.speed_position in frame and frame.sample_period is not None:
+            speed = get_speed(frame, self.speed_position, self.speed_counts)
+            summary["speed"] = {"position": self.speed_position, "rpm": float(np.mean(speed))}
+        return summary
+
+    def set_computed_channels(self, definitions: str):
+        """Replace the computed channels added to every scope capture.
+
+        Args:
+            definitions (str): "name = expression" definitions separated by semicolons or new lines, e.g.
+                "power = motor.vdq.q * motor.idq.q; error = ref - meas".
+
+        Raises:
+            ValueError: If a definition is invalid, the computed channels are not changed then.
+        """
+        channels = ComputedChannels()
+        for name, expression in parse_definitions(definitions).items():
+            channels.add(name, expression)
+        with self._lock:
+            self.computed_channels = definitions
+            if self.x2c_scope is not None:
+                self.x2c_scope.computed_channels = channels
+
+    @staticmethod
+    def _get_scaled_list(frame, name, gain, offset):
+        """Get the scaled samples of a channel as list, computed once per frame for all views."""
+        return frame.cached(("scaled", name, gain, offset), lambda: frame.scaled(name, gain, offset).tolist())
+
     @staticmethod
-    def _get_scope_datasets(channel_data, scope_vars):
-        """Build scope chart datasets from channel data.
+    def _get_scope_datasets(frame, scope_vars, computed=()):
+        """Build scope chart datasets from a scope frame.
 
         Args:
-            channel_data (dict): Raw channel data from X2CScope.
+            frame (ScopeFrame): The scope capture read from X2CScope.
             scope_vars (list): List of scope variable dictionaries.
+            computed (list): Names of the computed channels, shown dashed after the scope channels.
 
         Returns:
             list: List of dataset dictionaries for each channel.
         """
         data = []
         for channel in scope_vars:
-            if channel["variable"].info.name in channel_data:
+            if channel["variable"].info.name in frame:
                 variable = channel["variable"].info.name
-                data_line = [
-                    sample * channel["gain"] + channel["offset"] for sample in channel_data[variable]
-                ]
                 item = {
                     "label": variable,
                     "pointRadius": 0,
                     "borderColor": channel["color"],
                     "backgroundColor": channel["color"],
-                    "data": data_line,
+                    "data": WebScope._get_scaled_list(frame, variable, channel["gain"], channel["offset"]),
+                }
+                data.append(item)
+        for name in computed:
+            if name in frame:
+                item = {
+                    "label": name,
+                    "pointRadius": 0,
+                    "borderColor": "#666666",
+                    "backgroundColor": "#666666",
+                    "borderDash": [6, 3],
+                    "data": WebScope._get_scaled_list(frame, name, 1, 0),
                 }
                 data.append(item)
         return data
@@ -460,8 +663,8 @@ class WebScope:
         Returns:
             list: List of dataset dictionaries for each channel.
         """
-        channel_data = self.x2c_scope.get_scope_channel_data()
-        return self._get_scope_datasets(channel_data, self.scope_vars)
+        self.scope_frame = self.x2c_scope.get_current_scope_frame()
+        return self._get_scope_datasets(self.scope_frame, self.scope_vars, self.x2c_scope.computed_channels.names)
 
     def get_scope_chart_label(self, size=100):
         """Generate time labels for scope chart.
@@ -472,6 +675,8 @@ class WebScope:
         Returns:
             list: List of time values.
         """
+        if self.scope_frame is not None and self.scope_frame.sample_period is not None:
+            return (np.arange(size) * self.scope_frame.sample_period).tolist()
         return [i * self.scope_time_sampling for i in range(0, size)]
 
     def connect(self, *args, **kwargs):
@@ -482,6 +687,8 @@ class WebScope:
             **kwargs: Keyword arguments for X2CScope.
         """
         self.x2c_scope = X2CScope(*args, **kwargs)
+        if self.computed_channels:
+            self.set_computed_channels(self.computed_channels)
 
     def set_file(self, import_file):
         """Import variables from a variable database file.
@@ -1,6 +1,9 @@
 let scopeCardEnabled = true;
 let scopeTable;
 let scopeChart;
+let spectrumChart;
+// dynamic range of the spectrogram below its peak in dB
+const SPECTROGRAM_RANGE_DB = 60;
 
 const socket_sv = io("/scope-view");
 
@@ -33,6 +36,59 @@ socket_sv.on("scope_chart_update", (data) => {
 
     // update chart
     scopeChart.update('none');
+
+    if (data.spectrum && data.spectrum.datasets) {
+        updateSpectrumChart(data.spectrum);
+    }
+    const channels = data.datasets.map(ds => ds.label);
+    ['#spectrogramChannel', '#cycleReference', '#speedPosition'].forEach(select => {
+        updateChannelOptions($(select), channels);
+    });
+    if (data.spectrogram && data.spectrogram.image) {
+        drawSpectrogram(data.spectrogram);
+    }
+    if (data.analysis) {
+        updateCycleAnalysis(data.analysis);
+    }
+});
+
+socket_sv.on("cycle_analysis_updated", function(response) {
+    if (response.status === "success") {
+        const enabled = Boolean(response.data.enabled);
+        $('#cycleAnalysisEnable').prop('checked', enabled);
+        $('#cycleAnalysis').toggleClass('d-none', !enabled);
+        selectChannel($('#cycleReference'), response.data.reference || '');
+        selectChannel($('#speedPosition'), response.data.position || '');
+        $('#speedCounts').val(response.data.counts);
+    } else {
+        alert(response.message);
+    }
+});
+
+socket_sv.on("computed_channels_updated", function(response) {
+    if (response.status === "success") {
+        $('#computedChannels').val(response.data.definitions).removeClass('is-invalid');
+    } else {
+        $('#computedChannels').addClass('is-invalid');
+        $('#computedChannelsError').text(response.message);
+    }
+});
+
+socket_sv.on("spectrum_updated", function(response) {
+    if (response.status === "success") {
+        const enabled = Boolean(response.data.enabled);
+        $('#spectrumEnable').prop('checked', enabled);
+        $('#spectrumAverages').val(response.data.averages);
+        $('#spectrumContainer').toggleClass('d-none', !enabled);
+    } else {
+        alert(response.message);
+    }
+});
+
+socket_sv.on("spectrogram_updated", function(response) {
+    const channel = response.data.channel || '';
+    selectChannel($('#spectrogramChannel'), channel);
+    $('#spectrogramContainer').toggleClass('d-none', !channel);
 });
 
 socket_sv.on("sample_control_updated", function(response) {
@@ -394,6 +450,149 @@ function initScopeChart() {
     $('#chartExport').attr("href", "/scope/export")
 }
 
+function initSpectrumChart() {
+    const ctx = document.getElementById('spectrumChart').getContext('2d');
+    spectrumChart = new Chart(ctx, {
+        type: 'line',
+        data: {
+            labels: [],
+            datasets: []
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            animation: {
+                duration: 0
+            },
+            scales: {
+                x: {
+                    type: 'category',
+                    title: {
+                        display: true,
+                        text: 'Frequency (Hz)'
+                    }
+                },
+                y: {
+                    type: 'logarithmic',
+                    title: {
+                        display: true,
+                        text: 'Amplitude'
+                    }
+                }
+            },
+            plugins: {
+                legend: {
+                    display: false
+                }
+            },
+            elements: {
+                line: {
+                    borderWidth: 1
+                }
+            }
+        }
+    });
+}
+
+function updateSpectrumChart(spectrum) {
+    // keep the visibility selected in the legend of the scope chart
+    const visibility = {};
+    scopeChart.data.datasets.forEach((ds, i) => {
+      visibility[ds.label] = scopeChart.isDatasetVisible(i);
+    });
+    spectrumChart.data.datasets = spectrum.datasets;
+    spectrumChart.data.labels = spectrum.labels;
+    spectrumChart.data.datasets.forEach((ds, i) => {
+      spectrumChart.setDatasetVisibility(i, visibility[ds.label] !== false);
+    });
+    spectrumChart.options.scales.x.title.text = `Frequency (${spectrum.unit})`;
+    spectrumChart.update('none');
+}
+
+function selectChannel(select, channel) {
+    if (channel && !select.find('option').filter((i, option) => option.value === channel).length) {
+        select.append(new Option(channel, channel));
+    }
+    select.val(channel);
+}
+
+function updateChannelOptions(select, channels) {
+    // offer the channels of the last capture after the first option, the selected channel is kept
+    const selected = select.val();
+    const names = [...channels];
+    if (selected && !names.includes(selected)) {
+        names.push(selected);
+    }
+    const options = select.find('option').map((i, option) => option.value).get().slice(1);
+    if (options.join('\n') !== names.join('\n')) {
+        select.find('option').slice(1).remove();
+        names.forEach(name => select.append(new Option(name, name)));
+        select.val(selected);
+    }
+}
+
+function getHeatColor(level) {
+    // black - blue - red - yellow for levels from 0 to 1
+    const clamp = (value) => Math.round(255 * Math.min(Math.max(value, 0), 1));
+    return [clamp(3 * level - 1), clamp(3 * level - 2), Math.min(clamp(3 * level), clamp(2 - 3 * level))];
+}
+
+function drawSpectrogram(spectrogram) {
+    // time from left to right, frequency from bottom to top
+    const rows = spectrogram.image.length;
+    const bins = spectrogram.image[0].length;
+    const peak = Math.max(...spectrogram.image.map(row => Math.max(...row)));
+    const buffer = document.createElement('canvas');
+    buffer.width = rows;
+    buffer.height = bins;
+    const context = buffer.getContext('2d');
+    const pixels = context.createImageData(rows, bins);
+    spectrogram.image.forEach((row, x) => {
+        row.forEach((db, bin) => {
+            const [red, green, blue] = getHeatColor((db - peak) / SPECTROGRAM_RANGE_DB + 1);
+            pixels.data.set([red, green, blue, 255], ((bins - 1 - bin) * rows + x) * 4);
+        });
+    });
+    context.putImageData(pixels, 0, 0);
+
+    const canvas = document.getElementById('spectrogramCanvas');
+    canvas.width = canvas.clientWidth;
+    const view = canvas.getContext('2d');
+    view.imageSmoothingEnabled = false;
+    view.drawImage(buffer, 0, 0, canvas.width, canvas.height);
+    $('#spectrogramInfo').text(
+        `${spectrogram.channel}: 0 to ${spectrogram.max_frequency.toPrecision(4)} ${spectrogram.unit}, ` +
+        `last ${rows} captures, peak ${peak.toFixed(1)} dB, ${SPECTROGRAM_RANGE_DB} dB range`
+    );
+}
+
+function updateCycleAnalysis(analysis) {
+    if (!analysis.reference) {
+        $('#cycleAnalysis').text('');
+        return;
+    }
+    const text = [];
+    if (!analysis.cycles) {
+        text.push(`No complete cycle of ${analysis.reference}`);
+    } else {
+        text.push(`${analysis.cycles} cycles of ${analysis.reference}, ` +
+                  `${analysis.frequency.toPrecision(4)} ${analysis.unit}`);
+        for (const [name, rms] of Object.entries(analysis.rms)) {
+            const thd = analysis.thd[name] === null ? 'n/a' : `${(analysis.thd[name] * 100).toFixed(2)} %`;
+            let line = `${name}: RMS ${rms.toPrecision(4)}, THD ${thd}`;
+            if (analysis.phase && name !== analysis.reference) {
+                const phase = analysis.phase[name];
+                line += `, phase ${phase === null ? 'n/a' : phase.toFixed(1) + '°'}`;
+            }
+            text.push(line);
+        }
+    }
+    if (analysis.speed) {
+        text.push(`speed from ${analysis.speed.position}: ${analysis.speed.rpm.toPrecision(4)} rpm`);
+    }
+    $('#cycleAnalysis').text(text.join(' | '));
+}
+
 function initScopeForms(){
     $("#sampleControlForm").submit(function(e) {
         e.preventDefault(); // avoid to execute the actual submit of the form.
@@ -417,6 +616,34 @@ function initScopeForms(){
         $("#sampleControlForm").submit();
     });
 
+    // Computed channels, "name = expression" separated by semicolons or new lines
+    $('#computedChannels').on('change', function() {
+        socket_sv.emit("update_computed_channels", {definitions: $(this).val()});
+    });
+
+    // Frequency, RMS, THD and phase per electrical cycle of the enabled channels, speed from a position channel
+    $('#cycleAnalysisEnable, .cycle-analysis').on('change', function() {
+        socket_sv.emit("update_cycle_analysis", {
+            enabled: $('#cycleAnalysisEnable').is(':checked'),
+            reference: $('#cycleReference').val(),
+            position: $('#speedPosition').val(),
+            counts: parseFloat($('#speedCounts').val()) || 65536
+        });
+    });
+
+    // Spectrum of the scope channels, averaged over the given number of captures
+    $('#spectrumEnable, #spectrumAverages').on('change', function() {
+        socket_sv.emit("update_spectrum", {
+            enabled: $('#spectrumEnable').is(':checked'),
+            averages: parseInt($('#spectrumAverages').val()) || 1
+        });
+    });
+
+    // Spectrogram of one scope channel over the last captures
+    $('#spectrogramChannel').on('change', function() {
+        socket_sv.emit("update_spectrogram", {channel: $(this).val()});
+    });
+
     // Initialize the active state of the stop button on page load
     $('input[name="triggerAction"][checked]').trigger('change');
 
@@ -468,6 +695,7 @@ $(document).ready(function () {
     setScopeTableListeners();
     initScopeForms();
     initScopeChart();
+    initSpectrumChart();
 
     scopeTable = $('#scopeTable').DataTable({
         ajax: '/scope/data',
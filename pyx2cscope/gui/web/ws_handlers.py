@@ -3,6 +3,7 @@
 This module contains all SocketIO event handlers for watch and scope views.
 """
 import os
+import time
 from urllib.parse import parse_qs
 
 from flask_socketio import emit
@@ -10,13 +11,23 @@ from flask_socketio import emit
 from pyx2cscope.gui.web.extensions import socketio
 from pyx2cscope.gui.web.scope import web_scope
 
+POLL_INTERVAL = 0.1  # seconds, watch and dashboard variables are read at this cadence
+
 
 def background_x2cscope_task():
-    """Background x2cScope thread."""
+    """Background x2cScope thread.
+
+    Watch and dashboard variables are polled every POLL_INTERVAL, the scope is polled at the predicted end of the
+    capture, so captures are shown without waiting for the next regular poll.
+    """
+    next_poll = 0.0
     while True:
-        watch_values = web_scope.watch_poll()
+        watch_values, dashboard_values = None, None
+        if time.perf_counter() >= next_poll:
+            next_poll = time.perf_counter() + POLL_INTERVAL
+            watch_values = web_scope.watch_poll()
+            dashboard_values = web_scope.dashboard_poll()
         scope_values, dashboard_scope_data = web_scope.scope_poll()
-        dashboard_values = web_scope.dashboard_poll()
         if watch_values:
             socketio.emit("watch_data_update", watch_values, namespace="/watch-view")
         if scope_values:
@@ -29,7 +40,8 @@ def background_x2cscope_task():
             socketio.emit("dashboard_data_update", dashboard_values, namespace="/dashboard")
         if dashboard_scope_data:
             socketio.emit("dashboard_scope_update", dashboard_scope_data, namespace="/dashboard")
-        socketio.sleep(0.1)
+        scope_delay = web_scope.get_scope_poll_delay(POLL_INTERVAL)
+        socketio.sleep(max(min(next_poll - time.perf_counter(), scope_delay), 0))
 
 @socketio.on("connect")
 def handle_connect():
@@ -197,6 +209,77 @@ def handle_update_trigger_control(data):
         "data": parsed_data
     }, broadcast=True)
 
+@socketio.on("update_plot_decimation", namespace="/scope-view")
+def handle_update_plot_decimation(data):
+    """Handle plot decimation update event.
+
+    Args:
+        data (dict): {"view": "scope" or "dashboard", "method": "minmax", "lttb" or "none", "points": int}.
+    """
+    try:
+        web_scope.set_plot_decimation(data.get("view", "scope"), data.get("method"), data.get("points", 2000))
+    except ValueError as e:
+        emit("plot_decimation_updated", {"status": "error", "message": str(e)})
+        return
+    emit("plot_decimation_updated", {"status": "success", "data": data}, broadcast=True)
+
+@socketio.on("update_spectrum", namespace="/scope-view")
+def handle_update_spectrum(data):
+    """Handle spectrum update event.
+
+    Args:
+        data (dict): {"enabled": bool, "averages": int}.
+    """
+    try:
+        web_scope.set_spectrum(bool(data.get("enabled")), data.get("averages", 1))
+    except ValueError as e:
+        emit("spectrum_updated", {"status": "error", "message": str(e)})
+        return
+    emit("spectrum_updated", {"status": "success", "data": data}, broadcast=True)
+
+@socketio.on("update_spectrogram", namespace="/scope-view")
+def handle_update_spectrogram(data):
+    """Handle spectrogram update event.
+
+    Args:
+        data (dict): {"channel": str}, an empty channel disables the spectrogram.
+    """
+    web_scope.set_spectrogram(data.get("channel", ""))
+    emit("spectrogram_updated", {"status": "success", "data": data}, broadcast=True)
+
+@socketio.on("update_cycle_analysis", namespace="/scope-view")
+def handle_update_cycle_analysis(data):
+    """Handle cycle analysis update event.
+
+    Args:
+        data (dict): {"enabled": bool, "reference": str, "position": str, "counts": float}.
+    """
+    try:
+        web_scope.set_cycle_analysis(
+            data.get("enabled", False),
+            data.get("reference", ""),
+            data.get("position", ""),
+            data.get("counts", 65536),
+        )
+    except (TypeError, ValueError) as e:
+        emit("cycle_analysis_updated", {"status": "error", "message": str(e)})
+        return
+    emit("cycle_analysis_updated", {"status": "success", "data": data}, broadcast=True)
+
+@socketio.on("update_computed_channels", namespace="/scope-view")
+def handle_update_computed_channels(data):
+    """Handle computed channels update event.
+
+    Args:
+        data (dict): {"definitions": "name = expression; ..."}.
+    """
+    try:
+        web_scope.set_computed_channels(data.get("definitions", ""))
+    except ValueError as e:
+        emit("computed_channels_updated", {"status": "error", "message": str(e)})
+        return
+    emit("computed_channels_updated", {"status": "success", "data": data}, broadcast=True)
+
 # Dashboard handlers
 @socketio.on("connect", namespace="/dashboard")
 def handle_connect_dashboard():
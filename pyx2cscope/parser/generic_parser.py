@@ -106,6 +106,7 @@ class GenericParser(ElfParser):
 
         members = {}
         self._process_end_die(members, self.die_variable, self.var_name, 0)
+        is_const = self._is_const_type(self.die_variable)
 
         target_map = self.register_map if self.is_sfr else self.variable_map
         for member_name, member_data in members.items():
@@ -118,6 +119,8 @@ class GenericParser(ElfParser):
                 address=self.address + member_data["address_offset"],
                 array_size=member_data["array_size"],
                 valid_values=member_data["valid_values"],
+                is_const=is_const,
+                dims=member_data.get("dims", []),
             )
 
         if self.is_sfr:
@@ -162,6 +165,26 @@ class GenericParser(ElfParser):
             return self.dwarf_info.get_DIE_from_refaddr(ref_addr)
         return None
 
+    def _is_const_type(self, current_die) -> bool:
+        """Check if the type chain of the die has a const qualifier, i.e. the variable is read only.
+
+        Typedefs, volatile and array types are followed, pointers, structs and base types end the search,
+        so a pointer to const data is still considered writable.
+        """
+        end_tags = {
+            "DW_TAG_base_type",
+            "DW_TAG_pointer_type",
+            "DW_TAG_structure_type",
+            "DW_TAG_enumeration_type",
+            "DW_TAG_union_type"
+        }
+        type_die = self._get_base_type_die(current_die)
+        while type_die is not None and type_die.tag not in end_tags:
+            if type_die.tag == "DW_TAG_const_type":
+                return True
+            type_die = self._get_base_type_die(type_die)
+        return False
+
     def _get_end_die(self, current_die):
         """Find the end DIE of a type iteratively."""
         ref_addr = None
@@ -302,7 +325,8 @@ class GenericParser(ElfParser):
         variable 'members' with only one element. Considering multidimensional arrays, arrays of
         structs, and arrays of unions, the variable 'members' will have multiple elements, that should
         be considered when calculating the size of the main array element. Afterward, each element need
-        to be added as single indexed element in the array_members variable.
+        to be added as single indexed element in the array_members variable. The array variable keeps
+        the dimensions, e.g. [16, 32] for float table[16][32].
         """
         members = {}
         array_members = {}
@@ -311,7 +335,7 @@ class GenericParser(ElfParser):
         base_type_die = self._get_base_type_die(end_die)
         self._process_end_die(members, base_type_die, member_name, offset)
         if members:
-            idx_size = sum(item["byte_size"] for item in members.values())
+            idx_size = self._get_element_size(base_type_die, members)
             # Generate array variable
             array_members[member_name] = {
                 "type": members[next(iter(members))]["type"] if len(members) == 1 else "array",
@@ -320,7 +344,8 @@ class GenericParser(ElfParser):
                 "bit_offset": 0,
                 "address_offset": offset,
                 "array_size": array_size,  # Individual elements aren't arrays
-                "valid_values": {}
+                "valid_values": {},
+                "dims": array_dimensions,
             }
 
             # Generate array members, e.g.: array[0], array[1], ..., array[i]
@@ -334,6 +359,14 @@ class GenericParser(ElfParser):
 
         return array_members
 
+    def _get_element_size(self, base_type_die, members) -> int:
+        """Get the size of an array element, including the padding of structs."""
+        end_die, _ = self._get_end_die(base_type_die) if base_type_die is not None else (None, None)
+        byte_size_attr = end_die.attributes.get("DW_AT_byte_size") if end_die is not None else None
+        if byte_size_attr:
+            return byte_size_attr.value
+        return sum(item["byte_size"] for item in members.values())
+
     def _process_end_die(self, members, child_die, parent_name, offset):
         """Process the current die according to its tag.
 
@@ -0,0 +1,21 @@
+"""scope package!
+
+This package contains modules to process the content of the X2Cscope Scope Data Array (SDA) on the host side.
+
+Modules:
+    buffer: Decodes the interleaved SDA into per channel numpy arrays and aligns them to the trigger position.
+    acquisition: Continuous capture of scope frames on a background thread.
+    frame: ScopeFrame, the columnar representation of a scope capture with time axis and metadata.
+    progressive: Reads untriggered captures while the firmware is still sampling.
+    recorder: Streams scope frames to rotating, memory mappable recording files.
+    index: Time range and value queries over recordings using per capture zone maps.
+    decimate: Min/max and LTTB selection of the samples worth plotting.
+    plan: Samples, window and prescaler a set of channels gets from the Scope Data Array.
+    multiplex: Captures more channels than the scope supports by rotating groups over triggered captures.
+    software: Host side sampling of many variables with timestamps, ring buffer and software trigger.
+    events: Keeps only the frames matching a condition, together with the frames captured before them.
+    accumulate: Running mean and variance, envelopes and persistence maps of repeated captures.
+    spectrum: Windowed amplitude spectra of captures, averaged over frames or as rolling spectrogram.
+    computed: Channels derived from real channels by expressions compiled to numpy operations.
+    motor: Frequency, RMS, phase and THD per electrical cycle and speed from position for motor control.
+"""
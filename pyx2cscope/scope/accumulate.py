@@ -0,0 +1,217 @@
+"""Streaming accumulation of repeated scope captures.
+
+Repeated captures on the same trigger show the same event with different noise. The accumulators in this module
+combine any number of such frames sample by sample in constant memory, no frame is kept:
+
+    EnsembleAverage     running mean and variance of every sample index (Welford's algorithm)
+    Envelope            minimum and maximum of every sample index
+    PersistenceMap      2D histogram of value over sample index, like the persistence display of an oscilloscope
+
+All accumulators update their numpy arrays in place. Frames are aligned by sample index, so they should be captured
+with the same trigger and sample time.
+
+Usage:
+    average = EnsembleAverage()
+    for _ in range(1000):
+        average.add(x2c_scope.get_scope_frame())
+    mean, std = average.mean["motor.idq.q"], average.std["motor.idq.q"]
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from pyx2cscope.scope.frame import ScopeFrame
+
+
+class Accumulator(ABC):
+    """Base class of the accumulators, checking that consecutive frames fit together.
+
+    Attributes:
+        count (int): The number of frames accumulated.
+        samples (int): The number of samples per channel, None before the first frame.
+        sample_period (float, optional): The sample period of the accumulated frames in milliseconds.
+        trigger_index (int, optional): The trigger index of the first accumulated frame.
+    """
+
+    def __init__(self):
+        """Initialize the Accumulator instance."""
+        self._clear()
+
+    def add(self, frame: ScopeFrame):
+        """Accumulate a complete frame, partial frames are ignored.
+
+        Args:
+            frame (ScopeFrame): The next capture.
+
+        Raises:
+            ValueError: If the frame has other channels or samples than the frames accumulated before, or lacks a
+                channel the accumulator needs.
+        """
+        if not frame.complete:
+            return
+        if self.samples is None:
+            self._check(frame)
+            self.samples = len(frame)
+            self.sample_period = frame.sample_period
+            self.trigger_index = frame.trigger_index
+            self._init(frame)
+        elif len(frame) != self.samples or frame.names != self._names:
+            raise ValueError("Frame does not match the accumulated frames, reset the accumulator first")
+        self._add(frame)
+        self.count += 1
+
+    def reset(self):
+        """Discard the accumulated data, the next frame may have another layout. Settings are kept."""
+        self._clear()
+
+    @property
+    def time(self) -> np.ndarray:
+        """Get the time axis of the accumulated data in milliseconds, or the sample index if unknown."""
+        indices = np.arange(self.samples or 0, dtype=float)
+        return indices if self.sample_period is None else indices * self.sample_period
+
+    def _clear(self):
+        """Set the state before the first frame."""
+        self.count = 0
+        self.samples: Optional[int] = None
+        self.sample_period: Optional[float] = None
+        self.trigger_index: Optional[int] = None
+
+    def _check(self, frame: ScopeFrame):
+        """Check if the first frame can be accumulated, raise ValueError if not."""
+
+    def _init(self, frame: ScopeFrame):
+        self._names = frame.names
+
+    @abstractmethod
+    def _add(self, frame: ScopeFrame):
+        """Accumulate the samples of a frame matching the accumulated frames."""
+
+
+class EnsembleAverage(Accumulator):
+    """Running mean and variance of every sample index.
+
+    Attributes:
+        mean (Dict[str, np.ndarray]): The mean of every channel and sample index.
+    """
+
+    def _init(self, frame: ScopeFrame):
+        super()._init(frame)
+        self.mean = {name: np.zeros(self.samples) for name in frame}
+        self._m2 = {name: np.zeros(self.samples) for name in frame}
+        self._delta = np.empty(self.samples)
+
+    def _add(self, frame: ScopeFrame):
+        count = self.count + 1
+        for name, values in frame.channels.items():
+            mean, delta = self.mean[name], self._delta
+            np.subtract(values, mean, out=delta)
+            mean += delta / count
+            # m2 += (x - old mean) * (x - new mean)
+            delta *= values - mean
+            self._m2[name] += delta
+
+    @property
+    def variance(self) -> Dict[str, np.ndarray]:
+        """Get the sample variance of every channel and sample index, NaN before two frames were added."""
+        if self.count < 2:  # noqa: PLR2004
+            return {name: np.full(self.samples or 0, np.nan) for name in self._m2} if self.count else {}
+        return {name: m2 / (self.count - 1) for name, m2 in self._m2.items()}
+
+    @property
+    def std(self) -> Dict[str, np.ndarray]:
+        """Get the sample standard deviation of every channel and sample index."""
+        return {name: np.sqrt(variance) for name, variance in self.variance.items()}
+
+    def get_frame(self) -> ScopeFrame:
+        """Get the mean as frame, e.g. to plot or record it.
+
+        Returns:
+            ScopeFrame: The mean of every channel with the time axis of the accumulated frames.
+        """
+        return ScopeFrame(
+            {name: mean.copy() for name, mean in self.mean.items()}, self.sample_period, self.trigger_index
+        )
+
+
+class Envelope(Accumulator):
+    """Minimum and maximum of every sample index.
+
+    Attributes:
+        minimum (Dict[str, np.ndarray]): The smallest value of every channel and sample index.
+        maximum (Dict[str, np.ndarray]): The largest value of every channel and sample index.
+    """
+
+    def _init(self, frame: ScopeFrame):
+        super()._init(frame)
+        self.minimum = {name: np.array(values, dtype=float) for name, values in frame.channels.items()}
+        self.maximum = {name: np.array(values, dtype=float) for name, values in frame.channels.items()}
+
+    def _add(self, frame: ScopeFrame):
+        for name, values in frame.channels.items():
+            np.minimum(self.minimum[name], values, out=self.minimum[name])
+            np.maximum(self.maximum[name], values, out=self.maximum[name])
+
+
+class PersistenceMap(Accumulator):
+    """Histogram of how often every channel passed a value at a sample index.
+
+    Attributes:
+        ranges (Dict[str, Tuple[float, float]]): The value range of the histogram of every channel.
+        bins (int): The number of value bins.
+        histograms (Dict[str, np.ndarray]): The hit count of every channel, shape (bins, samples).
+        clipped (Dict[str, int]): The number of values outside the range of every channel, not counted.
+    """
+
+    def __init__(self, ranges: Dict[str, Tuple[float, float]], bins: int = 256):
+        """Initialize the PersistenceMap instance.
+
+        Args:
+            ranges (Dict[str, Tuple[float, float]]): The channels to accumulate and their (low, high) value range.
+            bins (int): The number of value bins. Defaults to 256.
+
+        Raises:
+            ValueError: If a range is empty or bins is not positive.
+        """
+        if bins < 1:
+            raise ValueError(f"Number of bins must be positive, got {bins}")
+        for name, (low, high) in ranges.items():
+            if not high > low:
+                raise ValueError(f"Invalid value range of {name}: {low} to {high}")
+        super().__init__()
+        self.ranges = dict(ranges)
+        self.bins = bins
+
+    def _check(self, frame: ScopeFrame):
+        for name in self.ranges:
+            if name not in frame:
+                raise ValueError(f"Channel {name} is not part of the frame")
+
+    def _init(self, frame: ScopeFrame):
+        super()._init(frame)
+        self.histograms = {name: np.zeros((self.bins, self.samples), dtype=np.uint32) for name in self.ranges}
+        self.clipped = {name: 0 for name in self.ranges}
+        self._columns = np.arange(self.samples)
+
+    def _add(self, frame: ScopeFrame):
+        for name, (low, high) in self.ranges.items():
+            rows = np.floor((frame[name] - low) * (self.bins / (high - low))).astype(np.int64)
+            rows[frame[name] == high] = self.bins - 1
+            inside = (rows >= 0) & (rows < self.bins)
+            self.clipped[name] += int(len(rows) - np.count_nonzero(inside))
+            # every (row, column) pair occurs once per frame, so a fancy index increment is exact
+            self.histograms[name][rows[inside], self._columns[inside]] += 1
+
+    def get_edges(self, name: str) -> np.ndarray:
+        """Get the value bin edges of a channel.
+
+        Args:
+            name (str): The channel name.
+
+        Returns:
+            np.ndarray: The bins + 1 edges from low to high.
+        """
+        low, high = self.ranges[name]
+        return np.linspace(low, high, self.bins + 1)
@@ -0,0 +1,347 @@
+"""Continuous scope acquisition.
+
+ScopeAcquisition runs the capture loop of X2Cscope on a background thread:
+
+    request_scope_data -> wait_for_scope_data -> read the buffer -> re-arm -> decode -> publish
+
+The raw buffer is read and the scope is re-armed before the data is decoded, so the firmware samples the next
+capture while the host decodes the previous one (double buffering). Frames are handed to subscribers through
+bounded queues. If a subscriber is too slow, its queue either drops the oldest frame, drops the newest frame or
+blocks the acquisition (backpressure).
+
+In progressive mode, untriggered captures are read while the firmware is still sampling (see ProgressiveReadout).
+Subscribers then receive partial frames (complete is False) followed by the complete frame of every capture.
+
+Usage:
+    acquisition = x2c_scope.start_acquisition()
+    frames = acquisition.subscribe(maxsize=4)
+    frame = frames.get(timeout=1)
+    x2c_scope.stop_acquisition()
+"""
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional, Union
+
+import numpy as np
+
+from pyx2cscope.scope.events import EventCapture
+from pyx2cscope.scope.frame import ScopeFrame
+from pyx2cscope.scope.progressive import ProgressiveReadout
+
+if TYPE_CHECKING:
+    from pyx2cscope.x2cscope import X2CScope
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+BLOCK = "block"
+
+
+class Subscription:
+    """Bounded queue of scope frames for one consumer.
+
+    Attributes:
+        policy (str): What happens if the queue is full: DROP_OLDEST, DROP_NEWEST or BLOCK.
+        dropped (int): The number of frames discarded because the queue was full.
+        event (EventCapture, optional): The filter deciding which frames are queued, None to queue all frames.
+    """
+
+    def __init__(self, maxsize: int = 4, policy: str = DROP_OLDEST, event: Optional[EventCapture] = None):
+        """Initialize the Subscription instance.
+
+        Args:
+            maxsize (int): The maximum number of frames waiting in the queue. Defaults to 4.
+            policy (str): DROP_OLDEST, DROP_NEWEST or BLOCK. Defaults to DROP_OLDEST.
+            event (EventCapture, optional): Queue only the frames of events, see EventCapture. Defaults to None.
+        """
+        if policy not in (DROP_OLDEST, DROP_NEWEST, BLOCK):
+            raise ValueError(f"Unknown queue policy: {policy}")
+        if maxsize < 1:
+            raise ValueError(f"Queue size must be at least 1, got {maxsize}")
+        self.policy = policy
+        self.dropped = 0
+        self.event = event
+        self._queue = queue.Queue(maxsize)
+
+    def __len__(self):
+        """Get the number of frames waiting in the queue."""
+        return self._queue.qsize()
+
+    def get(self, timeout: Optional[float] = None) -> ScopeFrame:
+        """Get the next frame, waiting until one is available.
+
+        Args:
+            timeout (float, optional): Maximum time to wait in seconds. Defaults to None, i.e. wait forever.
+
+        Returns:
+            ScopeFrame: The oldest frame in the queue.
+
+        Raises:
+            queue.Empty: If no frame is available within timeout.
+        """
+        return self._queue.get(timeout=timeout)
+
+    def get_latest(self) -> Optional[ScopeFrame]:
+        """Get the newest frame and discard all older ones, without waiting.
+
+        Returns:
+            ScopeFrame: The newest frame or None if the queue is empty.
+        """
+        frame = None
+        try:
+            while True:
+                frame = self._queue.get_nowait()
+        except queue.Empty:
+            return frame
+
+    def put(self, frame: ScopeFrame, stop: threading.Event):
+        """Add a frame according to the queue policy.
+
+        With an event filter, the frame is evaluated first and only the frames of an event are added.
+
+        Args:
+            frame (ScopeFrame): The frame to be added.
+            stop (threading.Event): Stops waiting on a full queue for the BLOCK policy.
+        """
+        if self.event is not None:
+            for event_frame in self.event.process(frame):
+                self._put(event_frame, stop)
+            return
+        self._put(frame, stop)
+
+    def _put(self, frame: ScopeFrame, stop: threading.Event):
+        if self.policy == BLOCK:
+            while not stop.is_set():
+                try:
+                    self._queue.put(frame, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+            return
+        try:
+            self._queue.put_nowait(frame)
+            return
+        except queue.Full:
+            self.dropped += 1
+        if self.policy == DROP_OLDEST:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                self._queue.put_nowait(frame)
+            except queue.Full:
+                pass
+
+
+@dataclass
+class AcquisitionStats:
+    """Performance figures of a continuous acquisition.
+
+    Attributes:
+        captures (int): The number of frames read.
+        errors (int): The number of failed capture cycles.
+        elapsed (float): The time since the acquisition started in seconds.
+        captures_per_second (float): The average capture rate.
+        read_time (float): The average time to read the scope buffer in seconds.
+        dead_time (float): The average time between a complete capture being detected and the scope being
+            re-armed, in seconds. During this time the firmware is not sampling.
+        retries (int): The number of scope data chunks requested again after a failed read.
+        bytes_reread (int): The number of scope data bytes requested again after a failed read.
+    """
+
+    captures: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+    captures_per_second: float = 0.0
+    read_time: float = 0.0
+    dead_time: float = 0.0
+    retries: int = 0
+    bytes_reread: int = 0
+
+
+class ScopeAcquisition:
+    """Background thread capturing scope frames continuously."""
+
+    def __init__(
+        self,
+        x2c_scope: "X2CScope",
+        valid_data: bool = True,
+        dtype: Optional[Union[str, np.dtype]] = None,
+        poll_interval: float = 0.005,
+        progressive: bool = False,
+    ):
+        """Initialize the ScopeAcquisition instance.
+
+        Args:
+            x2c_scope (X2CScope): The scope used to capture data. Do not change its scope configuration while
+                the acquisition is running.
+            valid_data (bool): If True, frames start with the first valid dataset. Defaults to True.
+            dtype (str | np.dtype, optional): Convert all channels to this type. Defaults to None.
+            poll_interval (float): The time to wait before re-arming the scope after a failed capture cycle, in
+                seconds. Defaults to 0.005.
+            progressive (bool): Read untriggered captures while they are sampled and publish partial frames.
+                Triggered captures are always read once complete. Defaults to False.
+        """
+        self.x2c_scope = x2c_scope
+        self.valid_data = valid_data
+        self.dtype = dtype
+        self.poll_interval = poll_interval
+        self.progressive = progressive
+        self._subscriptions: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats = AcquisitionStats()
+        self._start_time = 0.0
+        self._read_time_total = 0.0
+        self._dead_time_total = 0.0
+
+    def subscribe(
+        self, maxsize: int = 4, policy: str = DROP_OLDEST, event: Optional[EventCapture] = None
+    ) -> Subscription:
+        """Create a queue receiving every new frame.
+
+        Args:
+            maxsize (int): The maximum number of frames waiting in the queue. Defaults to 4.
+            policy (str): DROP_OLDEST, DROP_NEWEST or BLOCK. Defaults to DROP_OLDEST.
+            event (EventCapture, optional): Receive only the frames of events, see EventCapture. Defaults to None.
+
+        Returns:
+            Subscription: The queue of frames.
+        """
+        subscription = Subscription(maxsize, policy, event)
+        with self._lock:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Stop delivering frames to a subscription.
+
+        Args:
+            subscription (Subscription): The subscription returned by subscribe.
+        """
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def start(self):
+        """Start the acquisition thread, the scope is armed immediately."""
+        if self.is_running():
+            return
+        self._stop.clear()
+        self._stats = AcquisitionStats()
+        self._read_time_total = 0.0
+        self._dead_time_total = 0.0
+        self._start_time = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="ScopeAcquisition", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 2.0):
+        """Stop the acquisition thread.
+
+        Args:
+            timeout (float, optional): Maximum time to wait for the thread in seconds. Defaults to 2.0.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def is_running(self) -> bool:
+        """Check if the acquisition thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def get_stats(self) -> AcquisitionStats:
+        """Get the performance figures of the acquisition.
+
+        Returns:
+            AcquisitionStats: A snapshot of the current figures.
+        """
+        with self._lock:
+            stats = AcquisitionStats(**vars(self._stats))
+        stats.elapsed = time.perf_counter() - self._start_time if self._start_time else 0.0
+        if stats.elapsed > 0:
+            stats.captures_per_second = stats.captures / stats.elapsed
+        if stats.captures:
+            stats.read_time = self._read_time_total / stats.captures
+            stats.dead_time = self._dead_time_total / stats.captures
+        return stats
+
+    def _wait_for_capture(self) -> bool:
+        """Wait until the current capture is complete, return False if the acquisition was stopped."""
+        return self.x2c_scope.wait_for_scope_data(cancel=self._stop)
+
+    def _capture_progressive(self) -> Optional[ScopeFrame]:
+        """Read a capture while it is sampled, publish partial frames and re-arm the scope once complete."""
+        readout = ProgressiveReadout(self.x2c_scope, self.dtype)
+        interval = readout.get_poll_interval()
+        while not self._stop.is_set():
+            start = time.perf_counter()
+            frame = readout.poll()
+            if frame is not None and frame.complete:
+                ready = time.perf_counter()
+                self.x2c_scope.request_scope_data()
+                armed = time.perf_counter()
+                self._count_capture(frame, ready - start, armed - start)
+                return frame
+            if frame is not None:
+                self._publish(frame)
+            self._stop.wait(interval)
+        return None
+
+    def _capture(self) -> Optional[ScopeFrame]:
+        """Read a complete capture, re-arm the scope and decode the data."""
+        if self.progressive and ProgressiveReadout.is_supported(self.x2c_scope):
+            return self._capture_progressive()
+        if not self._wait_for_capture():
+            return None
+        ready = time.perf_counter()
+        timestamp = time.time()
+        data = self.x2c_scope.read_scope_buffer()
+        read = time.perf_counter()
+        self.x2c_scope.request_scope_data()
+        armed = time.perf_counter()
+        frame = self.x2c_scope.decode_scope_frame(data, self.valid_data, self.dtype, timestamp)
+        self._count_capture(frame, read - ready, armed - ready)
+        return frame
+
+    def _count_capture(self, frame: ScopeFrame, read_time: float, dead_time: float):
+        with self._lock:
+            self._stats.captures += 1
+            if frame.transfer_stats is not None:
+                self._stats.retries += frame.transfer_stats.retries
+                self._stats.bytes_reread += frame.transfer_stats.bytes_reread
+        self._read_time_total += read_time
+        self._dead_time_total += dead_time
+
+    def _publish(self, frame: ScopeFrame):
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription.put(frame, self._stop)
+
+    def _run(self):
+        try:
+            self.x2c_scope.request_scope_data()
+        except Exception as e:
+            logging.error(f"Error starting scope acquisition: {e}")
+            return
+        while not self._stop.is_set():
+            try:
+                frame = self._capture()
+            except Exception as e:
+                logging.error(f"Error during scope acquisition: {e}")
+                with self._lock:
+                    self._stats.errors += 1
+                self._stop.wait(self.poll_interval)
+                try:
+                    self.x2c_scope.request_scope_data()
+                except Exception as rearm_error:
+                    logging.error(f"Error re-arming scope acquisition: {rearm_error}")
+                continue
+            if frame is not None:
+                self._publish(frame)
@@ -0,0 +1,164 @@
+"""Decoding of the Scope Data Array (SDA).
+
+The firmware stores one dataset per sample into the SDA. A dataset holds the value of every scope channel, in the
+order the channels were added, without padding. The whole SDA is therefore an array of records and is decoded with
+a single np.frombuffer call using a structured data type. Every channel is a strided view into the records, no
+sample is copied.
+
+The SDA is a circular buffer, the first valid dataset is usually not at index 0. RotatedView aligns the records to
+the trigger position by index arithmetic instead of copying them.
+"""
+
+from numbers import Integral
+from typing import Dict, Iterator, Tuple, Union
+
+import numpy as np
+
+from mchplnet.services.scope import ScopeChannel
+
+
+def get_channel_dtype(channel: ScopeChannel) -> np.dtype:
+    """Get the little endian numpy data type of a scope channel.
+
+    Args:
+        channel (ScopeChannel): The scope channel.
+
+    Returns:
+        np.dtype: The data type of one channel sample, e.g. int16 or float32.
+    """
+    if not channel.is_integer:
+        return np.dtype(f"<f{channel.data_type_size}")
+    return np.dtype(f"<{'i' if channel.is_signed else 'u'}{channel.data_type_size}")
+
+
+def get_dataset_dtype(channels: Dict[str, ScopeChannel]) -> np.dtype:
+    """Get the structured numpy data type of one SDA dataset.
+
+    Args:
+        channels (Dict[str, ScopeChannel]): The scope channels in the order they were added.
+
+    Returns:
+        np.dtype: A structured data type with one field per channel name.
+    """
+    names, formats, offsets = [], [], []
+    offset = 0
+    for name, channel in channels.items():
+        names.append(name)
+        formats.append(get_channel_dtype(channel))
+        offsets.append(offset)
+        offset += channel.data_type_size
+    return np.dtype({"names": names, "formats": formats, "offsets": offsets, "itemsize": max(offset, 1)})
+
+
+def get_records(data: Union[bytes, bytearray, np.ndarray], channels: Dict[str, ScopeChannel]) -> np.ndarray:
+    """Interpret the SDA content as an array of datasets.
+
+    Incomplete trailing datasets are ignored. The returned array is a view into data and shares its memory.
+
+    Args:
+        data (bytes | bytearray | np.ndarray): The raw SDA content.
+        channels (Dict[str, ScopeChannel]): The scope channels in the order they were added.
+
+    Returns:
+        np.ndarray: A structured array with one record per dataset.
+    """
+    dtype = get_dataset_dtype(channels)
+    return np.frombuffer(data, dtype=dtype, count=len(data) // dtype.itemsize)
+
+
+def demultiplex(data: Union[bytes, bytearray, np.ndarray], channels: Dict[str, ScopeChannel]) -> Dict[str, np.ndarray]:
+    """Split the interleaved SDA content into one array per channel.
+
+    Incomplete trailing datasets are ignored. The returned arrays are views into data and share its memory.
+
+    Args:
+        data (bytes | bytearray | np.ndarray): The raw SDA content.
+        channels (Dict[str, ScopeChannel]): The scope channels in the order they were added.
+
+    Returns:
+        Dict[str, np.ndarray]: The channel name and its samples.
+    """
+    records = get_records(data, channels)
+    return {name: records[name] for name in channels}
+
+
+class RotatedView:
+    """Read only view on an array which starts at a given index and wraps around at its end.
+
+    The view behaves like ``np.concatenate((data[start:], data[:start]))`` without copying data. Indexing with a
+    field name of a structured array returns the rotated view of that field, so a whole SDA capture is rotated
+    once and then split into channels. A copy is only made by np.asarray (if start is not 0) or by slicing.
+
+    Attributes:
+        data (np.ndarray): The underlying array.
+        start (int): The index of data which is the first element of the view.
+    """
+
+    def __init__(self, data: np.ndarray, start: int = 0):
+        """Initialize the RotatedView instance.
+
+        Args:
+            data (np.ndarray): The array to be rotated.
+            start (int): The index of the first element, negative values count from the end. Values outside the
+                array bounds result in no rotation, same as list slicing. Defaults to 0.
+        """
+        size = len(data)
+        self.data = data
+        self.start = start % size if -size < start < size else 0
+
+    def __len__(self):
+        """Get the number of elements of the view."""
+        return len(self.data)
+
+    def __iter__(self) -> Iterator:
+        """Iterate over the elements in rotated order."""
+        for segment in self.segments:
+            yield from segment
+
+    def __getitem__(self, key):
+        """Get a field view, an element or a copy of a slice of the rotated data.
+
+        Args:
+            key (str | int | slice | array_like): Field name, index, slice or index array in rotated order.
+
+        Returns:
+            RotatedView for field names, a scalar for integer indices, a new np.ndarray otherwise.
+        """
+        if isinstance(key, str):
+            return RotatedView(self.data[key], self.start)
+        size = len(self.data)
+        if isinstance(key, Integral):
+            if not -size <= key < size:
+                raise IndexError(f"Index {key} out of range for size {size}")
+            return self.data[(key % size + self.start) % size]
+        indices = np.arange(size)[key]
+        return self.data[(indices + self.start) % size]
+
+    def __array__(self, dtype=None, copy=None):
+        """Get the rotated data as contiguous numpy array, copies the data if start is not 0."""
+        if self.start and copy is False:
+            raise ValueError("A rotated view cannot be converted to an array without copy")
+        if self.start:
+            array = np.concatenate(self.segments)
+        else:
+            array = self.data.copy() if copy else self.data
+        return array if dtype is None else array.astype(dtype, copy=False)
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Get the data type of the elements."""
+        return self.data.dtype
+
+    @property
+    def segments(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the two views on data which form the rotated data when appended.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: data[start:] and data[:start].
+        """
+        return self.data[self.start :], self.data[: self.start]
+
+    def tolist(self) -> list:
+        """Get the rotated data as list of Python numbers."""
+        head, tail = self.segments
+        return head.tolist() + tail.tolist()
@@ -0,0 +1,355 @@
+"""Computed channels: signals derived from scope channels or watch values by an expression.
+
+Derived signals like the electrical power v * i, the error ref - meas or the Clarke and Park transformations of the
+phase currents are defined once as expression over the real channels and evaluated on whole numpy arrays, i.e. on
+every ScopeFrame or on a batch of watch values, instead of sample by sample in Python.
+
+Expressions use Python syntax restricted to arithmetic, comparisons, conditional expressions and a set of numpy
+functions. Channels are referenced by their variable name, e.g. motor.iabc.a or Sin2_Table8[3]. The expression is
+parsed and checked once and compiled to a tree of numpy operations, nothing is passed to eval.
+
+    FUNCTIONS           the functions available in expressions, e.g. sqrt, sin, atan2, where, clip
+    CONSTANTS           pi and e
+    Expression          a compiled expression and the channels it references
+    ComputedChannels    named expressions evaluated in definition order, later ones may use earlier ones
+
+Usage:
+    x2c_scope.add_computed_channel("power", "1.5 * (motor.vdq.d * motor.idq.d + motor.vdq.q * motor.idq.q)")
+    x2c_scope.add_computed_channel("error", "motor.apiData.velocityReference - motor.apiData.velocityMeasured")
+    frame = x2c_scope.get_scope_frame()  # holds power and error as float64 channels
+"""
+
+import ast
+import logging
+import operator
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Tuple
+
+import numpy as np
+
+from pyx2cscope.scope.frame import ScopeFrame
+
+FUNCTIONS = {
+    "abs": np.abs,
+    "sqrt": np.sqrt,
+    "exp": np.exp,
+    "log": np.log,
+    "log10": np.log10,
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "asin": np.arcsin,
+    "acos": np.arccos,
+    "atan": np.arctan,
+    "atan2": np.arctan2,
+    "hypot": np.hypot,
+    "degrees": np.degrees,
+    "radians": np.radians,
+    "sign": np.sign,
+    "floor": np.floor,
+    "ceil": np.ceil,
+    "round": np.round,
+    "min": np.minimum,
+    "max": np.maximum,
+    "clip": np.clip,
+    "where": np.where,
+}
+CONSTANTS = {"pi": np.pi, "e": np.e}
+
+_BINARY = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+_UNARY = {ast.USub: operator.neg, ast.UAdd: operator.pos, ast.Not: np.logical_not}
+_COMPARE = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+
+Plan = Callable[[Mapping[str, np.ndarray]], Any]
+
+
+def _get_reference(node: ast.AST) -> str:
+    """Get the channel name of a Name, Attribute or constant Subscript node, e.g. motor.iabc.a or table[3].
+
+    Raises:
+        ValueError: If the node is no channel reference.
+    """
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return f"{_get_reference(node.value)}.{node.attr}"
+    if isinstance(node, ast.Subscript):
+        index = node.slice
+        if isinstance(index, ast.Constant) and type(index.value) is int:
+            return f"{_get_reference(node.value)}[{index.value}]"
+    raise ValueError(f"Invalid channel reference: {ast.unparse(node)}")
+
+
+def _parse(source: str) -> ast.AST:
+    try:
+        return ast.parse(source.strip(), mode="eval").body
+    except SyntaxError as e:
+        raise ValueError(f"Invalid expression {source!r}: {e.msg}") from None
+
+
+class Expression:
+    """An expression over channels, compiled once to numpy operations.
+
+    Attributes:
+        source (str): The expression as written.
+        channels (Tuple[str, ...]): The channels referenced, in order of appearance.
+    """
+
+    def __init__(self, source: str):
+        """Parse, check and compile an expression.
+
+        Args:
+            source (str): The expression, e.g. "motor.vdq.q * motor.idq.q".
+
+        Raises:
+            ValueError: If the expression has invalid syntax or uses anything but numbers, channels, arithmetic,
+                comparisons, conditional expressions and FUNCTIONS.
+        """
+        self.source = source
+        self._channels: Dict[str, None] = {}
+        self._plan = self._compile(_parse(source))
+        self.channels: Tuple[str, ...] = tuple(self._channels)
+
+    def __call__(self, values: Mapping[str, Any]) -> Any:
+        """Evaluate the expression.
+
+        Args:
+            values (Mapping[str, Any]): The samples of the referenced channels, arrays of equal length or scalars.
+
+        Returns:
+            np.ndarray | float: The result as float array, or float if all values are scalars.
+
+        Raises:
+            KeyError: If a referenced channel is missing.
+        """
+        sources = {name: np.asarray(values[name], dtype=float) for name in self.channels}
+        with np.errstate(all="ignore"):
+            result = np.asarray(self._plan(sources), dtype=float)
+        return float(result) if result.ndim == 0 else result
+
+    def __repr__(self):
+        """Get the representation of the expression."""
+        return f"Expression({self.source!r})"
+
+    def _compile(self, node: ast.AST) -> Plan:  # noqa: PLR0911
+        """Compile an AST node to a function of the channel values."""
+        if isinstance(node, ast.Constant):
+            if type(node.value) not in (int, float):
+                raise ValueError(f"Invalid constant: {node.value!r}")
+            value = float(node.value)
+            return lambda values: value
+        if isinstance(node, ast.Name) and node.id in CONSTANTS:
+            value = CONSTANTS[node.id]
+            return lambda values: value
+        if isinstance(node, (ast.Name, ast.Attribute, ast.Subscript)):
+            name = _get_reference(node)
+            self._channels[name] = None
+            return lambda values: values[name]
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+            function, left, right = _BINARY[type(node.op)], self._compile(node.left), self._compile(node.right)
+            return lambda values: function(left(values), right(values))
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY:
+            function, operand = _UNARY[type(node.op)], self._compile(node.operand)
+            return lambda values: function(operand(values))
+        if isinstance(node, ast.Compare) and all(type(op) in _COMPARE for op in node.ops):
+            return self._compile_compare(node)
+        if isinstance(node, ast.BoolOp):
+            function = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            operands = [self._compile(value) for value in node.values]
+            return lambda values: function.reduce([operand(values) for operand in operands])
+        if isinstance(node, ast.IfExp):
+            test, body, orelse = self._compile(node.test), self._compile(node.body), self._compile(node.orelse)
+            return lambda values: np.where(test(values), body(values), orelse(values))
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+            if node.func.id not in FUNCTIONS:
+                raise ValueError(f"Unknown function: {node.func.id}")
+            function, arguments = FUNCTIONS[node.func.id], [self._compile(arg) for arg in node.args]
+            return lambda values: function(*(argument(values) for argument in arguments))
+        raise ValueError(f"Unsupported expression: {ast.unparse(node)}")
+
+    def _compile_compare(self, node: ast.Compare) -> Plan:
+        """Compile a comparison, chained comparisons like 0 < x < 1 are combined with and."""
+        operands = [self._compile(node.left)] + [self._compile(comparator) for comparator in node.comparators]
+        functions = [_COMPARE[type(op)] for op in node.ops]
+
+        def compare(values):
+            results = [operands[0](values)] + [operand(values) for operand in operands[1:]]
+            checks = [function(a, b) for function, a, b in zip(functions, results, results[1:])]
+            return checks[0] if len(checks) == 1 else np.logical_and.reduce(checks)
+
+        return compare
+
+
+class ComputedChannels:
+    """Named expressions evaluated in definition order.
+
+    A computed channel may reference real channels and computed channels defined before it. Computed channels with
+    the name of a real channel are not evaluated, the real channel is kept.
+    """
+
+    def __init__(self):
+        """Initialize the ComputedChannels instance."""
+        self._expressions: Dict[str, Expression] = OrderedDict()
+
+    def __len__(self):
+        """Get the number of computed channels."""
+        return len(self._expressions)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the names in definition order."""
+        return iter(list(self._expressions))
+
+    def __contains__(self, name):
+        """Check if a computed channel with the given name is defined."""
+        return name in self._expressions
+
+    def __getitem__(self, name: str) -> Expression:
+        """Get the expression of a computed channel."""
+        return self._expressions[name]
+
+    @property
+    def names(self) -> List[str]:
+        """Get the names in definition order."""
+        return list(self._expressions)
+
+    def add(self, name: str, expression: str):
+        """Define a computed channel, replacing a channel with the same name.
+
+        Args:
+            name (str): The channel name, like a variable name, e.g. power or motor.pdq.
+            expression (str): The expression over real and previously defined computed channels.
+
+        Raises:
+            ValueError: If the name can't be referenced in expressions or the expression is invalid.
+        """
+        if _get_reference(_parse(name)) != name:
+            raise ValueError(f"Invalid channel name: {name!r}")
+        compiled = Expression(expression)
+        self._expressions.pop(name, None)
+        self._expressions[name] = compiled
+
+    def remove(self, name: str):
+        """Remove a computed channel, if defined.
+
+        Args:
+            name (str): The channel name.
+        """
+        self._expressions.pop(name, None)
+
+    def clear(self):
+        """Remove all computed channels."""
+        self._expressions.clear()
+
+    def get_definitions(self) -> Dict[str, str]:
+        """Get the name and expression of every computed channel, e.g. to save a configuration."""
+        return {name: expression.source for name, expression in self._expressions.items()}
+
+    def evaluate(self, values: Mapping[str, Any]) -> Dict[str, Any]:
+        """Evaluate all computed channels whose channels are available.
+
+        Errors, e.g. arrays of different lengths, are logged and the channel is left out.
+
+        Args:
+            values (Mapping[str, Any]): The real channels, sample arrays of a frame or a batch of watch values.
+
+        Returns:
+            Dict[str, Any]: The value of every computed channel evaluated, float arrays or floats.
+        """
+        available = dict(values)
+        results = {}
+        for name, expression in list(self._expressions.items()):
+            if name in available or any(channel not in available for channel in expression.channels):
+                continue
+            try:
+                available[name] = results[name] = expression(available)
+            except Exception as e:
+                logging.warning(f"Error evaluating computed channel {name}: {e}")
+        return results
+
+    def apply(self, frame: ScopeFrame) -> ScopeFrame:
+        """Add the computed channels to a frame.
+
+        Args:
+            frame (ScopeFrame): The frame with the real channels.
+
+        Returns:
+            ScopeFrame: A frame with the real channels followed by the computed channels, or frame if no computed
+                channel could be evaluated.
+        """
+        results = self.evaluate(frame.channels)
+        if not results:
+            return frame
+        channels = dict(frame.channels)
+        for name, value in results.items():
+            channels[name] = np.array(np.broadcast_to(value, len(frame)), dtype=float)
+        return replace(frame, channels=channels)
+
+
+def parse_definitions(text: str) -> Dict[str, str]:
+    """Parse computed channel definitions written as "name = expression", separated by semicolons or new lines.
+
+    Args:
+        text (str): The definitions, e.g. "power = v * i; error = ref - meas".
+
+    Returns:
+        Dict[str, str]: The expression of every name, in the given order.
+
+    Raises:
+        ValueError: If a definition lacks the "=".
+    """
+    definitions = {}
+    for line in text.replace(";", "\n").splitlines():
+        if not line.strip():
+            continue
+        name, separator, expression = line.partition("=")
+        if not separator or not name.strip() or expression.startswith("="):
+            raise ValueError(f"Invalid definition {line.strip()!r}, expected name = expression")
+        definitions[name.strip()] = expression.strip()
+    return definitions
+
+
+def clarke(a: str, b: str, c: str) -> Dict[str, str]:
+    """Get the expressions of the amplitude invariant Clarke transformation of three phase quantities.
+
+    Args:
+        a (str): The phase a channel, e.g. motor.iabc.a.
+        b (str): The phase b channel.
+        c (str): The phase c channel.
+
+    Returns:
+        Dict[str, str]: The expressions of "alpha" and "beta".
+    """
+    return {"alpha": f"(2 * {a} - {b} - {c}) / 3", "beta": f"({b} - {c}) / sqrt(3)"}
+
+
+def park(alpha: str, beta: str, angle: str) -> Dict[str, str]:
+    """Get the expressions of the Park transformation into the rotating frame.
+
+    Args:
+        alpha (str): The alpha channel or expression.
+        beta (str): The beta channel or expression.
+        angle (str): The electrical angle channel in radians, scale it in the expression otherwise.
+
+    Returns:
+        Dict[str, str]: The expressions of "d" and "q".
+    """
+    return {
+        "d": f"({alpha}) * cos({angle}) + ({beta}) * sin({angle})",
+        "q": f"({beta}) * cos({angle}) - ({alpha}) * sin({angle})",
+    }
@@ -0,0 +1,117 @@
+"""Decimation of scope data for plotting.
+
+A plot cannot show more points than it has pixels, sending every sample of a large capture to the chart only costs
+time. The functions in this module select the indices of the samples worth plotting, about 2 points per pixel:
+
+    MINMAX  the minimum and maximum of every bucket, all peaks stay visible.
+    LTTB    Largest-Triangle-Three-Buckets, one point per bucket keeping the visual shape of the signal.
+
+Decimation is index based: the selected indices are applied to the time axis and to every channel, so the full
+resolution data stays available, e.g. to decimate again for a zoomed range (see ScopeFrame.decimate).
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+MINMAX = "minmax"
+LTTB = "lttb"
+METHODS = (MINMAX, LTTB)
+
+
+def minmax_indices(values: np.ndarray, points: int) -> np.ndarray:
+    """Select the minimum and maximum of equally sized buckets.
+
+    Args:
+        values (np.ndarray): The samples of one channel.
+        points (int): The maximum number of selected samples, two per bucket.
+
+    Returns:
+        np.ndarray: The sorted indices of the selected samples, all indices if values has at most points samples.
+    """
+    size = len(values)
+    buckets = max(points // 2, 1)
+    if size <= points:
+        return np.arange(size)
+    width = -(-size // buckets)
+    padded = np.empty(buckets * width, dtype=values.dtype)
+    padded[:size] = values
+    padded[size:] = values[-1]  # repeating the last sample keeps minimum and maximum of the last bucket
+    rows = padded.reshape(buckets, width)
+    offsets = np.arange(buckets) * width
+    indices = np.concatenate((offsets + rows.argmin(axis=1), offsets + rows.argmax(axis=1)))
+    return np.unique(indices)
+
+
+def lttb_indices(values: np.ndarray, points: int, x: Optional[np.ndarray] = None) -> np.ndarray:
+    """Select samples with the Largest-Triangle-Three-Buckets algorithm.
+
+    The first and last samples are always kept. For every bucket in between, the sample forming the largest
+    triangle with the sample selected in the previous bucket and the average of the next bucket is selected.
+
+    Args:
+        values (np.ndarray): The samples of one channel.
+        points (int): The number of selected samples, at least 3.
+        x (np.ndarray, optional): The position of every sample, e.g. the time axis. Defaults to the sample index.
+
+    Returns:
+        np.ndarray: The sorted indices of the selected samples, all indices if values has at most points samples.
+    """
+    size = len(values)
+    if size <= points or points < 3:  # noqa: PLR2004
+        return np.arange(size)
+    y = np.asarray(values, dtype=float)
+    x = np.arange(size, dtype=float) if x is None else np.asarray(x, dtype=float)
+    # bucket boundaries for the samples between first and last one
+    edges = np.linspace(1, size - 1, points - 1).astype(int)
+    starts, stops = edges[:-1], edges[1:]
+    # averages of all buckets, computed at once with cumulative sums
+    x_sum, y_sum = np.concatenate(([0.0], np.cumsum(x))), np.concatenate(([0.0], np.cumsum(y)))
+    counts = stops - starts
+    x_avg = np.append((x_sum[stops] - x_sum[starts]) / counts, x[-1])
+    y_avg = np.append((y_sum[stops] - y_sum[starts]) / counts, y[-1])
+    selected = np.empty(points, dtype=int)
+    selected[0], selected[-1] = 0, size - 1
+    previous = 0
+    for bucket, (start, stop) in enumerate(zip(starts, stops)):
+        px, py = x[previous], y[previous]
+        next_x, next_y = x_avg[bucket + 1], y_avg[bucket + 1]
+        area = np.abs((px - next_x) * (y[start:stop] - py) - (px - x[start:stop]) * (next_y - py))
+        previous = start + int(area.argmax())
+        selected[bucket + 1] = previous
+    return selected
+
+
+def get_decimation_indices(
+    channels: Dict[str, np.ndarray],
+    points: int,
+    method: Optional[str] = MINMAX,
+    x: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Select the samples to plot for a set of channels sharing one time axis.
+
+    The selections of all channels are merged, so every channel keeps its peaks on a common time axis. The result
+    holds at most points times the number of channels samples.
+
+    Args:
+        channels (Dict[str, np.ndarray]): The channel name and its samples, all of the same length.
+        points (int): The number of samples per channel, about 2 times the plot width in pixels.
+        method (str, optional): MINMAX, LTTB or None for no decimation. Defaults to MINMAX.
+        x (np.ndarray, optional): The position of every sample, used by LTTB. Defaults to the sample index.
+
+    Returns:
+        np.ndarray: The sorted indices of the selected samples.
+
+    Raises:
+        ValueError: If the method is unknown.
+    """
+    if method is not None and method not in METHODS:
+        raise ValueError(f"Unknown decimation method: {method}")
+    size = len(next(iter(channels.values()))) if channels else 0
+    if method is None or size <= points:
+        return np.arange(size)
+    if method == MINMAX:
+        selections = [minmax_indices(values, points) for values in channels.values()]
+    else:
+        selections = [lttb_indices(values, points, x) for values in channels.values()]
+    return np.unique(np.concatenate(selections))
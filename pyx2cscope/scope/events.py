@@ -0,0 +1,134 @@
+"""Event capture: keep only the scope frames matching a condition.
+
+Looking for rare events, e.g. a current glitch, means capturing continuously for hours while almost every frame is
+uninteresting. An EventCapture evaluates a predicate on every complete frame and passes on only the matching frames,
+preceded by up to pre_frames frames captured before them, so the history leading to the event is kept as well.
+
+The predicate gets the whole ScopeFrame and should use numpy operations on its channels. Factories for common
+conditions are provided: exceeds (peak above a limit) and glitch (short pulse above a level).
+
+Usage:
+    event = EventCapture(exceeds("motor.iabc.a", 12), pre_frames=2)
+    events = acquisition.subscribe(maxsize=16, event=event)
+    # or persist only the events
+    recorder.attach(acquisition, event=event)
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Callable, List
+
+import numpy as np
+
+from pyx2cscope.scope.frame import ScopeFrame
+
+Predicate = Callable[[ScopeFrame], bool]
+
+
+def exceeds(channel: str, limit: float) -> Predicate:
+    """Create a predicate matching frames with an absolute value of channel above limit.
+
+    Args:
+        channel (str): The channel name.
+        limit (float): The limit of the absolute value.
+
+    Returns:
+        Callable[[ScopeFrame], bool]: The predicate.
+    """
+    return lambda frame: bool(np.max(np.abs(frame[channel])) > limit)
+
+
+def glitch(channel: str, level: float, max_width: int) -> Predicate:
+    """Create a predicate matching frames with a pulse above level lasting at most max_width samples.
+
+    Pulses touching the start or the end of the frame are ignored, as their width is unknown.
+
+    Args:
+        channel (str): The channel name.
+        level (float): The level the absolute value must exceed.
+        max_width (int): The maximum number of samples of a glitch.
+
+    Returns:
+        Callable[[ScopeFrame], bool]: The predicate.
+    """
+
+    def predicate(frame: ScopeFrame) -> bool:
+        above = np.abs(frame[channel]) > level
+        edges = np.diff(above.astype(np.int8))
+        rising = np.flatnonzero(edges == 1)
+        falling = np.flatnonzero(edges == -1)
+        if not len(rising) or not len(falling):
+            return False
+        falling = falling[falling > rising[0]]
+        count = min(len(rising), len(falling))
+        return bool(np.any(falling[:count] - rising[:count] <= max_width))
+
+    return predicate
+
+
+class EventCapture:
+    """Filter of complete frames passing only matching frames and the frames captured before them.
+
+    Attributes:
+        predicate (Callable[[ScopeFrame], bool]): The condition of an event.
+        pre_frames (int): The number of frames passed before every matching frame, if captured.
+        evaluated (int): The number of frames the predicate was evaluated on.
+        matched (int): The number of frames matching the predicate.
+        kept (int): The number of frames passed on, including the frames before events.
+        errors (int): The number of frames the predicate failed on, they are not passed on.
+    """
+
+    def __init__(self, predicate: Predicate, pre_frames: int = 0):
+        """Initialize the EventCapture instance.
+
+        Args:
+            predicate (Callable[[ScopeFrame], bool]): The condition of an event, gets the frame.
+            pre_frames (int): The number of frames passed before every matching frame. Defaults to 0.
+
+        Raises:
+            ValueError: If pre_frames is negative.
+        """
+        if pre_frames < 0:
+            raise ValueError(f"Number of frames before an event must be positive, got {pre_frames}")
+        self.predicate = predicate
+        self.pre_frames = pre_frames
+        self.evaluated = 0
+        self.matched = 0
+        self.kept = 0
+        self.errors = 0
+        self._history = deque(maxlen=pre_frames)
+        self._lock = threading.Lock()
+
+    def process(self, frame: ScopeFrame) -> List[ScopeFrame]:
+        """Evaluate the predicate on a frame.
+
+        Partial frames are ignored. A frame passed before an event is never passed again for a later event.
+
+        Args:
+            frame (ScopeFrame): The next frame of the acquisition.
+
+        Returns:
+            List[ScopeFrame]: The frames to be kept in capture order, empty if frame does not match.
+        """
+        if not frame.complete:
+            return []
+        try:
+            match = bool(self.predicate(frame))
+        except Exception as e:
+            logging.error(f"Error evaluating event predicate: {e}")
+            match = None
+        with self._lock:
+            self.evaluated += 1
+            if match is None:
+                self.errors += 1
+                return []
+            if not match:
+                if self.pre_frames:
+                    self._history.append(frame)
+                return []
+            self.matched += 1
+            frames = [*self._history, frame]
+            self._history.clear()
+            self.kept += len(frames)
+        return frames
@@ -0,0 +1,168 @@
+"""Columnar representation of a scope capture.
+
+A ScopeFrame holds the samples of every scope channel of one capture as contiguous numpy arrays together with the
+information needed to interpret them: the time between two samples, the position of the trigger event and when
+the capture was read. The time axis is computed on first access only.
+"""
+
+import time
+from dataclasses import dataclass, field, replace
+from functools import cached_property
+from numbers import Number
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from pyx2cscope.scope.decimate import MINMAX, get_decimation_indices
+from pyx2cscope.transfer import TransferStats
+
+
+@dataclass
+class ScopeFrame:
+    """Samples and metadata of one scope capture.
+
+    Attributes:
+        channels (Dict[str, np.ndarray]): The channel name and its samples, in the order the channels were added.
+        sample_period (float, optional): The time between two samples in milliseconds, including the sample time
+            factor. None if the sample time is unknown, the time axis is then the sample index.
+        trigger_index (int, optional): The sample index of the trigger event, None if the capture was not
+            triggered.
+        timestamp (float): The time the capture was read (seconds since epoch).
+        sequence (int): The number of the capture, incremented for every frame read by an X2CScope instance.
+        complete (bool): False for a partial frame holding only the datasets read so far, see ProgressiveReadout.
+        transfer_stats (TransferStats, optional): Chunks, retries and bytes re-read while reading the capture.
+        indices (np.ndarray, optional): The sample index of every value if the frame holds a selection of the
+            capture, e.g. after decimate. None if the frame holds all samples.
+        units (Dict[str, str]): The engineering unit of the channels that have one, e.g. {"motor.iabc.a": "A"}.
+    """
+
+    channels: Dict[str, np.ndarray]
+    sample_period: Optional[float] = None
+    trigger_index: Optional[int] = None
+    timestamp: float = field(default_factory=time.time)
+    sequence: int = 0
+    complete: bool = True
+    transfer_stats: Optional[TransferStats] = None
+    indices: Optional[np.ndarray] = None
+    units: Dict[str, str] = field(default_factory=dict)
+    _derived: Dict[Hashable, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __len__(self):
+        """Get the number of samples per channel."""
+        return len(next(iter(self.channels.values()))) if self.channels else 0
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the channel names."""
+        return iter(self.channels)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """Get the samples of a channel."""
+        return self.channels[name]
+
+    def __contains__(self, name):
+        """Check if the frame holds the given channel."""
+        return name in self.channels
+
+    @property
+    def names(self) -> List[str]:
+        """Get the channel names."""
+        return list(self.channels)
+
+    @cached_property
+    def time(self) -> np.ndarray:
+        """Get the time axis in milliseconds relative to the first sample, or the sample index if unknown."""
+        indices = np.arange(len(self)) if self.indices is None else self.indices
+        if self.sample_period is None:
+            return indices.astype(float)
+        return indices * self.sample_period
+
+    @property
+    def duration(self) -> float:
+        """Get the time span of the capture in milliseconds, or the number of samples if the time is unknown."""
+        return len(self) * (1.0 if self.sample_period is None else self.sample_period)
+
+    def scaled(self, name: str, gain: float = 1.0, offset: float = 0.0) -> np.ndarray:
+        """Get the samples of a channel multiplied by gain and shifted by offset.
+
+        Args:
+            name (str): The channel name.
+            gain (float): The scaling factor. Defaults to 1.0.
+            offset (float): The offset added after scaling. Defaults to 0.0.
+
+        Returns:
+            np.ndarray: The scaled samples as float array.
+        """
+        return self.channels[name] * gain + offset
+
+    def cached(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Get data derived from the frame, computed on the first request only.
+
+        Consumers sharing a frame, e.g. several views of the same capture, compute derived data like scaled channels
+        or chart labels once. The cached data must not be modified.
+
+        Args:
+            key (Hashable): Identifies the derived data, e.g. ("scaled", name, gain, offset).
+            compute (Callable[[], Any]): Computes the data if it is not cached yet.
+
+        Returns:
+            Any: The derived data.
+        """
+        if key not in self._derived:
+            self._derived[key] = compute()
+        return self._derived[key]
+
+    def decimate(
+        self,
+        points: int,
+        method: Optional[str] = MINMAX,
+        window: Optional[Tuple[float, float]] = None,
+    ) -> "ScopeFrame":
+        """Select the samples worth plotting, see pyx2cscope.scope.decimate.
+
+        The returned frame holds about points samples per channel and the indices of the selected samples, so its
+        time axis matches the original one. This frame keeps all samples, decimate again with a window to zoom.
+
+        Args:
+            points (int): The number of samples per channel, about 2 times the plot width in pixels.
+            method (str, optional): MINMAX, LTTB or None for no decimation. Defaults to MINMAX.
+            window (Tuple[float, float], optional): Only use the samples within this time range, in the unit of the
+                time axis. Defaults to None, i.e. the whole frame.
+
+        Returns:
+            ScopeFrame: A frame with the selected samples and the same metadata. Repeated calls with the same
+                arguments return the same frame.
+        """
+        return self.cached(("decimate", points, method, window), lambda: self._decimate(points, method, window))
+
+    def _decimate(self, points: int, method: Optional[str], window: Optional[Tuple[float, float]]) -> "ScopeFrame":
+        time = self.time
+        first, last = 0, len(self)
+        if window is not None:
+            first, last = np.searchsorted(time, window[0], side="left"), np.searchsorted(time, window[1], side="right")
+        channels = {name: values[first:last] for name, values in self.channels.items()}
+        selected = first + get_decimation_indices(channels, points, method, time[first:last])
+        return replace(
+            self,
+            channels={name: values[selected] for name, values in self.channels.items()},
+            indices=selected if self.indices is None else self.indices[selected],
+        )
+
+    def to_dict(self) -> Dict[str, List[Number]]:
+        """Get the channel samples as lists of Python numbers, e.g. to be serialised as JSON.
+
+        Returns:
+            Dict[str, List[Number]]: The channel name and its samples.
+        """
+        return {name: values.tolist() for name, values in self.channels.items()}
+
+    def to_csv(self, filename: str, delimiter: str = ","):
+        """Store the time axis and all channels to a CSV file.
+
+        Args:
+            filename (str): The path and name of the file.
+            delimiter (str): The column separator. Defaults to ",".
+        """
+        names = [f"{name} ({self.units[name]})" if name in self.units else name for name in self.channels]
+        header = delimiter.join(["time (ms)" if self.sample_period is not None else "sample", *names])
+        columns = np.column_stack([self.time, *self.channels.values()]) if self.channels else np.empty((0, 1))
+        np.savetxt(filename, columns, delimiter=delimiter, header=header, comments="", fmt="%.10g")
@@ -0,0 +1,151 @@
+"""Time range and value queries over scope recordings.
+
+Every capture written by ScopeRecorder is summarised in a zone map: the time of its first and last sample and the
+minimum, maximum and mean of every channel. RecordingIndex loads only these summaries. A query locates the time range
+by binary search and skips every capture whose summary cannot match the value conditions, only the remaining
+candidates are read from disk to confirm the match.
+
+Usage:
+    index = RecordingIndex("test_run")
+    for frame in index.query(start=t0, end=t1, where={"motor.apiData.velocityMeasured": (3000, None)}):
+        analyse(frame)
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from pyx2cscope.scope.frame import ScopeFrame
+from pyx2cscope.scope.recorder import ScopeRecording, list_recording_files
+
+Bounds = Tuple[Optional[float], Optional[float]]
+
+
+@dataclass
+class QueryStats:
+    """Figures of the last query.
+
+    Attributes:
+        captures (int): The number of captures within the time range.
+        candidates (int): The number of captures not excluded by the zone maps, i.e. read from disk.
+        matches (int): The number of captures matching all conditions.
+    """
+
+    captures: int = 0
+    candidates: int = 0
+    matches: int = 0
+
+
+class RecordingIndex:
+    """Query the parts of a scope recording by time range and channel values.
+
+    Attributes:
+        parts (List[ScopeRecording]): The parts of the recording in order.
+        stats (QueryStats): The figures of the last query.
+    """
+
+    def __init__(self, prefix: str):
+        """Initialize the RecordingIndex instance.
+
+        Args:
+            prefix (str): The prefix given to ScopeRecorder.
+        """
+        self.parts: List[ScopeRecording] = [ScopeRecording(filename) for filename in list_recording_files(prefix)]
+        self.stats = QueryStats()
+
+    def __len__(self):
+        """Get the number of captures of all parts."""
+        return sum(len(part) for part in self.parts)
+
+    @staticmethod
+    def _check_where(part: ScopeRecording, where: Dict[str, Bounds]):
+        for name in where:
+            if name not in part.names:
+                raise ValueError(f"Channel {name} is not part of {part.filename}")
+
+    @staticmethod
+    def _zone_mask(zones: np.ndarray, where: Dict[str, Bounds]) -> np.ndarray:
+        mask = np.ones(len(zones), dtype=bool)
+        for name, (low, high) in where.items():
+            summary = zones["channels"][name]
+            if low is not None:
+                mask &= summary["max"] >= low
+            if high is not None:
+                mask &= summary["min"] <= high
+        return mask
+
+    @staticmethod
+    def _matches(part: ScopeRecording, capture: int, where: Dict[str, Bounds]) -> bool:
+        for name, (low, high) in where.items():
+            values = part.records[name][capture]
+            inside = np.ones(len(values), dtype=bool)
+            if low is not None:
+                inside &= values >= low
+            if high is not None:
+                inside &= values <= high
+            if not inside.any():
+                return False
+        return True
+
+    def find(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        where: Optional[Dict[str, Bounds]] = None,
+        exact: bool = True,
+    ) -> List[Tuple[int, int]]:
+        """Find the captures overlapping a time range, with at least one sample inside given value bounds.
+
+        Args:
+            start (float, optional): The start of the time range (seconds since epoch). Defaults to None.
+            end (float, optional): The end of the time range (seconds since epoch). Defaults to None.
+            where (Dict[str, Tuple[float, float]], optional): Channel name and (low, high) bounds, None for an
+                open bound. Every channel must have at least one sample within its bounds. Defaults to None.
+            exact (bool): If True, the candidates left by the zone maps are confirmed with their data. If False,
+                the candidates are returned, which may include captures not matching. Defaults to True.
+
+        Returns:
+            List[Tuple[int, int]]: The part and capture number of every matching capture.
+
+        Raises:
+            ValueError: If a channel of where is not part of the recording.
+        """
+        where = where or {}
+        self.stats = QueryStats()
+        found = []
+        for number, part in enumerate(self.parts):
+            self._check_where(part, where)
+            zones = part.zones
+            # captures are stored in time order, so the time range is located by binary search
+            first = 0 if start is None else int(np.searchsorted(zones["t_end"], start, side="left"))
+            last = len(zones) if end is None else int(np.searchsorted(zones["t_start"], end, side="right"))
+            if first >= last:
+                continue
+            self.stats.captures += last - first
+            candidates = first + np.flatnonzero(self._zone_mask(zones[first:last], where))
+            self.stats.candidates += len(candidates)
+            for capture in candidates.tolist():
+                if not exact or not where or self._matches(part, capture, where):
+                    found.append((number, capture))
+        self.stats.matches = len(found)
+        return found
+
+    def query(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        where: Optional[Dict[str, Bounds]] = None,
+    ) -> Iterator[ScopeFrame]:
+        """Get the matching captures as frames, see find.
+
+        Args:
+            start (float, optional): The start of the time range (seconds since epoch). Defaults to None.
+            end (float, optional): The end of the time range (seconds since epoch). Defaults to None.
+            where (Dict[str, Tuple[float, float]], optional): Channel name and (low, high) bounds. Defaults to None.
+
+        Yields:
+            ScopeFrame: The next matching capture, the channels are views into the recording file.
+        """
+        for number, capture in self.find(start, end, where):
+            yield self.parts[number].get_frame(capture)
@@ -0,0 +1,247 @@
+"""Motor control analysis of scope captures, per electrical cycle.
+
+The electrical cycles of a capture are detected on a reference channel, e.g. a phase current, by its rising zero
+crossings. All metrics are computed for all cycles at once with numpy segment reductions, no Python loop runs over
+the samples or the cycles:
+
+    frequency       the electrical frequency of every cycle, from interpolated crossings
+    rms, mean       the RMS and mean value of every channel and cycle
+    harmonics       the amplitude of the fundamental and the harmonics of every channel and cycle
+    get_phase       the phase angle between two channels per cycle, e.g. voltage and current
+    get_thd         the total harmonic distortion per cycle
+
+get_speed derives the rotor speed from a position or angle channel.
+
+Usage:
+    frame = x2c_scope.get_scope_frame()
+    analysis = analyze_cycles(frame, "motor.iabc.a", ["motor.iabc.a", "motor.iabc.b", "motor.vabc.a"])
+    print(analysis.frequency.mean(), analysis.rms["motor.iabc.a"].mean(), analysis.get_thd("motor.iabc.a").mean())
+    print(analysis.get_phase("motor.vabc.a", "motor.iabc.a"))
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from pyx2cscope.scope.frame import ScopeFrame
+
+
+def find_rising_crossings(values: np.ndarray, level: float = 0.0, hysteresis: float = 0.0) -> np.ndarray:
+    """Find where a signal rises above a level.
+
+    Noise around the level is ignored by the hysteresis: a crossing is only detected after the signal was below
+    level - hysteresis, the crossing itself is where it rises above level + hysteresis.
+
+    Args:
+        values (np.ndarray): The samples.
+        level (float): The crossing level. Defaults to 0.0.
+        hysteresis (float): Half the width of the band around level that is ignored. Defaults to 0.0.
+
+    Returns:
+        np.ndarray: The crossing positions as fractional sample index, linearly interpolated between the samples.
+    """
+    values = np.asarray(values, dtype=float)
+    if len(values) < 2:  # noqa: PLR2004
+        return np.zeros(0)
+    high = level + hysteresis
+    state = np.where(values > high, 1, np.where(values < level - hysteresis, -1, 0))
+    # samples inside the band keep the state of the last sample outside the band
+    last = np.maximum.accumulate(np.where(state != 0, np.arange(len(state)), 0))
+    state = state[last]
+    rising = np.flatnonzero((state[:-1] < 0) & (state[1:] > 0)) + 1
+    # the sample before a crossing is within or below the band, so the fraction is in [0, 1)
+    before, after = values[rising - 1], values[rising]
+    return rising - 1 + (high - before) / (after - before)
+
+
+@dataclass
+class CycleAnalysis:
+    """Metrics of every electrical cycle of a capture.
+
+    Cycle k spans the samples starts[k] to starts[k] + lengths[k] (exclusive), consecutive cycles are adjacent.
+
+    Attributes:
+        reference (str): The channel the cycles were detected on.
+        starts (np.ndarray): The first sample of every cycle.
+        lengths (np.ndarray): The number of samples of every cycle.
+        period (np.ndarray): The duration of every cycle in milliseconds, in samples if the sample time is unknown.
+        rms (Dict[str, np.ndarray]): The RMS value of every channel and cycle.
+        mean (Dict[str, np.ndarray]): The mean value of every channel and cycle.
+        phasors (Dict[str, np.ndarray]): The complex amplitude of the fundamental (column 0) and the harmonics of
+            every channel and cycle, shape (cycles, harmonics).
+        sample_period (float, optional): The sample period of the frame in milliseconds.
+    """
+
+    reference: str
+    starts: np.ndarray
+    lengths: np.ndarray
+    period: np.ndarray
+    rms: Dict[str, np.ndarray]
+    mean: Dict[str, np.ndarray]
+    phasors: Dict[str, np.ndarray]
+    sample_period: Optional[float] = None
+
+    def __len__(self):
+        """Get the number of cycles."""
+        return len(self.starts)
+
+    @property
+    def frequency(self) -> np.ndarray:
+        """Get the electrical frequency of every cycle in Hz, in cycles per sample if the sample time is unknown."""
+        scale = 1.0 if self.sample_period is None else 1000.0
+        return scale / self.period
+
+    @property
+    def harmonics(self) -> Dict[str, np.ndarray]:
+        """Get the amplitude of the fundamental (column 0) and the harmonics of every channel and cycle."""
+        return {name: np.abs(phasors) for name, phasors in self.phasors.items()}
+
+    def get_phase(self, reference: str, name: str) -> np.ndarray:
+        """Get the phase angle of the fundamental of a channel relative to another channel.
+
+        Args:
+            reference (str): The channel the angle is measured from, e.g. the phase voltage.
+            name (str): The channel the angle is measured to, e.g. the phase current.
+
+        Returns:
+            np.ndarray: The angle of every cycle in degrees, -180 to 180, positive if name leads reference.
+        """
+        return np.degrees(np.angle(self.phasors[name][:, 0] * np.conj(self.phasors[reference][:, 0])))
+
+    def get_thd(self, name: str) -> np.ndarray:
+        """Get the total harmonic distortion of a channel.
+
+        Args:
+            name (str): The channel name.
+
+        Returns:
+            np.ndarray: The RMS of the harmonics relative to the fundamental of every cycle, e.g. 0.05 for 5 %.
+        """
+        amplitudes = np.abs(self.phasors[name])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.sqrt(np.sum(amplitudes[:, 1:] ** 2, axis=1)) / amplitudes[:, 0]
+
+    def get_summary(self) -> Dict:
+        """Get the mean over all cycles as plain Python values, e.g. to be shown in a GUI.
+
+        Returns:
+            Dict: The number of cycles, the frequency, and the RMS, THD and phase of every channel. The phase is
+                the circular mean of get_phase relative to the reference channel, if the reference was analysed.
+                THD and phase are None for channels without fundamental.
+        """
+        if not len(self):
+            return {"reference": self.reference, "cycles": 0}
+        summary = {
+            "reference": self.reference,
+            "cycles": len(self),
+            "frequency": float(np.mean(self.frequency)),
+            "rms": {name: float(np.mean(rms)) for name, rms in self.rms.items()},
+            "thd": {name: _get_finite_mean(self.get_thd(name)) for name in self.phasors},
+        }
+        if self.reference in self.phasors:
+            summary["phase"] = {name: self._get_mean_phase(name) for name in self.phasors}
+        return summary
+
+    def _get_mean_phase(self, name: str) -> Optional[float]:
+        """Get the mean phase angle of a channel relative to the reference in degrees, averaged as unit vectors."""
+        ratio = self.phasors[name][:, 0] * np.conj(self.phasors[self.reference][:, 0])
+        ratio = ratio[np.abs(ratio) > 0]
+        if not len(ratio):
+            return None
+        return float(np.degrees(np.angle(np.mean(ratio / np.abs(ratio)))))
+
+
+def _get_finite_mean(values: np.ndarray) -> Optional[float]:
+    """Get the mean of the finite values, None if there is none."""
+    finite = values[np.isfinite(values)]
+    return float(np.mean(finite)) if len(finite) else None
+
+
+def analyze_cycles(
+    frame: ScopeFrame,
+    reference: str,
+    channels: Optional[Iterable[str]] = None,
+    harmonics: int = 10,
+    hysteresis: float = 0.0,
+) -> CycleAnalysis:
+    """Detect the electrical cycles of a capture and compute their metrics.
+
+    The cycles start at the rising zero crossings of reference. The harmonics are computed by a DFT over every
+    cycle, limited to half the samples of the shortest cycle. The result is cached on the frame.
+
+    Args:
+        frame (ScopeFrame): The capture, with all samples.
+        reference (str): The channel the cycles are detected on, e.g. a phase current.
+        channels (Iterable[str], optional): The channels to be analysed. Defaults to all channels.
+        harmonics (int): The number of amplitudes computed per cycle, the fundamental included. Defaults to 10.
+        hysteresis (float): Noise band around zero ignored when detecting crossings. Defaults to 0.0.
+
+    Returns:
+        CycleAnalysis: The metrics of every complete cycle, no cycle if reference crosses zero less than twice.
+
+    Raises:
+        ValueError: If the frame holds a selection of the samples, e.g. after decimate.
+    """
+    if frame.indices is not None:
+        raise ValueError("Cycle analysis requires equally spaced samples, use the frame before decimation")
+    names = tuple(frame.names if channels is None else channels)
+    key = ("cycles", reference, names, harmonics, hysteresis)
+    return frame.cached(key, lambda: _analyze_cycles(frame, reference, names, harmonics, hysteresis))
+
+
+def _analyze_cycles(frame: ScopeFrame, reference: str, names: tuple, harmonics: int, hysteresis: float):
+    crossings = find_rising_crossings(frame[reference], hysteresis=hysteresis)
+    bounds = np.ceil(crossings).astype(np.int64)
+    starts, lengths = bounds[:-1], np.diff(bounds)
+    period = np.diff(crossings) * (1.0 if frame.sample_period is None else frame.sample_period)
+    if not len(starts):
+        empty = {name: np.zeros(0) for name in names}
+        phasors = {name: np.zeros((0, harmonics), dtype=complex) for name in names}
+        return CycleAnalysis(reference, starts, lengths, period, empty, dict(empty), phasors, frame.sample_period)
+
+    # phase of every sample within its cycle, 0 to 2 pi
+    offsets = np.arange(bounds[0], bounds[-1]) - np.repeat(starts, lengths)
+    theta = 2 * np.pi * offsets / np.repeat(lengths, lengths)
+    segments = starts - bounds[0]
+    harmonics = max(1, min(harmonics, int(lengths.min()) // 2))
+    rotations = [np.exp(-1j * h * theta) for h in range(1, harmonics + 1)]
+    rms, mean, phasors = {}, {}, {}
+    for name in names:
+        values = np.asarray(frame[name][bounds[0] : bounds[-1]], dtype=float)
+        mean[name] = np.add.reduceat(values, segments) / lengths
+        rms[name] = np.sqrt(np.add.reduceat(values**2, segments) / lengths)
+        phasors[name] = np.stack(
+            [np.add.reduceat(values * rotation, segments) * 2 / lengths for rotation in rotations], axis=1
+        )
+    return CycleAnalysis(reference, starts, lengths, period, rms, mean, phasors, frame.sample_period)
+
+
+def get_speed(frame: ScopeFrame, position: str, counts_per_revolution: float, pole_pairs: int = 1) -> np.ndarray:
+    """Get the rotor speed from a position or angle channel.
+
+    The position is unwrapped, so a position counter overflowing or an angle wrapping at 2 pi is handled.
+
+    Args:
+        frame (ScopeFrame): The capture, with all samples.
+        position (str): The position channel, e.g. an encoder count or the electrical angle in Q15.
+        counts_per_revolution (float): The position change of one revolution, e.g. 65536 for a 16 bit angle or
+            2 pi for radians.
+        pole_pairs (int): The pole pairs if position is an electrical angle, to get the mechanical speed.
+            Defaults to 1.
+
+    Returns:
+        np.ndarray: The speed of every sample in revolutions per minute.
+
+    Raises:
+        ValueError: If the sample time is unknown or the frame holds a selection of the samples.
+    """
+    if frame.sample_period is None:
+        raise ValueError("Speed requires the sample time, see get_scope_sample_time")
+    if frame.indices is not None:
+        raise ValueError("Speed requires equally spaced samples, use the frame before decimation")
+    if len(frame) < 2:  # noqa: PLR2004
+        return np.zeros(len(frame))
+    unwrapped = np.unwrap(np.asarray(frame[position], dtype=float), period=counts_per_revolution)
+    revolutions_per_second = np.gradient(unwrapped, frame.sample_period / 1000) / counts_per_revolution
+    return revolutions_per_second * 60 / pole_pairs
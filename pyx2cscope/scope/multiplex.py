@@ -0,0 +1,213 @@
+"""Time multiplexed captures of more channels than the scope supports at once.
+
+The firmware scope samples at most MAX_SCOPE_CHANNELS channels per capture. For repetitive, triggered tests, e.g.
+a motor start, the channels can be split into groups captured one after the other on the same trigger condition.
+Every capture places the trigger event at the same position relative to its data, so the groups are aligned on
+their trigger index and merged into one wide ScopeFrame. Computed channels are evaluated once on the merged frame,
+so their expressions may combine channels of different groups.
+
+All groups share the time axis of the merged frame, hence its length is given by the group with the largest
+dataset. plan_groups distributes the channels by width so this largest dataset is as small as possible.
+
+Usage:
+    capture = MultiplexCapture(x2c_scope, variables, TriggerConfig(trigger_variable, trigger_level=100))
+    print(f"{capture.plan.captures} captures of {capture.plan.samples} samples")
+    frame = capture.capture(timeout=5)
+"""
+
+import logging
+import math
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional, Sequence
+
+import numpy as np
+
+from mchplnet.services.scope import MAX_SCOPE_CHANNELS, ScopeChannel
+from pyx2cscope.scope.frame import ScopeFrame
+
+if TYPE_CHECKING:
+    import threading
+
+    from pyx2cscope.variable.variable import Variable
+    from pyx2cscope.x2cscope import TriggerConfig, X2CScope
+
+
+@dataclass
+class MultiplexPlan:
+    """Channel groups of a multiplexed capture.
+
+    Attributes:
+        groups (List[List[str]]): The channel names captured together, one list per capture.
+        dataset_sizes (List[int]): The dataset size of every group in bytes.
+        samples (int): The samples per channel of the merged frame, given by the largest dataset.
+    """
+
+    groups: List[List[str]]
+    dataset_sizes: List[int]
+    samples: int
+
+    @property
+    def captures(self) -> int:
+        """Get the number of triggered captures needed for all channels."""
+        return len(self.groups)
+
+
+def plan_groups(
+    channels: Sequence[ScopeChannel],
+    data_array_size: int,
+    max_channels: int = MAX_SCOPE_CHANNELS,
+) -> MultiplexPlan:
+    """Split channels into the least number of groups, balancing the dataset sizes.
+
+    The widest channels are placed first, each into the group with the smallest dataset still having room, so
+    channels of the same type end up spread evenly and the largest dataset is kept small.
+
+    Args:
+        channels (Sequence[ScopeChannel]): The channels to be captured.
+        data_array_size (int): The size of the Scope Data Array in bytes.
+        max_channels (int, optional): The channels per capture. Defaults to MAX_SCOPE_CHANNELS.
+
+    Returns:
+        MultiplexPlan: The groups in channel order and the samples per channel.
+
+    Raises:
+        ValueError: If no channel is given.
+    """
+    if not channels:
+        raise ValueError("At least one channel is needed for a multiplexed capture")
+    count = math.ceil(len(channels) / max_channels)
+    members = [[] for _ in range(count)]
+    sizes = [0] * count
+    order = sorted(range(len(channels)), key=lambda index: channels[index].data_type_size, reverse=True)
+    for index in order:
+        group = min(
+            (group for group in range(count) if len(members[group]) < max_channels),
+            key=lambda group: sizes[group],
+        )
+        members[group].append(index)
+        sizes[group] += channels[index].data_type_size
+    groups = [[channels[index].name for index in sorted(group)] for group in members]
+    return MultiplexPlan(groups=groups, dataset_sizes=sizes, samples=data_array_size // max(sizes))
+
+
+def merge_frames(frames: Sequence[ScopeFrame]) -> ScopeFrame:
+    """Align triggered frames on their trigger index and merge their channels into one frame.
+
+    The merged frame keeps the samples all frames have around the trigger event: as many samples before the
+    trigger as the frame with the fewest, and the same for the samples after it.
+
+    Args:
+        frames (Sequence[ScopeFrame]): The captures of the groups, all with the same sample period.
+
+    Returns:
+        ScopeFrame: All channels on one time axis, with timestamp and sequence of the last frame.
+
+    Raises:
+        ValueError: If no frame is given, a frame has no trigger index or the sample periods differ.
+    """
+    if not frames:
+        raise ValueError("No frames to merge")
+    if any(frame.trigger_index is None for frame in frames):
+        raise ValueError("Only triggered frames can be aligned")
+    if len({frame.sample_period for frame in frames}) > 1:
+        raise ValueError("Frames with different sample periods cannot be merged")
+    before = min(frame.trigger_index for frame in frames)
+    after = min(len(frame) - frame.trigger_index for frame in frames)
+    channels, units = {}, {}
+    for frame in frames:
+        start = frame.trigger_index - before
+        for name, values in frame.channels.items():
+            channels[name] = np.ascontiguousarray(values[start : start + before + after])
+        units.update(frame.units)
+    last = frames[-1]
+    return ScopeFrame(
+        channels=channels,
+        sample_period=last.sample_period,
+        trigger_index=before,
+        timestamp=last.timestamp,
+        sequence=last.sequence,
+        units=units,
+    )
+
+
+class MultiplexCapture:
+    """Capture more channels than the scope supports by rotating channel groups over triggered captures.
+
+    The scope channels and the trigger of the X2CScope instance are replaced by every capture, the last group
+    stays configured afterwards. The sample time set before is kept for all groups.
+
+    Attributes:
+        plan (MultiplexPlan): The channel groups, one per capture.
+    """
+
+    def __init__(
+        self,
+        x2c_scope: "X2CScope",
+        variables: Sequence["Variable"],
+        trigger: "TriggerConfig",
+        max_channels: int = MAX_SCOPE_CHANNELS,
+    ):
+        """Initialize the MultiplexCapture instance.
+
+        Args:
+            x2c_scope (X2CScope): The scope used for all captures.
+            variables (Sequence[Variable]): The variables to be captured, in the order of the merged frame.
+            trigger (TriggerConfig): The trigger condition shared by all captures.
+            max_channels (int, optional): The channels per capture. Defaults to MAX_SCOPE_CHANNELS.
+        """
+        from pyx2cscope.x2cscope import get_variable_as_scope_channel
+
+        self.x2c_scope = x2c_scope
+        self.trigger = trigger
+        self._variables = {variable.info.name: variable for variable in variables}
+        channels = [get_variable_as_scope_channel(variable) for variable in variables]
+        self.plan = plan_groups(channels, x2c_scope.lnet.scope_data.data_array_size, max_channels)
+
+    def _arm(self, group: List[str]):
+        with self.x2c_scope.scope_config_batch():
+            self.x2c_scope.clear_all_scope_channel()
+            for name in group:
+                self.x2c_scope.add_scope_channel(self._variables[name])
+            self.x2c_scope.set_scope_trigger(self.trigger)
+            self.x2c_scope.request_scope_data()
+
+    def get_unavailable_computed_channels(self) -> List[str]:
+        """Get the computed channels of the scope that can't be evaluated on the captured variables.
+
+        Returns:
+            List[str]: The names of computed channels referencing a channel neither captured nor computed.
+        """
+        available = set(self._variables)
+        unavailable = []
+        for name in self.x2c_scope.computed_channels:
+            if all(channel in available for channel in self.x2c_scope.computed_channels[name].channels):
+                available.add(name)
+            else:
+                unavailable.append(name)
+        return unavailable
+
+    def capture(
+        self,
+        timeout: Optional[float] = None,
+        cancel: Optional["threading.Event"] = None,
+    ) -> Optional[ScopeFrame]:
+        """Capture every group once and merge the captures.
+
+        Args:
+            timeout (float, optional): Maximum time to wait for each capture in seconds. Defaults to None.
+            cancel (threading.Event, optional): Stops the capture once set. Defaults to None.
+
+        Returns:
+            ScopeFrame: All channels aligned on the trigger event followed by the computed channels, None if a
+                capture timed out or was cancelled.
+        """
+        unavailable = self.get_unavailable_computed_channels()
+        if unavailable:
+            logging.warning(f"Computed channels not covered by the multiplexed variables: {', '.join(unavailable)}")
+        frames = []
+        for group in self.plan.groups:
+            self._arm(group)
+            if not self.x2c_scope.wait_for_scope_data(timeout, cancel):
+                return None
+            frames.append(self.x2c_scope.get_scope_frame(computed=False))
+        return self.x2c_scope.computed_channels.apply(merge_frames(frames))
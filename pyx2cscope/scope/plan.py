@@ -0,0 +1,166 @@
+"""Capacity planning of the Scope Data Array.
+
+The Scope Data Array (SDA) has a fixed size, every sample stores one dataset, i.e. one value of every scope channel.
+The number of samples per capture is therefore the SDA size divided by the dataset size, and the time window of a
+capture is this number times the sample period, which is the scope task period times the sample time prescaler.
+
+plan_capacity answers, before sampling, how many samples a set of channels gets, which prescaler reaches a desired
+window with the finest resolution, and how many samples narrower channel types would add.
+
+Usage:
+    plan = x2c_scope.plan_scope(desired_window_ms=200, sample_period_us=50)
+    x2c_scope.set_sample_time(plan.prescaler)
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
+
+from mchplnet.services.scope import MAX_SCOPE_CHANNELS, ScopeChannel
+
+MAX_PRESCALER = 0x10000  # the 0-based sample time factor is sent as 16 bit value
+NARROW_WIDTH = 2  # Q15 or int16 representation
+
+
+@dataclass
+class ChannelSuggestion:
+    """A narrower representation of a scope channel.
+
+    Attributes:
+        name (str): The name of the channel.
+        width (int): The current size of the channel in bytes.
+        suggested_width (int): The size of the suggested representation in bytes.
+        representation (str): The suggested representation, e.g. "Q15 int16".
+        samples (int): The samples per channel with only this channel narrowed.
+    """
+
+    name: str
+    width: int
+    suggested_width: int
+    representation: str
+    samples: int
+
+
+@dataclass
+class ScopePlan:
+    """Result of a scope capacity planning.
+
+    Attributes:
+        channels (List[str]): The names of the planned channels.
+        dataset_size (int): The size of one sample of all channels in bytes.
+        samples (int): The number of samples per channel and capture.
+        prescaler (int): The sample time to pass to set_sample_time, the smallest one reaching the desired window.
+        sample_period_ms (float): The time between two samples with the prescaler in milliseconds.
+        window_ms (float): The time window of one capture with the prescaler in milliseconds.
+        unused_bytes (int): The bytes at the end of the SDA not filled by complete datasets.
+        suggestions (List[ChannelSuggestion]): Narrower representations of the channels, widest gain first.
+        narrowed_samples (int): The samples per channel with all suggestions applied.
+        warnings (List[str]): Conditions the user should be aware of.
+    """
+
+    channels: List[str]
+    dataset_size: int
+    samples: int
+    prescaler: int
+    sample_period_ms: float
+    window_ms: float
+    unused_bytes: int
+    suggestions: List[ChannelSuggestion] = field(default_factory=list)
+    narrowed_samples: int = 0
+    warnings: List[str] = field(default_factory=list)
+
+
+def get_narrow_representation(channel: ScopeChannel) -> Optional[str]:
+    """Get a narrower representation of a channel, if any.
+
+    Floating point values are usually limited to a known range in control software, so a Q15 copy keeps them
+    with sufficient resolution. Wide integers are suggested as their 16 bit counterpart.
+
+    Args:
+        channel (ScopeChannel): The channel to be checked.
+
+    Returns:
+        str: The suggested representation, None if the channel is 16 bit or narrower.
+    """
+    if channel.data_type_size <= NARROW_WIDTH:
+        return None
+    if not channel.is_integer:
+        return "Q15 int16"
+    return "int16" if channel.is_signed else "uint16"
+
+
+def plan_capacity(
+    channels: Sequence[ScopeChannel],
+    data_array_size: int,
+    sample_period_us: float,
+    desired_window_ms: Optional[float] = None,
+) -> ScopePlan:
+    """Plan samples, prescaler and window of a scope configuration.
+
+    Args:
+        channels (Sequence[ScopeChannel]): The channels to be sampled.
+        data_array_size (int): The size of the SDA in bytes.
+        sample_period_us (float): The period of the scope task in microseconds.
+        desired_window_ms (float, optional): The time window one capture should cover. Defaults to None, i.e. a
+            prescaler of 1 for the finest resolution.
+
+    Returns:
+        ScopePlan: The capacity figures of the configuration.
+
+    Raises:
+        ValueError: If no channel is given or the sample period is not positive.
+    """
+    if not channels:
+        raise ValueError("At least one channel is needed to plan the scope")
+    if sample_period_us <= 0:
+        raise ValueError(f"Invalid sample period: {sample_period_us} us")
+    warnings = []
+    dataset_size = sum(channel.data_type_size for channel in channels)
+    samples = data_array_size // dataset_size
+    base_window_ms = samples * sample_period_us / 1000
+    prescaler = 1
+    if desired_window_ms is not None and base_window_ms > 0:
+        prescaler = max(math.ceil(desired_window_ms / base_window_ms), 1)
+        if prescaler > MAX_PRESCALER:
+            prescaler = MAX_PRESCALER
+            warnings.append(f"The desired window of {desired_window_ms} ms cannot be reached")
+    unused_bytes = data_array_size - samples * dataset_size
+    if unused_bytes:
+        warnings.append(f"{unused_bytes} bytes at the end of the scope data array are not used")
+    if len(channels) > MAX_SCOPE_CHANNELS:
+        warnings.append(f"Only {MAX_SCOPE_CHANNELS} scope channels are supported, {len(channels)} were given")
+    if samples == 0:
+        warnings.append("A single dataset does not fit into the scope data array")
+
+    suggestions = []
+    narrowed_size = dataset_size
+    for channel in channels:
+        representation = get_narrow_representation(channel)
+        if representation is None:
+            continue
+        gain = channel.data_type_size - NARROW_WIDTH
+        narrowed_size -= gain
+        suggestions.append(
+            ChannelSuggestion(
+                name=channel.name,
+                width=channel.data_type_size,
+                suggested_width=NARROW_WIDTH,
+                representation=representation,
+                samples=data_array_size // (dataset_size - gain),
+            )
+        )
+    suggestions.sort(key=lambda suggestion: suggestion.samples, reverse=True)
+
+    sample_period_ms = prescaler * sample_period_us / 1000
+    return ScopePlan(
+        channels=[channel.name for channel in channels],
+        dataset_size=dataset_size,
+        samples=samples,
+        prescaler=prescaler,
+        sample_period_ms=sample_period_ms,
+        window_ms=samples * sample_period_ms,
+        unused_bytes=unused_bytes,
+        suggestions=suggestions,
+        narrowed_samples=data_array_size // narrowed_size,
+        warnings=warnings,
+    )
@@ -0,0 +1,156 @@
+"""Progressive readout of an untriggered scope capture.
+
+Without trigger, the firmware fills the Scope Data Array (SDA) linearly from its start and reports the number of
+bytes written as data_array_pointer. ProgressiveReadout reads the already written part while the firmware is still
+sampling, so the link is busy during the capture instead of idle followed by one large burst. Every read returns a
+partial ScopeFrame, the last one is complete and arrives about one chunk after the capture ended.
+
+Usage:
+    x2c_scope.request_scope_data()
+    readout = x2c_scope.get_progressive_readout()
+    for frame in readout.frames(timeout=5):
+        plot(frame)  # frame.complete is True for the last frame
+"""
+
+import threading
+import time
+from typing import TYPE_CHECKING, Iterator, Optional, Union
+
+import numpy as np
+
+from pyx2cscope.scope.frame import ScopeFrame
+from pyx2cscope.transfer import TransferStats, get_transfer_planner
+
+if TYPE_CHECKING:
+    from pyx2cscope.x2cscope import X2CScope
+
+POLL_INTERVAL = 0.008  # seconds between two scope state requests if the sample time is unknown
+MIN_POLL_INTERVAL = 0.001
+
+
+class ProgressiveReadout:
+    """Read an untriggered capture while it is being sampled.
+
+    Attributes:
+        size (int): The number of bytes of the capture.
+        position (int): The number of bytes read so far.
+        complete (bool): True once the whole capture has been read.
+        stats (TransferStats): The integrity figures of all reads of the capture.
+    """
+
+    def __init__(
+        self,
+        x2c_scope: "X2CScope",
+        dtype: Optional[Union[str, np.dtype]] = None,
+        min_read_size: Optional[int] = None,
+    ):
+        """Initialize the ProgressiveReadout instance, call it after request_scope_data.
+
+        Args:
+            x2c_scope (X2CScope): The armed scope.
+            dtype (str | np.dtype, optional): Convert all channels to this type. Defaults to None.
+            min_read_size (int, optional): The number of new bytes needed for a partial read. Defaults to one
+                read chunk of the link.
+
+        Raises:
+            ValueError: If the scope is configured with a trigger.
+        """
+        if not self.is_supported(x2c_scope):
+            raise ValueError("Progressive readout is only possible for untriggered captures")
+        setup = x2c_scope.scope_setup
+        self.x2c_scope = x2c_scope
+        self.dtype = dtype
+        self._dataset_size = setup.get_dataset_size()
+        if min_read_size is None:
+            min_read_size = get_transfer_planner(x2c_scope.lnet).read_chunk_size
+        self._min_read_size = max(min_read_size // self._dataset_size, 1) * self._dataset_size
+        self.size = int(x2c_scope._calc_sda_used_length())
+        self.position = 0
+        self.complete = False
+        self.stats = TransferStats()
+        self._buffer = bytearray(self.size)
+
+    @staticmethod
+    def is_supported(x2c_scope: "X2CScope") -> bool:
+        """Check if the scope configuration allows a progressive readout, i.e. no trigger is set.
+
+        Args:
+            x2c_scope (X2CScope): The scope to be checked.
+
+        Returns:
+            bool: True if the capture is filled linearly from the start of the SDA.
+        """
+        setup = x2c_scope.scope_setup
+        return not (setup.scope_state == 1 and setup.scope_trigger.channel is not None)
+
+    def poll(self) -> Optional[ScopeFrame]:
+        """Request the scope state once and read the data written since the last call.
+
+        Returns:
+            ScopeFrame: The datasets read so far, None if less than min_read_size new bytes are available.
+        """
+        if self.complete:
+            return None
+        scope_data = self.x2c_scope.lnet.load_parameters()
+        complete = (
+            scope_data.scope_state == 0
+            or scope_data.data_array_pointer == scope_data.data_array_used_length
+        )
+        if complete:
+            end = self.size
+        else:
+            end = min(scope_data.data_array_pointer, self.size)
+            end -= end % self._dataset_size
+            if end - self.position < self._min_read_size:
+                return None
+        if end > self.position:
+            data = self.x2c_scope.read_scope_range(self.position, end - self.position, self.stats)
+            self._buffer[self.position : self.position + len(data)] = data
+            self.position = end
+        self.complete = complete
+        return self.x2c_scope.decode_scope_frame(
+            memoryview(self._buffer)[:end],
+            valid_data=False,
+            dtype=self.dtype,
+            complete=complete,
+            transfer_stats=self.stats,
+        )
+
+    def get_poll_interval(self) -> float:
+        """Get the time the firmware needs to write min_read_size bytes.
+
+        Returns:
+            float: The interval in seconds, POLL_INTERVAL if the sample time is unknown.
+        """
+        sample_period = self.x2c_scope.get_scope_sample_period()
+        if sample_period is None:
+            return POLL_INTERVAL
+        return max(self._min_read_size // self._dataset_size * sample_period / 1000, MIN_POLL_INTERVAL)
+
+    def frames(
+        self,
+        timeout: Optional[float] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> Iterator[ScopeFrame]:
+        """Yield partial frames until the capture is complete.
+
+        Args:
+            timeout (float, optional): Maximum time to wait for the capture in seconds. Defaults to None.
+            cancel (threading.Event, optional): Stops the readout once set. Defaults to None.
+
+        Yields:
+            ScopeFrame: The datasets read so far, the last frame is complete unless the readout timed out or was
+            cancelled.
+        """
+        sleep = cancel.wait if cancel is not None else time.sleep
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        interval = self.get_poll_interval()
+        while not self.complete and (cancel is None or not cancel.is_set()):
+            frame = self.poll()
+            if frame is not None:
+                yield frame
+                if self.complete:
+                    return
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+            sleep(interval)
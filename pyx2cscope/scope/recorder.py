@@ -0,0 +1,454 @@
+"""Disk streaming of scope captures.
+
+ScopeRecorder appends every complete ScopeFrame to a binary recording file, so long tests do not keep the captures
+in memory. A recording consists of three files per part:
+
+    <prefix>_<part>.x2crec   header and capture data
+    <prefix>_<part>.x2cidx   one index record per capture: sequence, timestamp, trigger index and data offset
+    <prefix>_<part>.x2czone  one zone map record per capture: time range and min, max and mean of every channel
+
+The data file starts with the magic bytes, the header length and a JSON header describing the channels. The capture
+data follows at a 64 byte aligned offset as an array of datasets (one record per sample, one field per channel), so
+a whole file is mapped with numpy.memmap as a (captures, samples) structured array and every channel is a strided
+view into the file. All files are append only, a capture interrupted by a crash is ignored when reading. The zone
+maps are small and allow to skip captures without reading their data, see RecordingIndex.
+
+A new part is started once a file would exceed max_file_size, or when the channel configuration, the number of
+samples or the sample period changes. Every header holds the part number and a session id, so the parts of a
+recording are found without mixing in files of another one. An existing recording is never overwritten.
+
+Usage:
+    with ScopeRecorder("test_run") as recorder:
+        recorder.attach(x2c_scope.start_acquisition())
+        time.sleep(60)
+    recording = ScopeRecording(recorder.files[0])
+    phase_current = recording["motor.idq.q"]  # np.memmap view, shape (captures, samples)
+"""
+
+import glob
+import json
+import logging
+import os
+import queue
+import threading
+import uuid
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from pyx2cscope.scope.acquisition import BLOCK, ScopeAcquisition, Subscription
+from pyx2cscope.scope.events import EventCapture
+from pyx2cscope.scope.frame import ScopeFrame
+from pyx2cscope.scope.software import SoftwareScope
+
+MAGIC = b"X2CREC01"
+DATA_EXTENSION = ".x2crec"
+INDEX_EXTENSION = ".x2cidx"
+ZONE_EXTENSION = ".x2czone"
+HEADER_ALIGNMENT = 64
+INDEX_DTYPE = np.dtype([("sequence", "<u8"), ("timestamp", "<f8"), ("trigger_index", "<i8"), ("offset", "<u8")])
+
+
+def _get_data_offset(header_size: int) -> int:
+    """Get the offset of the capture data behind a JSON header of header_size bytes."""
+    return -(-(len(MAGIC) + 4 + header_size) // HEADER_ALIGNMENT) * HEADER_ALIGNMENT
+
+
+def get_frame_dtype(frame: ScopeFrame) -> np.dtype:
+    """Get the little endian structured data type of one dataset of a frame.
+
+    Args:
+        frame (ScopeFrame): The frame to be stored.
+
+    Returns:
+        np.dtype: A packed structured type with one field per channel.
+    """
+    return np.dtype([(name, values.dtype.newbyteorder("<")) for name, values in frame.channels.items()])
+
+
+def get_zone_dtype(names: List[str]) -> np.dtype:
+    """Get the data type of the zone map record of one capture.
+
+    Args:
+        names (List[str]): The channel names.
+
+    Returns:
+        np.dtype: Fields t_start and t_end (seconds since epoch) and a min, max and mean field per channel, accessed
+            as zones["channels"][name]["max"].
+    """
+    summary = np.dtype([("min", "<f8"), ("max", "<f8"), ("mean", "<f8")])
+    return np.dtype([("t_start", "<f8"), ("t_end", "<f8"), ("channels", [(name, summary) for name in names])])
+
+
+def get_capture_start(timestamp: np.ndarray, samples: int, sample_period: Optional[float]) -> np.ndarray:
+    """Get the start time of captures, which were read at timestamp.
+
+    Args:
+        timestamp (np.ndarray): The time the captures were read (seconds since epoch).
+        samples (int): The number of samples per capture.
+        sample_period (float, optional): The time between two samples in milliseconds.
+
+    Returns:
+        np.ndarray: The time of the first sample, timestamp if the sample period is unknown.
+    """
+    return timestamp - (0.0 if sample_period is None else samples * sample_period / 1000)
+
+
+def get_zone(frame: ScopeFrame) -> np.ndarray:
+    """Summarise a frame for its zone map.
+
+    Args:
+        frame (ScopeFrame): The frame to be summarised.
+
+    Returns:
+        np.ndarray: One record of get_zone_dtype, the summary is NaN if the frame has no samples.
+    """
+    zone = np.zeros(1, dtype=get_zone_dtype(frame.names))
+    zone["t_start"] = get_capture_start(frame.timestamp, len(frame), frame.sample_period)
+    zone["t_end"] = frame.timestamp
+    if not len(frame):
+        zone["channels"] = np.nan
+        return zone
+    for name, values in frame.channels.items():
+        summary = zone["channels"][name]
+        summary["min"], summary["max"], summary["mean"] = values.min(), values.max(), values.mean()
+    return zone
+
+
+class ScopeRecorder:
+    """Append scope frames to rotating recording files.
+
+    Attributes:
+        prefix (str): The path and base name of the recording files.
+        max_file_size (int): The size in bytes after which a new part is started.
+        session (str): The id written to the header of every part of this recording.
+        files (List[str]): The data files written so far, in order.
+        captures (int): The number of frames written.
+        error (OSError, optional): The error which stopped writing the frames of an attached acquisition.
+    """
+
+    def __init__(self, prefix: str, max_file_size: int = 1 << 30):
+        """Initialize the ScopeRecorder instance.
+
+        Args:
+            prefix (str): The path and base name of the recording files, e.g. "recordings/test_run".
+            max_file_size (int): The size in bytes after which a new part is started. Defaults to 1 GiB.
+
+        Raises:
+            FileExistsError: If a recording with this prefix exists already.
+        """
+        if glob.glob(f"{glob.escape(prefix)}_[0-9][0-9][0-9][0-9].x2c*"):
+            raise FileExistsError(f"Recording {prefix} exists already, choose another prefix")
+        self.prefix = prefix
+        self.session = uuid.uuid4().hex
+        self.max_file_size = max_file_size
+        self.files: List[str] = []
+        self.captures = 0
+        self.error: Optional[OSError] = None
+        self._header = None
+        self._data_file = None
+        self._index_file = None
+        self._zone_file = None
+        self._file_size = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._acquisition = None
+        self._subscription = None
+
+    def __enter__(self):
+        """Return the recorder to be used as context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Close the recorder when leaving the context."""
+        self.close()
+
+    def _get_header(self, frame: ScopeFrame) -> dict:
+        return {
+            "version": 1,
+            "channels": [[name, values.dtype.newbyteorder("<").str] for name, values in frame.channels.items()],
+            "samples": len(frame),
+            "sample_period": frame.sample_period,
+            "units": frame.units,
+        }
+
+    def _open_part(self, header: dict):
+        self._close_part()
+        filename = f"{self.prefix}_{len(self.files):04d}{DATA_EXTENSION}"
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        encoded = json.dumps({**header, "session": self.session, "part": len(self.files)}).encode()
+        data_offset = _get_data_offset(len(encoded))
+        # exclusive creation, parts of another recording are never overwritten
+        self._data_file = open(filename, "xb")
+        self._data_file.write(MAGIC)
+        self._data_file.write(len(encoded).to_bytes(4, byteorder="little"))
+        self._data_file.write(encoded.ljust(data_offset - len(MAGIC) - 4, b" "))
+        self._index_file = open(filename[: -len(DATA_EXTENSION)] + INDEX_EXTENSION, "xb")
+        self._zone_file = open(filename[: -len(DATA_EXTENSION)] + ZONE_EXTENSION, "xb")
+        self._file_size = data_offset
+        self._header = header
+        self.files.append(filename)
+
+    def _close_part(self):
+        for file in (self._data_file, self._index_file, self._zone_file):
+            if file is not None:
+                file.close()
+        self._data_file = self._index_file = self._zone_file = None
+
+    def write(self, frame: ScopeFrame):
+        """Append a complete frame to the recording, partial frames and frames without samples are ignored.
+
+        Args:
+            frame (ScopeFrame): The frame to be stored.
+        """
+        if not frame.complete or not len(frame):
+            return
+        with self._lock:
+            header = self._get_header(frame)
+            records = np.empty(len(frame), dtype=get_frame_dtype(frame))
+            for name, values in frame.channels.items():
+                records[name] = values
+            if (
+                self._data_file is None
+                or header != self._header
+                or self._file_size + records.nbytes > self.max_file_size
+            ):
+                self._open_part(header)
+            index = np.zeros(1, dtype=INDEX_DTYPE)
+            index["sequence"] = frame.sequence
+            index["timestamp"] = frame.timestamp
+            index["trigger_index"] = -1 if frame.trigger_index is None else frame.trigger_index
+            index["offset"] = self._file_size
+            self._data_file.write(records.tobytes())
+            self._index_file.write(index.tobytes())
+            self._zone_file.write(get_zone(frame).tobytes())
+            self._file_size += records.nbytes
+            self.captures += 1
+
+    def flush(self):
+        """Write buffered data to disk, so the recording can be read while it is written."""
+        with self._lock:
+            for file in (self._data_file, self._index_file, self._zone_file):
+                if file is not None:
+                    file.flush()
+
+    def attach(
+        self,
+        acquisition: Union[ScopeAcquisition, SoftwareScope],
+        maxsize: int = 16,
+        event: Optional[EventCapture] = None,
+    ):
+        """Write every frame of a continuous acquisition or a software scope on a background thread.
+
+        The recorder subscribes with the BLOCK policy, so the acquisition slows down rather than frames being lost
+        if the disk cannot keep up. If writing fails, the recorder unsubscribes and keeps the error in error, the
+        acquisition continues for its other consumers.
+
+        Args:
+            acquisition (ScopeAcquisition | SoftwareScope): The source of the frames.
+            maxsize (int): The number of frames buffered between acquisition and disk. Defaults to 16.
+            event (EventCapture, optional): Write only the frames of events, see EventCapture. Defaults to None.
+        """
+        self.detach()
+        self.error = None
+        self._acquisition = acquisition
+        self._subscription = acquisition.subscribe(maxsize, BLOCK, event)
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(self._subscription,), name="ScopeRecorder", daemon=True
+        )
+        self._thread.start()
+
+    def detach(self):
+        """Stop recording the attached acquisition, frames already received are written."""
+        if self._thread is None:
+            return
+        self._acquisition.unsubscribe(self._subscription)
+        self._stop.set()
+        self._thread.join()
+        self._thread = self._acquisition = self._subscription = None
+
+    def _run(self, subscription: Subscription):
+        while not self._stop.is_set() or len(subscription):
+            try:
+                frame = subscription.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            try:
+                self.write(frame)
+            except OSError as e:
+                logging.error(f"Error writing scope recording: {e}")
+                self.error = e
+                self._acquisition.unsubscribe(subscription)
+                # release the acquisition if it is blocked on the full queue
+                subscription.get_latest()
+                return
+
+    def close(self):
+        """Stop recording and close the files.
+
+        Raises:
+            OSError: If writing the frames of an attached acquisition failed, see error.
+        """
+        self.detach()
+        with self._lock:
+            self._close_part()
+        if self.error is not None:
+            raise self.error
+
+
+def _read_header(filename: str) -> Tuple[dict, int]:
+    """Read the JSON header of a recording part and its size in bytes, raise ValueError for other files."""
+    with open(filename, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{filename} is not a scope recording")
+        size = int.from_bytes(file.read(4), byteorder="little")
+        return json.loads(file.read(size)), size
+
+
+class ScopeRecording:
+    """Read access to one part of a scope recording without loading it into memory.
+
+    Attributes:
+        filename (str): The data file.
+        header (dict): The JSON header of the file.
+        records (np.memmap): The capture data, a structured array of shape (captures, samples).
+        index (np.ndarray): The index records of the captures, see INDEX_DTYPE.
+    """
+
+    def __init__(self, filename: str):
+        """Initialize the ScopeRecording instance.
+
+        Args:
+            filename (str): The data file (.x2crec) of the recording part.
+
+        Raises:
+            ValueError: If the file is not a scope recording.
+        """
+        self.filename = filename
+        self.header, size = _read_header(filename)
+        data_offset = _get_data_offset(size)
+        dtype = np.dtype([(name, dtype) for name, dtype in self.header["channels"]])
+        samples = self.header["samples"]
+        index_file = filename[: -len(DATA_EXTENSION)] + INDEX_EXTENSION
+        index_size = os.path.getsize(index_file) // INDEX_DTYPE.itemsize if os.path.exists(index_file) else 0
+        data_size = (os.path.getsize(filename) - data_offset) // (dtype.itemsize * samples)
+        captures = min(data_size, index_size)
+        if captures:
+            self.index = np.fromfile(index_file, dtype=INDEX_DTYPE, count=captures)
+            self.records = np.memmap(filename, dtype=dtype, mode="r", offset=data_offset, shape=(captures, samples))
+        else:
+            self.index = np.zeros(0, dtype=INDEX_DTYPE)
+            self.records = np.zeros((0, samples), dtype=dtype)
+        self._zones = None
+
+    def __len__(self):
+        """Get the number of captures."""
+        return len(self.records)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """Get all captures of a channel as view into the file, shape (captures, samples)."""
+        return self.records[name]
+
+    def __iter__(self) -> Iterator[ScopeFrame]:
+        """Iterate over the captures as frames."""
+        for i in range(len(self)):
+            yield self.get_frame(i)
+
+    @property
+    def names(self) -> List[str]:
+        """Get the channel names."""
+        return [name for name, _ in self.header["channels"]]
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Get the time every capture was read (seconds since epoch)."""
+        return self.index["timestamp"]
+
+    @property
+    def zones(self) -> np.ndarray:
+        """Get the zone map of the captures, see get_zone_dtype.
+
+        The zone map is read from its file. If it is missing or incomplete, it is computed from the capture data.
+        """
+        if self._zones is None:
+            dtype = get_zone_dtype(self.names)
+            zone_file = self.filename[: -len(DATA_EXTENSION)] + ZONE_EXTENSION
+            if os.path.exists(zone_file) and os.path.getsize(zone_file) >= len(self) * dtype.itemsize:
+                self._zones = np.fromfile(zone_file, dtype=dtype, count=len(self))
+            else:
+                self._zones = self._build_zones(dtype)
+        return self._zones
+
+    def _build_zones(self, dtype: np.dtype) -> np.ndarray:
+        zones = np.zeros(len(self), dtype=dtype)
+        if not len(self):
+            return zones
+        zones["t_end"] = self.timestamps
+        zones["t_start"] = get_capture_start(
+            self.timestamps, self.header["samples"], self.header["sample_period"]
+        )
+        for name in self.names:
+            summary = zones["channels"][name]
+            values = self.records[name]
+            summary["min"], summary["max"], summary["mean"] = values.min(1), values.max(1), values.mean(1)
+        return zones
+
+    def get_frame(self, capture: int) -> ScopeFrame:
+        """Get one capture as frame, the channels are views into the file.
+
+        Args:
+            capture (int): The capture number within this file.
+
+        Returns:
+            ScopeFrame: The capture with its metadata.
+        """
+        index = self.index[capture]
+        channels: Dict[str, np.ndarray] = {name: self.records[name][capture] for name in self.names}
+        trigger_index = int(index["trigger_index"])
+        return ScopeFrame(
+            channels=channels,
+            sample_period=self.header["sample_period"],
+            trigger_index=None if trigger_index < 0 else trigger_index,
+            timestamp=float(index["timestamp"]),
+            sequence=int(index["sequence"]),
+            units=self.header.get("units", {}),
+        )
+
+
+def list_recording_files(prefix: str) -> List[str]:
+    """Get the data files of a recording in order.
+
+    Args:
+        prefix (str): The prefix given to ScopeRecorder.
+
+    Returns:
+        List[str]: The data files of all parts, in the order of the part number in their header. Files of another
+            recording session with the same prefix are left out.
+    """
+    files = []
+    session = None
+    while os.path.exists(filename := f"{prefix}_{len(files):04d}{DATA_EXTENSION}"):
+        header, _ = _read_header(filename)
+        if session is None:
+            session = header.get("session")
+        if header.get("session") != session or header.get("part", len(files)) != len(files):
+            break
+        files.append(filename)
+    return files
+
+
+def iter_recording(prefix: str) -> Iterator[ScopeRecording]:
+    """Open all parts of a recording one after the other.
+
+    Args:
+        prefix (str): The prefix given to ScopeRecorder.
+
+    Yields:
+        ScopeRecording: The next part of the recording.
+    """
+    for filename in list_recording_files(prefix):
+        yield ScopeRecording(filename)
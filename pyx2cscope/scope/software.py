@@ -0,0 +1,367 @@
+"""Software scope: host side sampling of many variables.
+
+The firmware scope captures up to MAX_SCOPE_CHANNELS channels at the rate of the scope task into the Scope Data
+Array, which is too short for slow trends over minutes. SoftwareScope samples any number of variables from the host
+instead, as fast as the link allows:
+
+    read all variables -> timestamp -> ring buffer -> trigger -> publish
+
+The variables are sorted by address and merged into regions (see plan_regions), every sample is one bulk read per
+region. A sample is stamped with the host monotonic time at the middle of its read, i.e. between request and
+response, which halves the error caused by the link latency. Half the read time is kept as latency of the sample.
+
+The last samples are kept in a ring buffer. Subscribers receive blocks of block_size samples, or, with a software
+trigger set, a frame around every trigger event. Frames hold the variables and the TIME_CHANNEL with the sample
+times, so they can be written by ScopeRecorder like frames of the firmware scope.
+
+Usage:
+    software_scope = SoftwareScope(x2c_scope, [x2c_scope.get_variable(name) for name in names])
+    software_scope.set_trigger(lambda sample: sample["faultCounter"] > 0, pre=100, post=100)
+    frames = software_scope.subscribe()
+    software_scope.start()
+    frame = frames.get(timeout=10)
+    software_scope.stop()
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from pyx2cscope.scope.acquisition import DROP_OLDEST, Subscription
+from pyx2cscope.scope.events import EventCapture
+from pyx2cscope.scope.frame import ScopeFrame
+from pyx2cscope.snapshot import plan_regions
+
+if TYPE_CHECKING:
+    from pyx2cscope.variable.variable import Variable
+    from pyx2cscope.x2cscope import X2CScope
+
+TIME_CHANNEL = "host_time"  # host monotonic time of every sample in seconds, see time.perf_counter
+ERROR_INTERVAL = 0.005  # seconds to wait after a failed read
+
+
+@dataclass
+class SoftwareScopeStats:
+    """Performance figures of a software scope.
+
+    Attributes:
+        samples (int): The number of samples read.
+        errors (int): The number of failed reads.
+        triggers (int): The number of trigger events.
+        elapsed (float): The time since the software scope started in seconds.
+        samples_per_second (float): The average sample rate.
+        latency (float): The average half read time of a sample in seconds.
+    """
+
+    samples: int = 0
+    errors: int = 0
+    triggers: int = 0
+    elapsed: float = 0.0
+    samples_per_second: float = 0.0
+    latency: float = 0.0
+
+
+class SoftwareScope:
+    """Background thread sampling variables with host timestamps.
+
+    Attributes:
+        regions (List[Tuple[int, int]]): The (address, size) of the memory regions read for every sample.
+        capacity (int): The number of samples kept in the ring buffer.
+        block_size (int): The number of samples of a published frame without trigger.
+        interval (float): The minimum time between two samples in seconds, 0 to sample as fast as possible.
+    """
+
+    def __init__(
+        self,
+        x2c_scope: "X2CScope",
+        variables: Sequence["Variable"],
+        capacity: int = 100000,
+        block_size: int = 1000,
+        interval: float = 0.0,
+        max_gap: int = 16,
+    ):
+        """Initialize the SoftwareScope instance.
+
+        Args:
+            x2c_scope (X2CScope): The connected scope used to read the variables.
+            variables (Sequence[Variable]): The scalar variables to be sampled.
+            capacity (int): The number of samples kept in the ring buffer. Defaults to 100000.
+            block_size (int): The number of samples of a published frame without trigger. Defaults to 1000.
+            interval (float): The minimum time between two samples in seconds. Defaults to 0.0.
+            max_gap (int): Variables separated by up to max_gap bytes are read together. Defaults to 16.
+
+        Raises:
+            ValueError: If no variable is given, a variable is an array or block_size exceeds capacity.
+        """
+        if not variables:
+            raise ValueError("At least one variable is needed for the software scope")
+        if any(variable.is_array() for variable in variables):
+            raise ValueError("The software scope samples scalar variables only")
+        if not 0 < block_size <= capacity:
+            raise ValueError(f"Block size must be between 1 and the capacity {capacity}, got {block_size}")
+        self.x2c_scope = x2c_scope
+        self.capacity = capacity
+        self.block_size = block_size
+        self.interval = interval
+        self._variables = {variable.info.name: variable for variable in variables}
+        self.regions = plan_regions(
+            ((variable.info.address, variable.get_width()) for variable in self._variables.values()), max_gap
+        )
+        self._read_dtype = self._get_read_dtype()
+        self._dtype = np.dtype([(name, variable.get_dtype()) for name, variable in self._variables.items()])
+        self._times = np.zeros(capacity, dtype=np.float64)
+        self._latencies = np.zeros(capacity, dtype=np.float64)
+        self._values = np.zeros(capacity, dtype=self._dtype)
+        self._count = 0
+        self._block_start = 0
+        self._epoch = time.time() - time.perf_counter()
+        self._trigger: Optional[Callable[[Dict[str, float]], bool]] = None
+        self._pre = self._post = 0
+        self._armed = False
+        self._pending: List[int] = []
+        self._sequence = 0
+        self._subscriptions: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats = SoftwareScopeStats()
+        self._start_time = 0.0
+
+    def _get_read_dtype(self) -> np.dtype:
+        """Get the structured type locating every variable in the concatenated region data."""
+        region_offsets = np.concatenate(([0], np.cumsum([size for _, size in self.regions])[:-1]))
+        names, formats, offsets = [], [], []
+        for name, variable in self._variables.items():
+            region = max(i for i, (address, _) in enumerate(self.regions) if address <= variable.info.address)
+            names.append(name)
+            formats.append(variable.get_dtype())
+            offsets.append(int(region_offsets[region]) + variable.info.address - self.regions[region][0])
+        itemsize = sum(size for _, size in self.regions)
+        return np.dtype({"names": names, "formats": formats, "offsets": offsets, "itemsize": itemsize})
+
+    def __len__(self):
+        """Get the number of samples in the ring buffer."""
+        return min(self._count, self.capacity)
+
+    def set_trigger(
+        self,
+        condition: Optional[Callable[[Dict[str, float]], bool]],
+        pre: int = 0,
+        post: Optional[int] = None,
+    ):
+        """Publish frames around trigger events instead of continuous blocks.
+
+        The trigger fires when condition changes from False to True. The condition gets the values of one sample
+        by variable name and may use any expression, e.g. ``lambda s: s["temperature"] > 80 and s["fault"]``.
+
+        Args:
+            condition (Callable[[Dict[str, float]], bool], optional): The trigger condition, None to publish
+                continuous blocks again.
+            pre (int): The number of samples before the trigger event. Defaults to 0.
+            post (int, optional): The number of samples from the trigger event on. Defaults to block_size - pre.
+
+        Raises:
+            ValueError: If the frame around the trigger event does not fit into the ring buffer.
+        """
+        post = self.block_size - pre if post is None else post
+        if pre < 0 or post < 1 or pre + post > self.capacity:
+            raise ValueError(f"Invalid trigger window: {pre} samples before, {post} samples from the event")
+        with self._lock:
+            self._trigger = condition
+            self._pre, self._post = pre, post
+            self._armed = False
+            self._pending = []
+
+    def read_sample(self) -> int:
+        """Read all variables once and append the sample to the ring buffer.
+
+        Returns:
+            int: The number of the sample since the software scope was created.
+        """
+        data = bytearray()
+        request = time.perf_counter()
+        for address, size in self.regions:
+            data += self.x2c_scope.dump_memory(address, size).tobytes()
+        response = time.perf_counter()
+        record = np.frombuffer(bytes(data), dtype=self._read_dtype)[0]
+        with self._lock:
+            position = self._count % self.capacity
+            self._times[position] = (request + response) / 2
+            self._latencies[position] = (response - request) / 2
+            for name in self._dtype.names:
+                self._values[name][position] = record[name]
+            self._count += 1
+            self._stats.samples += 1
+        return self._count - 1
+
+    def _get_value(self, name: str, values: np.ndarray):
+        variable = self._variables[name]
+        return variable.to_physical(variable._get_bit_value(values) if variable.info.bit_size else values)
+
+    def _get_frame(self, start: int, stop: int, trigger_index: Optional[int] = None, sequence: int = 0) -> ScopeFrame:
+        """Build a frame of the samples start to stop (exclusive), both numbered since creation."""
+        indices = np.arange(start, stop) % self.capacity
+        channels = {TIME_CHANNEL: self._times[indices]}
+        for name in self._dtype.names:
+            channels[name] = np.ascontiguousarray(self._get_value(name, self._values[name][indices]))
+        frame = ScopeFrame(
+            channels=channels,
+            trigger_index=trigger_index,
+            timestamp=self._epoch + channels[TIME_CHANNEL][-1] if len(indices) else time.time(),
+            sequence=sequence,
+            units={name: variable.info.unit for name, variable in self._variables.items() if variable.info.unit},
+        )
+        return self.x2c_scope.computed_channels.apply(frame)
+
+    def _get_next_frame(self, start: int, stop: int, trigger_index: Optional[int] = None) -> ScopeFrame:
+        """Build a frame to be published, with the next sequence number."""
+        self._sequence += 1
+        return self._get_frame(start, stop, trigger_index, self._sequence)
+
+    def get_samples(self, last: Optional[int] = None) -> ScopeFrame:
+        """Get the latest samples of the ring buffer.
+
+        Args:
+            last (int, optional): The number of samples. Defaults to None, i.e. all samples in the ring buffer.
+
+        Returns:
+            ScopeFrame: The samples in time order, TIME_CHANNEL holds the host time of every sample.
+        """
+        with self._lock:
+            size = len(self) if last is None else min(last, len(self))
+            return self._get_frame(self._count - size, self._count)
+
+    def get_latency(self, last: Optional[int] = None) -> np.ndarray:
+        """Get the half read time of the latest samples, the uncertainty of their timestamps.
+
+        Args:
+            last (int, optional): The number of samples. Defaults to all samples in the ring buffer.
+
+        Returns:
+            np.ndarray: The latency of every sample in seconds, in time order.
+        """
+        with self._lock:
+            size = len(self) if last is None else min(last, len(self))
+            return self._latencies[np.arange(self._count - size, self._count) % self.capacity]
+
+    def _check_trigger(self, number: int) -> List[ScopeFrame]:
+        """Evaluate the trigger on sample number and get the frames which are complete."""
+        frames = []
+        with self._lock:
+            if self._trigger is None:
+                if self._count - self._block_start >= self.block_size:
+                    frames.append(self._get_next_frame(self._block_start, self._block_start + self.block_size))
+                    self._block_start += self.block_size
+                return frames
+            position = number % self.capacity
+            sample = {name: self._get_value(name, self._values[name][position]) for name in self._dtype.names}
+            trigger, pre, post = self._trigger, self._pre, self._post
+        fired = bool(trigger(sample))
+        with self._lock:
+            if fired and self._armed:
+                self._pending.append(number)
+                self._stats.triggers += 1
+            self._armed = not fired
+            while self._pending and self._count >= self._pending[0] + post:
+                event = self._pending.pop(0)
+                start = max(event - pre, self._count - self.capacity, 0)
+                frames.append(self._get_next_frame(start, event + post, event - start))
+        return frames
+
+    def subscribe(
+        self, maxsize: int = 4, policy: str = DROP_OLDEST, event: Optional[EventCapture] = None
+    ) -> Subscription:
+        """Create a queue receiving every new frame.
+
+        Args:
+            maxsize (int): The maximum number of frames waiting in the queue. Defaults to 4.
+            policy (str): DROP_OLDEST, DROP_NEWEST or BLOCK. Defaults to DROP_OLDEST.
+            event (EventCapture, optional): Receive only the frames of events, see EventCapture. Defaults to None.
+
+        Returns:
+            Subscription: The queue of frames.
+        """
+        subscription = Subscription(maxsize, policy, event)
+        with self._lock:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Stop delivering frames to a subscription.
+
+        Args:
+            subscription (Subscription): The subscription returned by subscribe.
+        """
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def start(self):
+        """Start sampling on a background thread."""
+        if self.is_running():
+            return
+        self._stop.clear()
+        self._stats = SoftwareScopeStats()
+        self._start_time = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="SoftwareScope", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 2.0):
+        """Stop sampling.
+
+        Args:
+            timeout (float, optional): Maximum time to wait for the thread in seconds. Defaults to 2.0.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def is_running(self) -> bool:
+        """Check if the sampling thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def get_stats(self) -> SoftwareScopeStats:
+        """Get the performance figures of the software scope.
+
+        Returns:
+            SoftwareScopeStats: A snapshot of the current figures.
+        """
+        with self._lock:
+            stats = SoftwareScopeStats(**vars(self._stats))
+            latency = self._latencies[: len(self)]
+        stats.elapsed = time.perf_counter() - self._start_time if self._start_time else 0.0
+        if stats.elapsed > 0:
+            stats.samples_per_second = stats.samples / stats.elapsed
+        if len(latency):
+            stats.latency = float(latency.mean())
+        return stats
+
+    def _publish(self, frame: ScopeFrame):
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription.put(frame, self._stop)
+
+    def poll(self):
+        """Read one sample and publish the frames it completes, used by the sampling thread."""
+        for frame in self._check_trigger(self.read_sample()):
+            self._publish(frame)
+
+    def _run(self):
+        while not self._stop.is_set():
+            start = time.perf_counter()
+            try:
+                self.poll()
+            except Exception as e:
+                logging.error(f"Error during software scope sampling: {e}")
+                with self._lock:
+                    self._stats.errors += 1
+                self._stop.wait(max(self.interval, ERROR_INTERVAL))
+                continue
+            if self.interval:
+                self._stop.wait(max(self.interval - (time.perf_counter() - start), 0.0))
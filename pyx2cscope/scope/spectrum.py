@@ -0,0 +1,299 @@
+"""Frequency domain analysis of scope captures.
+
+The spectrum of a channel is the windowed FFT of its samples (numpy rfft), scaled to the single sided amplitude, so
+a sine of amplitude A shows a peak of A at its frequency. The frequency axis is derived from the sample period of
+the frame, i.e. from the sample time given to get_scope_sample_time and the sample time factor. Without sample time
+the frequency is given in cycles per sample.
+
+    get_spectrum        the spectrum of one frame, cached on the frame
+    SpectrumAnalyzer    spectra averaged over consecutive frames
+    Spectrogram         rolling 2D view, one spectrum per frame of a continuous acquisition
+
+Windows and frequency axes are cached per size, averaged spectra and spectrograms use preallocated arrays.
+
+Usage:
+    analyzer = SpectrumAnalyzer(window=HANN, averages=8)
+    spectrum = analyzer.add(x2c_scope.get_current_scope_frame())
+    plot(spectrum.frequencies, spectrum.amplitudes["motor.idq.q"])
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from pyx2cscope.scope.frame import ScopeFrame
+
+RECTANGULAR = "rectangular"
+HANN = "hann"
+HAMMING = "hamming"
+BLACKMAN = "blackman"
+WINDOWS = {RECTANGULAR: np.ones, HANN: np.hanning, HAMMING: np.hamming, BLACKMAN: np.blackman}
+
+
+@lru_cache(maxsize=32)
+def get_window(name: str, size: int) -> np.ndarray:
+    """Get a window function, computed once per name and size.
+
+    Args:
+        name (str): RECTANGULAR, HANN, HAMMING or BLACKMAN.
+        size (int): The number of samples.
+
+    Returns:
+        np.ndarray: The read only window.
+
+    Raises:
+        ValueError: If the window name is unknown.
+    """
+    if name not in WINDOWS:
+        raise ValueError(f"Unknown window: {name}")
+    window = WINDOWS[name](size).astype(float)
+    window.flags.writeable = False
+    return window
+
+
+@lru_cache(maxsize=32)
+def get_frequencies(size: int, sample_period: Optional[float]) -> np.ndarray:
+    """Get the frequency axis of the spectrum of size samples.
+
+    Args:
+        size (int): The number of samples.
+        sample_period (float, optional): The time between two samples in milliseconds.
+
+    Returns:
+        np.ndarray: The read only frequencies in Hz, in cycles per sample if the sample period is None.
+    """
+    frequencies = np.fft.rfftfreq(size, 1.0 if sample_period is None else sample_period / 1000)
+    frequencies.flags.writeable = False
+    return frequencies
+
+
+@dataclass
+class Spectrum:
+    """Amplitude spectra of the channels of a frame.
+
+    Attributes:
+        frequencies (np.ndarray): The frequency of every bin in Hz, or in cycles per sample without sample time.
+        amplitudes (Dict[str, np.ndarray]): The single sided amplitude of every channel and bin.
+        frames (int): The number of frames averaged.
+    """
+
+    frequencies: np.ndarray
+    amplitudes: Dict[str, np.ndarray]
+    frames: int = 1
+
+    def get_db(self, name: str, reference: float = 1.0) -> np.ndarray:
+        """Get the amplitude of a channel in dB.
+
+        Args:
+            name (str): The channel name.
+            reference (float): The amplitude of 0 dB. Defaults to 1.0.
+
+        Returns:
+            np.ndarray: 20 * log10(amplitude / reference), zero amplitudes are limited to -300 dB.
+        """
+        return 20 * np.log10(np.maximum(self.amplitudes[name] / reference, 1e-15))
+
+
+def _get_amplitude(values: np.ndarray, window: str, detrend: bool) -> np.ndarray:
+    """Get the single sided amplitude spectrum of one channel."""
+    weights = get_window(window, len(values))
+    samples = np.asarray(values, dtype=float)
+    if detrend:
+        samples = samples - samples.mean()
+    amplitude = np.abs(np.fft.rfft(samples * weights))
+    amplitude *= 2 / weights.sum()
+    amplitude[0] /= 2  # DC and Nyquist bins have no mirrored part
+    if len(values) % 2 == 0:
+        amplitude[-1] /= 2
+    return amplitude
+
+
+def get_spectrum(
+    frame: ScopeFrame,
+    window: str = HANN,
+    detrend: bool = True,
+    channels: Optional[Iterable[str]] = None,
+) -> Spectrum:
+    """Get the amplitude spectrum of every channel of a frame.
+
+    The spectrum of a channel is cached on the frame, so all consumers of a shared frame compute it only once.
+
+    Args:
+        frame (ScopeFrame): The capture to be analysed.
+        window (str): The window function. Defaults to HANN.
+        detrend (bool): Remove the mean before the FFT, so DC does not leak into the low frequency bins. Defaults
+            to True.
+        channels (Iterable[str], optional): The channels to analyse. Defaults to all channels.
+
+    Returns:
+        Spectrum: The spectra of the channels, empty if the frame has less than 2 samples.
+
+    Raises:
+        ValueError: If the frame holds a selection of the samples, e.g. after decimate.
+    """
+    if frame.indices is not None:
+        raise ValueError("Spectrum requires equally spaced samples, use the frame before decimation")
+    names = frame.names if channels is None else list(channels)
+    if len(frame) < 2:  # noqa: PLR2004
+        return Spectrum(np.zeros(0), {name: np.zeros(0) for name in names})
+    amplitudes = {
+        name: frame.cached(
+            ("spectrum", name, window, detrend), lambda name=name: _get_amplitude(frame[name], window, detrend)
+        )
+        for name in names
+    }
+    return Spectrum(get_frequencies(len(frame), frame.sample_period), amplitudes)
+
+
+class SpectrumAnalyzer:
+    """Spectra averaged over consecutive frames.
+
+    The power of every bin is averaged linearly over the first averages frames and exponentially afterwards, so
+    the result follows changes of the signal with a time constant of averages frames.
+
+    Attributes:
+        window (str): The window function.
+        averages (int): The number of frames averaged, 1 for no averaging.
+        detrend (bool): Remove the mean of every frame before the FFT.
+        count (int): The number of frames added since the last reset.
+    """
+
+    def __init__(self, window: str = HANN, averages: int = 1, detrend: bool = True):
+        """Initialize the SpectrumAnalyzer instance.
+
+        Args:
+            window (str): The window function. Defaults to HANN.
+            averages (int): The number of frames averaged. Defaults to 1.
+            detrend (bool): Remove the mean of every frame before the FFT. Defaults to True.
+
+        Raises:
+            ValueError: If the window is unknown or averages is not positive.
+        """
+        if window not in WINDOWS:
+            raise ValueError(f"Unknown window: {window}")
+        if averages < 1:
+            raise ValueError(f"Number of averages must be positive, got {averages}")
+        self.window = window
+        self.averages = averages
+        self.detrend = detrend
+        self._clear()
+
+    def reset(self):
+        """Discard the averaged spectra, the settings are kept."""
+        self._clear()
+
+    def _clear(self):
+        """Set the state before the first frame."""
+        self.count = 0
+        self._layout = None
+        self._power: Dict[str, np.ndarray] = {}
+        self._amplitude: Dict[str, np.ndarray] = {}
+
+    def add(self, frame: ScopeFrame) -> Optional[Spectrum]:
+        """Add a complete frame to the average.
+
+        The average is restarted if the channels, the number of samples or the sample period change.
+
+        Args:
+            frame (ScopeFrame): The next capture.
+
+        Returns:
+            Spectrum: The averaged spectra, valid until the next call. None for partial frames.
+        """
+        if not frame.complete:
+            return None
+        spectrum = get_spectrum(frame, self.window, self.detrend)
+        layout = (frame.names, len(frame), frame.sample_period)
+        if layout != self._layout:
+            self._layout = layout
+            self.count = 0
+            bins = len(spectrum.frequencies)
+            self._power = {name: np.zeros(bins) for name in frame}
+            self._amplitude = {name: np.zeros(bins) for name in frame}
+        self.count += 1
+        weight = 1 / min(self.count, self.averages)
+        for name, amplitude in spectrum.amplitudes.items():
+            power = self._power[name]
+            power += (amplitude**2 - power) * weight
+            np.sqrt(power, out=self._amplitude[name])
+        return Spectrum(spectrum.frequencies, self._amplitude, min(self.count, self.averages))
+
+
+class Spectrogram:
+    """Rolling spectrogram of one channel, one spectrum per frame.
+
+    Attributes:
+        channel (str): The channel analysed.
+        rows (int): The number of spectra kept.
+        window (str): The window function.
+        frequencies (np.ndarray): The frequency of every bin, None before the first frame.
+        count (int): The number of frames added since the last reset.
+    """
+
+    def __init__(self, channel: str, rows: int = 100, window: str = HANN):
+        """Initialize the Spectrogram instance.
+
+        Args:
+            channel (str): The channel to be analysed.
+            rows (int): The number of spectra kept. Defaults to 100.
+            window (str): The window function. Defaults to HANN.
+
+        Raises:
+            ValueError: If the window is unknown or rows is not positive.
+        """
+        if window not in WINDOWS:
+            raise ValueError(f"Unknown window: {window}")
+        if rows < 1:
+            raise ValueError(f"Number of rows must be positive, got {rows}")
+        self.channel = channel
+        self.rows = rows
+        self.window = window
+        self._clear()
+
+    def reset(self):
+        """Discard all spectra, the settings are kept."""
+        self._clear()
+
+    def _clear(self):
+        """Set the state before the first frame."""
+        self.frequencies: Optional[np.ndarray] = None
+        self.count = 0
+        self._image = np.zeros((self.rows, 0))
+        self._timestamps = np.zeros(self.rows)
+
+    def add(self, frame: ScopeFrame):
+        """Add the spectrum of a complete frame as newest row, partial frames are ignored.
+
+        The spectrogram is restarted if the number of samples or the sample period changes.
+
+        Args:
+            frame (ScopeFrame): The next capture.
+        """
+        if not frame.complete or self.channel not in frame:
+            return
+        spectrum = get_spectrum(frame, self.window, channels=[self.channel])
+        if self.frequencies is None or not np.array_equal(spectrum.frequencies, self.frequencies):
+            self.frequencies = spectrum.frequencies
+            self.count = 0
+            self._image = np.zeros((self.rows, len(self.frequencies)))
+        position = self.count % self.rows
+        self._image[position] = spectrum.amplitudes[self.channel]
+        self._timestamps[position] = frame.timestamp
+        self.count += 1
+
+    def get_image(self) -> np.ndarray:
+        """Get the spectra in time order.
+
+        Returns:
+            np.ndarray: The amplitudes, shape (spectra, bins), the oldest spectrum first.
+        """
+        size = min(self.count, self.rows)
+        return self._image[np.arange(self.count - size, self.count) % self.rows]
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Get the timestamps of the frames of get_image (seconds since epoch)."""
+        size = min(self.count, self.rows)
+        return self._timestamps[np.arange(self.count - size, self.count) % self.rows]
@@ -0,0 +1,201 @@
+"""Firmware state snapshots.
+
+A snapshot holds the raw memory content of a selection of firmware variables. It is taken by X2CScope.save_state,
+written back by X2CScope.restore_state and can be stored to and loaded from a compressed numpy (.npz) file.
+
+Variables are not read one by one. Their address ranges are sorted and merged into regions, which are read in bulk
+with dump_memory. Restoring writes only the bytes that belong to the selected variables, contiguous variables are
+coalesced into one write.
+"""
+
+import time
+from dataclasses import dataclass, field
+from numbers import Number
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+
+def plan_regions(ranges: Iterable[Tuple[int, int]], max_gap: int = 0) -> List[Tuple[int, int]]:
+    """Merge (address, size) ranges into sorted, non-overlapping regions.
+
+    Args:
+        ranges (Iterable[Tuple[int, int]]): The address and size of every range.
+        max_gap (int): Ranges separated by up to max_gap bytes are merged into a single region. Use 0 to merge only
+            overlapping or touching ranges. Defaults to 0.
+
+    Returns:
+        List[Tuple[int, int]]: The address and size of every region, sorted by address.
+    """
+    regions = []
+    for address, size in sorted(ranges):
+        if size <= 0:
+            continue
+        if regions and address <= regions[-1][0] + regions[-1][1] + max_gap:
+            region_address, region_size = regions[-1]
+            regions[-1] = (region_address, max(region_size, address + size - region_address))
+        else:
+            regions.append((address, size))
+    return regions
+
+
+@dataclass
+class StateSnapshot:
+    """Memory content of a selection of variables.
+
+    Attributes:
+        names (List[str]): The variable names.
+        addresses (np.ndarray): The address of every variable.
+        sizes (np.ndarray): The size in bytes of every variable.
+        dtypes (List[str]): The numpy data type of every variable, empty if the variable has no numeric type.
+        regions (np.ndarray): The (address, size) of every memory region read from the target.
+        data (np.ndarray): The memory content of all regions, concatenated.
+        timestamp (float): The time the snapshot was taken (seconds since epoch).
+    """
+
+    names: List[str]
+    addresses: np.ndarray
+    sizes: np.ndarray
+    dtypes: List[str]
+    regions: np.ndarray
+    data: np.ndarray
+    timestamp: float = field(default_factory=time.time)
+
+    def __post_init__(self):
+        """Build the lookup tables between variables and the region data."""
+        self.addresses = np.asarray(self.addresses, dtype=np.int64)
+        self.sizes = np.asarray(self.sizes, dtype=np.int64)
+        self.regions = np.asarray(self.regions, dtype=np.int64).reshape(-1, 2)
+        self.data = np.asarray(self.data, dtype=np.uint8)
+        self._index = {name: i for i, name in enumerate(self.names)}
+        region_offsets = np.concatenate(([0], np.cumsum(self.regions[:, 1])[:-1])).astype(np.int64)
+        region = np.searchsorted(self.regions[:, 0], self.addresses, side="right") - 1
+        self._offsets = region_offsets[region] + self.addresses - self.regions[region, 0]
+
+    def __len__(self):
+        """Get the number of variables in the snapshot."""
+        return len(self.names)
+
+    def __contains__(self, name):
+        """Check if a variable is part of the snapshot."""
+        return name in self._index
+
+    def get_bytes(self, name: str) -> np.ndarray:
+        """Get the raw memory content of a variable.
+
+        Args:
+            name (str): The variable name.
+
+        Returns:
+            np.ndarray: The variable bytes as uint8 array.
+        """
+        i = self._index[name]
+        return self.data[self._offsets[i] : self._offsets[i] + self.sizes[i]]
+
+    def get_value(self, name: str) -> Union[Number, np.ndarray, bytes]:
+        """Get the value of a variable.
+
+        Args:
+            name (str): The variable name.
+
+        Returns:
+            Number | np.ndarray | bytes: Scalar or array values for numeric variables, raw bytes otherwise.
+        """
+        raw = self.get_bytes(name)
+        dtype = self.dtypes[self._index[name]]
+        if not dtype or len(raw) % np.dtype(dtype).itemsize:
+            return raw.tobytes()
+        values = raw.view(dtype)
+        return values[0].item() if len(values) == 1 else values
+
+    def get_write_plan(self, names: Optional[Iterable[str]] = None) -> List[Tuple[int, bytes]]:
+        """Get the coalesced writes needed to restore the variables.
+
+        Only bytes belonging to a variable are written, contiguous variables are joined into one write.
+
+        Args:
+            names (Iterable[str], optional): The variables to restore. Defaults to all variables.
+
+        Returns:
+            List[Tuple[int, bytes]]: The address and the content of every write.
+        """
+        indices = range(len(self.names)) if names is None else [self._index[name] for name in names]
+        plan = []
+        for address, size in plan_regions((int(self.addresses[i]), int(self.sizes[i])) for i in indices):
+            region = np.searchsorted(self.regions[:, 0], address, side="right") - 1
+            offset = int(self.regions[: region, 1].sum()) + address - int(self.regions[region, 0])
+            plan.append((address, self.data[offset : offset + size].tobytes()))
+        return plan
+
+    def _flat_bytes(self, indices: np.ndarray) -> np.ndarray:
+        """Gather the bytes of the selected variables into one contiguous array."""
+        sizes = self.sizes[indices]
+        starts = np.repeat(self._offsets[indices] - np.concatenate(([0], np.cumsum(sizes)[:-1])), sizes)
+        return self.data[starts + np.arange(int(sizes.sum()))]
+
+    def diff(self, other: "StateSnapshot") -> Dict[str, Tuple]:
+        """Compare the variables of two snapshots.
+
+        The comparison is done on the raw bytes of all common variables at once.
+
+        Args:
+            other (StateSnapshot): The snapshot to compare with, usually a newer one.
+
+        Returns:
+            Dict[str, Tuple]: The changed variables with a tuple (value in self, value in other).
+        """
+        common = [
+            name for name in self.names
+            if name in other and self.sizes[self._index[name]] == other.sizes[other._index[name]]
+        ]
+        common = [name for name in common if self.sizes[self._index[name]] > 0]
+        if not common:
+            return {}
+        own = np.array([self._index[name] for name in common])
+        others = np.array([other._index[name] for name in common])
+        mismatch = self._flat_bytes(own) != other._flat_bytes(others)
+        starts = np.concatenate(([0], np.cumsum(self.sizes[own])[:-1]))
+        changed = np.add.reduceat(mismatch, starts) > 0
+        return {
+            name: (self.get_value(name), other.get_value(name))
+            for name, is_changed in zip(common, changed)
+            if is_changed
+        }
+
+    def save(self, filename: str):
+        """Store the snapshot to a compressed numpy file.
+
+        Args:
+            filename (str): The path and name of the file, numpy appends '.npz' if missing.
+        """
+        np.savez_compressed(
+            filename,
+            names=np.array(self.names, dtype=str),
+            addresses=self.addresses,
+            sizes=self.sizes,
+            dtypes=np.array(self.dtypes, dtype=str),
+            regions=self.regions,
+            data=self.data,
+            timestamp=np.array(self.timestamp),
+        )
+
+    @classmethod
+    def load(cls, filename: str) -> "StateSnapshot":
+        """Load a snapshot from a file created by save.
+
+        Args:
+            filename (str): The path and name of the file.
+
+        Returns:
+            StateSnapshot: The loaded snapshot.
+        """
+        with np.load(filename) as file:
+            return cls(
+                names=file["names"].tolist(),
+                addresses=file["addresses"],
+                sizes=file["sizes"],
+                dtypes=file["dtypes"].tolist(),
+                regions=file["regions"],
+                data=file["data"],
+                timestamp=float(file["timestamp"]),
+            )
@@ -0,0 +1,215 @@
+"""Transfer planning for bulk memory access.
+
+Every LNet request is answered by one LNet frame [SYN, SIZE, NODE, DATA, CRC]. The SIZE field is a single byte,
+so DATA is limited to 255 bytes on every interface: a RAM read answer carries Service-ID, Error-ID and up to 253
+bytes of memory, a RAM write request carries Service-ID, address, size and up to 253 - uc_width bytes of memory.
+
+How frames are put on the wire depends on the interface. UART and TCP/IP transport a byte stream, so the largest
+chunk is always the best one. CAN splits every frame into packets of 8 bytes (64 bytes for CAN-FD) and a partially
+filled last packet costs as much as a full one. For packet based links the chunk size is reduced, so that the frame
+fills its packets completely, e.g. 250 bytes instead of 253 for a CAN read answer (256 bytes, 32 packets).
+
+Fill bytes inserted by LNet after SYN values inside the frame are data dependent and are not taken into account.
+
+Usage:
+    planner = get_transfer_planner(lnet)
+    for address, size in planner.plan_read(start, length):
+        data = lnet.get_ram_array(address, size, 1)
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+from mchplnet.interfaces.abstract_interface import Interface
+from mchplnet.interfaces.can import LNetCan
+from mchplnet.interfaces.tcp_ip import LNetTcpIp
+from mchplnet.lnet import LNet
+
+LNET_MAX_FRAME_DATA = 255  # SIZE field of the LNet frame is a single byte
+LNET_FRAME_OVERHEAD = 4  # SYN, SIZE, NODE and CRC
+LNET_READ_OVERHEAD = 2  # Service-ID and Error-ID of the get RAM answer
+LNET_WRITE_OVERHEAD = 2  # Service-ID and size of the put RAM request, the address is uc_width bytes long
+LNET_MAX_CHUNK_SIZE = LNET_MAX_FRAME_DATA - LNET_READ_OVERHEAD  # 253 bytes of memory per get RAM answer
+
+
+@dataclass(frozen=True)
+class LinkProfile:
+    """Transfer characteristics of a communication link.
+
+    Attributes:
+        name (str): The name of the link.
+        packet_size (int): The number of frame bytes per link packet, 0 for byte stream links.
+    """
+
+    name: str
+    packet_size: int = 0
+
+    def count_packets(self, frame_size: int) -> int:
+        """Get the number of link packets needed to transport a frame.
+
+        Args:
+            frame_size (int): The number of bytes of the LNet frame.
+
+        Returns:
+            int: The number of packets, 1 for byte stream links.
+        """
+        if not self.packet_size:
+            return 1
+        return -(-frame_size // self.packet_size)
+
+
+SERIAL = LinkProfile("Serial")
+TCP_IP = LinkProfile("TCP/IP")
+CAN = LinkProfile("CAN", packet_size=8)
+CAN_FD = LinkProfile("CAN-FD", packet_size=64)
+
+
+def get_link_profile(interface: Interface) -> LinkProfile:
+    """Get the link profile matching an mchplnet interface.
+
+    CAN-FD is not detected automatically, it has to be selected by X2CScope.set_link_profile.
+
+    Args:
+        interface (Interface): The interface used by LNet.
+
+    Returns:
+        LinkProfile: The profile of the interface, SERIAL for unknown interfaces.
+    """
+    if isinstance(interface, LNetCan):
+        return CAN
+    if isinstance(interface, LNetTcpIp):
+        return TCP_IP
+    return SERIAL
+
+
+class TransferPlanner:
+    """Split bulk memory reads and writes into chunks sized for a communication link."""
+
+    def __init__(self, profile: LinkProfile, uc_width: int, max_chunk_size: Optional[int] = None):
+        """Initialize the TransferPlanner instance.
+
+        Args:
+            profile (LinkProfile): The link used to transfer the frames.
+            uc_width (int): The address width of the target in bytes.
+            max_chunk_size (int, optional): Upper limit of the chunk size, e.g. for benchmarks. Defaults to the
+                LNet frame limit.
+        """
+        if max_chunk_size is not None and max_chunk_size <= 0:
+            raise ValueError(f"Chunk size must be positive, got {max_chunk_size}")
+        self.profile = profile
+        self.uc_width = uc_width
+        self.read_chunk_size = self._get_chunk_size(LNET_READ_OVERHEAD, max_chunk_size)
+        self.write_chunk_size = self._get_chunk_size(LNET_WRITE_OVERHEAD + uc_width, max_chunk_size)
+
+    def _get_chunk_size(self, overhead: int, max_chunk_size: Optional[int]) -> int:
+        """Get the largest chunk size whose frame fills complete packets of the link."""
+        chunk_size = LNET_MAX_FRAME_DATA - overhead
+        if max_chunk_size is not None:
+            return min(chunk_size, max_chunk_size)
+        if self.profile.packet_size:
+            frame_size = chunk_size + overhead + LNET_FRAME_OVERHEAD
+            aligned = frame_size - frame_size % self.profile.packet_size - overhead - LNET_FRAME_OVERHEAD
+            chunk_size = aligned if aligned > 0 else chunk_size
+        return chunk_size
+
+    @staticmethod
+    def _plan(start: int, length: int, chunk_size: int) -> List[Tuple[int, int]]:
+        return [(start + offset, min(chunk_size, length - offset)) for offset in range(0, length, chunk_size)]
+
+    def plan_read(self, start: int, length: int) -> List[Tuple[int, int]]:
+        """Split a memory read into get RAM requests.
+
+        Args:
+            start (int): The start address of the region.
+            length (int): The number of bytes to read.
+
+        Returns:
+            List[Tuple[int, int]]: The address and size of every request.
+        """
+        return self._plan(start, length, self.read_chunk_size)
+
+    def plan_write(self, start: int, length: int) -> List[Tuple[int, int]]:
+        """Split a memory write into put RAM requests.
+
+        Args:
+            start (int): The start address of the region.
+            length (int): The number of bytes to write.
+
+        Returns:
+            List[Tuple[int, int]]: The address and size of every request.
+        """
+        return self._plan(start, length, self.write_chunk_size)
+
+    def count_read_packets(self, length: int) -> int:
+        """Get the number of link packets received for a memory read.
+
+        Args:
+            length (int): The number of bytes to read.
+
+        Returns:
+            int: The number of answer packets, i.e. the number of frames for byte stream links.
+        """
+        return sum(
+            self.profile.count_packets(size + LNET_READ_OVERHEAD + LNET_FRAME_OVERHEAD)
+            for _, size in self.plan_read(0, length)
+        )
+
+
+@dataclass
+class TransferStats:
+    """Integrity figures of a chunked memory read.
+
+    Attributes:
+        chunks (int): The number of chunks read successfully, including re-read chunks.
+        bytes (int): The number of memory bytes received, including re-read bytes.
+        retries (int): The number of chunk requests repeated after a failure.
+        bytes_reread (int): The number of memory bytes requested again after a failure.
+    """
+
+    chunks: int = 0
+    bytes: int = 0
+    retries: int = 0
+    bytes_reread: int = 0
+
+    def add(self, other: "TransferStats"):
+        """Add the figures of another read to this one.
+
+        Args:
+            other (TransferStats): The figures to be added.
+        """
+        self.chunks += other.chunks
+        self.bytes += other.bytes
+        self.retries += other.retries
+        self.bytes_reread += other.bytes_reread
+
+
+_planners = WeakKeyDictionary()
+
+
+def get_transfer_planner(lnet: LNet) -> TransferPlanner:
+    """Get the transfer planner used for an LNet instance.
+
+    If no planner was set, one is created from the interface and the device info of the LNet instance.
+
+    Args:
+        lnet (LNet): The LNet instance.
+
+    Returns:
+        TransferPlanner: The planner for bulk memory access through lnet.
+    """
+    planner = _planners.get(lnet)
+    if planner is None:
+        planner = TransferPlanner(get_link_profile(lnet.interface), lnet.get_device_info().uc_width)
+        _planners[lnet] = planner
+    return planner
+
+
+def set_transfer_planner(lnet: LNet, planner: TransferPlanner):
+    """Set the transfer planner used for an LNet instance.
+
+    Args:
+        lnet (LNet): The LNet instance.
+        planner (TransferPlanner): The planner for bulk memory access through lnet.
+    """
+    _planners[lnet] = planner
@@ -22,11 +22,14 @@ Classes:
 import logging
 import struct
 from abc import abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from numbers import Number
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 
 from mchplnet.lnet import LNet
+from pyx2cscope.transfer import get_transfer_planner
 
 
 @dataclass
@@ -42,6 +45,13 @@ class VariableInfo:
         address (int): The memory address of the variable.
         array_size (int): The size of the array if the variable is an array, default is 0.
         valid_values (dict): enum type of valid values
+        is_const (bool): True if the variable is const qualified, i.e. placed in read only memory, default is False.
+        dims (List[int]): The dimensions of an array, e.g. [16, 32] for table[16][32], default is empty.
+        q_format (int, optional): The number of fractional bits of a fixed point variable, e.g. 15 for Q15.
+            None for variables without fractional bits, default is None.
+        gain (float): The physical value of 1.0 in the Q format, e.g. the full scale current, default is 1.0.
+        offset (float): Added to the physical value after scaling, default is 0.0.
+        unit (str): The engineering unit of the physical value, e.g. "A", default is empty.
     """
 
     name: str
@@ -52,6 +62,26 @@ class VariableInfo:
     address: int
     array_size: int
     valid_values: Dict[str, int]
+    is_const: bool = False
+    dims: List[int] = field(default_factory=list)
+    q_format: Optional[int] = None
+    gain: float = 1.0
+    offset: float = 0.0
+    unit: str = ""
+
+
+def get_array_shape(info: VariableInfo) -> Tuple[int, ...]:
+    """Get the numpy shape of an array variable.
+
+    Args:
+        info (VariableInfo): The information of the array variable.
+
+    Returns:
+        Tuple[int, ...]: The dimensions, one dimension of array_size if they are unknown, e.g. for variables
+            exported before the dimensions were kept.
+    """
+    dims = tuple(info.dims)
+    return dims if dims and int(np.prod(dims)) == info.array_size else (info.array_size,)
 
 
 class Variable:
@@ -89,7 +119,7 @@ class Variable:
         try:
             idx = self.info.array_size + item if item < 0 else item
             bytes_data = self._get_value_raw(index=idx)
-            return self.bytes_to_value(bytes_data)
+            return self.to_physical(self.bytes_to_value(bytes_data))
         except Exception as e:
             logging.error(e)
 
@@ -136,24 +166,48 @@ class Variable:
         Returns:
             List[Number]: The list of values in the array.
         """
+        return self._read_array().tolist()
+
+    def _read_array(self) -> np.ndarray:
+        """Read all elements of the array in chunks sized by the transfer planner.
+
+        Returns:
+            np.ndarray: The raw values as flat array of get_dtype.
+        """
         chunk_data = bytearray()
-        data_type = self.get_width()  # width of the array elements.
-        chunk_size = self.info.array_size * data_type
-        array_byte_size = chunk_size
-        max_chunk = 253
-        i = 0
-        while i < array_byte_size:
-            size_to_read = chunk_size if chunk_size < max_chunk else max_chunk
-            data = self.l_net.get_ram_array(self.info.address + i, size_to_read, 1)
+        array_byte_size = self.info.array_size * self.get_width()
+        for address, size_to_read in get_transfer_planner(self.l_net).plan_read(self.info.address, array_byte_size):
+            data = self.l_net.get_ram_array(address, size_to_read, 1)
             chunk_data.extend(data)
-            chunk_size -= max_chunk
-            i += size_to_read
-        # split chunk_data into data_type sized groups
-        chunk_data = [
-            chunk_data[j : j + data_type] for j in range(0, len(chunk_data), data_type)
-        ]
-        # convert bytearray to number on every element of chunk_data
-        return [self.bytes_to_value(k) for k in chunk_data]
+        if len(chunk_data) != array_byte_size:
+            raise ValueError(f"Expecting {array_byte_size} bytes from LNET, but got {len(chunk_data)}")
+        return np.frombuffer(chunk_data, dtype=self.get_dtype())
+
+    def get_shape(self) -> Tuple[int, ...]:
+        """Get the shape of the variable as numpy array.
+
+        Returns:
+            Tuple[int, ...]: The array dimensions, e.g. (16, 32) for table[16][32], () for a single variable.
+        """
+        if not self.is_array():
+            return ()
+        return get_array_shape(self.info)
+
+    def get_array(self) -> np.ndarray:
+        """Get the whole array from the MCU as numpy array of its dimensions.
+
+        The array is read in one chunked transfer and decoded without Python loop. Variables with scaling return
+        the physical values, see to_physical.
+
+        Returns:
+            np.ndarray: The values, shaped by get_shape, e.g. (16, 32) for table[16][32].
+
+        Raises:
+            ValueError: If the variable is not an array or the target returns less data than expected.
+        """
+        if not self.is_array():
+            raise ValueError(f"Variable {self.info.name} is not an array")
+        return self.to_physical(self._read_array().reshape(self.get_shape()))
 
     def _get_bit_value(self, byte_value: Number):
         """Extract the valid data in case of a union with bit size and offset."""
@@ -171,18 +225,20 @@ class Variable:
     def get_value(self):
         """Get the stored value from the MCU.
 
+        Variables with scaling return the physical value, see to_physical.
+
         Returns:
             Number: The stored value from the MCU.
         """
         try:
             if self.is_array():
-                return self._get_array_values()
+                return self.to_physical(self._get_array_values())
             else:
                 bytes_data = self._get_value_raw()
                 value = self.bytes_to_value(bytes_data)
                 if self.info.bit_size != 0:
-                    return self._get_bit_value(value)
-                return value
+                    value = self._get_bit_value(value)
+                return self.to_physical(value)
         except Exception as e:
             logging.error(e)
             return None
@@ -240,9 +296,12 @@ class Variable:
     def set_value(self, new_value: Number):
         """Set the value to be stored in the MCU.
 
+        Variables with scaling expect the physical value, which is converted back, see to_raw.
+
         Args:
             new_value (Number): The value to be stored in the MCU.
         """
+        new_value = self.to_raw(new_value)
         self._check_value_range(new_value)
         if self.info.bit_size != 0:
             # for bit-size variables, we should first read the current value (byte-size), mask out the old bits,
@@ -268,6 +327,69 @@ class Variable:
         """
         pass
 
+    def get_dtype(self) -> np.dtype:
+        """Get the little endian numpy data type matching the variable representation in the MCU memory.
+
+        Returns:
+            np.dtype: The numpy data type, e.g. int16 for VariableInt16 or float32 for VariableFloat.
+        """
+        if not self.is_integer():
+            return np.dtype(f"<f{self.get_width()}")
+        return np.dtype(f"<{'i' if self.is_signed() else 'u'}{self.get_width()}")
+
+    def is_scaled(self) -> bool:
+        """Check if the variable has a Q format or a physical scaling.
+
+        Returns:
+            bool: True if values are converted between raw and physical values, False otherwise.
+        """
+        return self.info.q_format is not None or self.info.gain != 1.0 or self.info.offset != 0.0
+
+    def get_scaling(self) -> Tuple[float, float]:
+        """Get the factor and offset converting raw values to physical values.
+
+        Returns:
+            Tuple[float, float]: physical = raw * factor + offset.
+        """
+        factor = self.info.gain if self.info.q_format is None else self.info.gain / (1 << self.info.q_format)
+        return factor, self.info.offset
+
+    def to_physical(self, raw):
+        """Convert raw values as stored in the MCU to physical values.
+
+        The conversion is a single numpy multiply and add, so whole arrays are converted at once.
+
+        Args:
+            raw (Number | List[Number] | np.ndarray): The raw value or values.
+
+        Returns:
+            The physical values as float, in the same container as raw. Raw is returned unchanged if the variable
+            has no scaling.
+        """
+        if not self.is_scaled():
+            return raw
+        factor, offset = self.get_scaling()
+        values = np.asarray(raw, dtype=float) * factor + offset
+        return values if isinstance(raw, np.ndarray) else values.tolist()
+
+    def to_raw(self, value):
+        """Convert physical values to raw values as stored in the MCU, the inverse of to_physical.
+
+        Args:
+            value (Number | List[Number] | np.ndarray): The physical value or values.
+
+        Returns:
+            The raw values, rounded to the nearest integer for integer variables, in the same container as value.
+            Value is returned unchanged if the variable has no scaling.
+        """
+        if not self.is_scaled():
+            return value
+        factor, offset = self.get_scaling()
+        values = (np.asarray(value, dtype=float) - offset) / factor
+        if self.is_integer():
+            values = np.rint(values).astype(np.int64)
+        return values if isinstance(value, np.ndarray) else values.tolist()
+
     def is_array(self):
         """Check if the variable is an array in the MCU.
 
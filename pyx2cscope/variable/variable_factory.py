@@ -1,5 +1,6 @@
 """Variable Factory returns the respective variable type according to the variable type found at the elf file."""
 
+import fnmatch
 import logging
 import os
 import pickle
@@ -8,6 +9,7 @@ from dataclasses import asdict
 from enum import Enum
 from typing import Optional
 
+import numpy as np
 import yaml
 
 from mchplnet.lnet import LNet
@@ -282,6 +284,121 @@ class VariableFactory:
 
         logging.debug(f"Variables loaded from {filename}")
 
+    def set_scaling(
+        self, pattern: str, q_format: Optional[int] = None, gain: float = 1.0, offset: float = 0.0, unit: str = ""
+    ) -> int:
+        """Attach a Q format and an engineering unit to variables, see VariableInfo.
+
+        Variables created before keep their VariableInfo, so they are updated as well.
+
+        Args:
+            pattern (str): The variable name or a shell style pattern, e.g. "motor.iabc.*".
+            q_format (int, optional): The number of fractional bits, e.g. 15 for Q15. Defaults to None.
+            gain (float): The physical value of 1.0 in the Q format. Defaults to 1.0.
+            offset (float): Added to the physical value after scaling. Defaults to 0.0.
+            unit (str): The engineering unit, e.g. "A". Defaults to "".
+
+        Returns:
+            int: The number of variables and registers updated.
+
+        Raises:
+            ValueError: If the Q format is negative or the gain is zero.
+        """
+        if q_format is not None and q_format < 0:
+            raise ValueError(f"Q format must not be negative, got {q_format}")
+        if gain == 0:
+            raise ValueError("Gain must not be zero")
+        count = 0
+        for mapping in (self.parser.variable_map, self.parser.register_map):
+            # exact names first, element names like "table[3]" are no valid patterns
+            names = [pattern] if pattern in mapping else fnmatch.filter(mapping, pattern)
+            for name in names:
+                info = mapping[name]
+                info.q_format, info.gain, info.offset, info.unit = q_format, float(gain), float(offset), unit
+                count += 1
+        return count
+
+    def load_scaling(self, filename: str) -> int:
+        """Load Q formats and engineering units from a side file.
+
+        The Yaml (or Json) file maps variable names or patterns to the scaling, e.g.::
+
+            motor.iabc.*: {q_format: 15, gain: 22.0, unit: A}
+            motor.vdc: {q_format: 15, gain: 75.0, unit: V}
+            motor.temperature: {gain: 0.1, offset: -40, unit: degC}
+
+        Args:
+            filename (str): The name of the file and its path.
+
+        Returns:
+            int: The number of variables and registers updated.
+
+        Raises:
+            ValueError: If the file does not exist or an entry is invalid.
+        """
+        if not os.path.exists(filename):
+            raise ValueError(f"File does not exist at given path: {filename}")
+        with open(filename, "r") as file:
+            entries = yaml.safe_load(file) or {}
+        if not isinstance(entries, dict):
+            raise ValueError(f"Expecting a mapping of variable names to scaling in {filename}")
+        count = 0
+        for pattern, scaling in entries.items():
+            try:
+                updated = self.set_scaling(str(pattern), **(scaling or {}))
+            except TypeError as e:
+                raise ValueError(f"Invalid scaling of {pattern}: {e}")
+            if not updated:
+                logging.warning(f"No variable matches {pattern}, scaling ignored.")
+            count += updated
+        logging.debug(f"Scaling of {count} variables loaded from {filename}")
+        return count
+
+    def get_struct_dtype(self, var_info: VariableInfo) -> np.dtype:
+        """Get the numpy structured data type of the elements of an array of structs.
+
+        The fields are the members of the first array element, named by their path below the element, e.g. "id"
+        for table.id[0] or "pos.x" for table.pos.x[0]. Bit fields, pointers and nested arrays of structs are left
+        out, their bytes are skipped.
+
+        Args:
+            var_info (VariableInfo): The array of structs, i.e. type "array".
+
+        Returns:
+            np.dtype: The little endian structured type with the offsets and the size of the struct.
+
+        Raises:
+            ValueError: If the variable is no array of structs or no member has a numeric type.
+        """
+        if var_info.type != "array" or not var_info.array_size:
+            raise ValueError(f"Variable {var_info.name} is not an array of structs")
+        itemsize = var_info.byte_size // var_info.array_size
+        prefix = var_info.name + "."
+        suffix = "[0]" * max(len(var_info.dims), 1)
+        fields = []
+        for name, info in self.parser.variable_map.items():
+            if not name.startswith(prefix) or not name.endswith(suffix) or info.array_size or info.bit_size:
+                continue
+            offset = info.address - var_info.address
+            if not 0 <= offset < itemsize:
+                continue
+            try:
+                variable = self.get_variable_raw(info)
+            except KeyError:
+                continue
+            fields.append((offset, name[len(prefix) : -len(suffix)], variable.get_dtype()))
+        if not fields:
+            raise ValueError(f"Variable {var_info.name} has no numeric members")
+        fields.sort(key=lambda item: item[0])
+        return np.dtype(
+            {
+                "names": [name for _, name, _ in fields],
+                "formats": [dtype for _, _, dtype in fields],
+                "offsets": [offset for offset, _, _ in fields],
+                "itemsize": itemsize,
+            }
+        )
+
     def get_var_list(self) -> list[str]:
         """Get a list of variable names available in the ELF file.
 
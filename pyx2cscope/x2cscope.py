@@ -7,16 +7,38 @@ received data.
 """
 
 import logging
-from dataclasses import dataclass
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
 from numbers import Number
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+import numpy as np
 
 from mchplnet.interfaces.abstract_interface import Interface
 from mchplnet.interfaces.factory import InterfaceFactory, InterfaceType
 from mchplnet.lnet import LNet
 from mchplnet.services.frame_load_parameter import LoadScopeData
 from mchplnet.services.scope import ScopeChannel, ScopeTrigger
-from pyx2cscope.variable.variable import Variable, VariableInfo
+from pyx2cscope.scope.acquisition import ScopeAcquisition
+from pyx2cscope.scope.buffer import RotatedView, demultiplex, get_records
+from pyx2cscope.scope.computed import ComputedChannels
+from pyx2cscope.scope.frame import ScopeFrame
+from pyx2cscope.scope.multiplex import MultiplexCapture
+from pyx2cscope.scope.plan import ScopePlan, plan_capacity
+from pyx2cscope.scope.progressive import ProgressiveReadout
+from pyx2cscope.snapshot import StateSnapshot, plan_regions
+from pyx2cscope.transfer import (
+    LNET_MAX_CHUNK_SIZE,
+    LinkProfile,
+    TransferPlanner,
+    TransferStats,
+    get_transfer_planner,
+    set_transfer_planner,
+)
+from pyx2cscope.variable.variable import Variable, VariableInfo, get_array_shape
 from pyx2cscope.variable.variable_factory import FileType, VariableFactory
 
 # Configure logging for debugging and tracking
@@ -28,6 +50,8 @@ logging.basicConfig(
 # Define constants for magic values
 UC_WIDTH_16BIT = 2
 UC_WIDTH_32BIT = 4
+SCOPE_POLL_MIN_INTERVAL = 0.001  # seconds, first poll interval after the predicted end of a capture
+SCOPE_POLL_MAX_INTERVAL = 0.008  # seconds, upper bound of the poll backoff, keeps the latency below 10 ms
 
 
 def get_variable_as_scope_channel(variable: Variable) -> ScopeChannel:
@@ -78,9 +102,10 @@ class X2CScope:
         interface (Interface): Interface object for communication.
         lnet (LNet): LNet object for low-level network operations.
         variable_factory (VariableFactory): Factory to create Variable objects.
-        scope_setup: Configuration for the scope setup.
-        convert_list (dict): Dictionary to store variable conversion functions.
+        scope_setup: Configuration for the scope setup, holding the scope channels and their order.
+        scope_variables (dict): The variable of every channel in scope_setup, used to scale the channel samples.
         uc_width (int): the processor architecture 2: 16 bit, 4: 32 bit.
+        computed_channels (ComputedChannels): Channels derived from the scope channels, added to every ScopeFrame.
     """
 
     def __init__(self, elf_file: str = None, interface: InterfaceType = None, **kwargs):
@@ -95,8 +120,41 @@ class X2CScope:
         self.lnet = LNet(self.interface)
         self.variable_factory = VariableFactory(self.lnet, elf_file)
         self.scope_setup = self.lnet.get_scope_setup()
-        self.convert_list = {}
+        self.scope_variables: Dict[str, Variable] = {}
         self.uc_width = self.variable_factory.device_info.uc_width
+        self.scope_sample_time_us = None
+        self._scope_frame_sequence = 0
+        self._scope_armed_at: Optional[float] = None
+        self.scope_read_retries = 3
+        self.scope_read_stats = TransferStats()
+        # captures completed since start, the cache holds the data of the last one
+        self._scope_capture = 0
+        self._scope_capture_pending = False
+        self._scope_cache_key = None
+        self._scope_cache_data = bytearray()
+        self._scope_cache_frames: Dict[tuple, ScopeFrame] = {}
+        # configuration sent with the last save_parameter and requests deferred by scope_config_batch
+        self._scope_applied_key = None
+        self._scope_batch_depth = 0
+        self._scope_batch_request: Optional[bool] = None  # the force argument of the deferred request
+        self.acquisition: Optional[ScopeAcquisition] = None
+        self.computed_channels = ComputedChannels()
+
+    @property
+    def convert_list(self) -> Dict[str, Callable[[bytearray], Number]]:
+        """Get the conversion function of every scope channel.
+
+        Deprecated, scope data is decoded with a numpy dtype. Use scope_variables instead.
+
+        Returns:
+            Dict[str, Callable]: The bytes_to_value method of the variable of every scope channel.
+        """
+        warnings.warn(
+            "X2CScope.convert_list is deprecated, use X2CScope.scope_variables instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return {name: variable.bytes_to_value for name, variable in self.scope_variables.items()}
 
     def set_interface(self, interface: Interface):
         """Set the communication interface for the scope.
@@ -107,6 +165,7 @@ class X2CScope:
         self.interface = interface
         self.lnet = LNet(interface)
         self.scope_setup = self.lnet.get_scope_setup()
+        self._scope_applied_key = None
         self.variable_factory.set_lnet_interface(self.lnet)
 
     def connect(self):
@@ -156,6 +215,33 @@ class X2CScope:
         """
         return self.variable_factory.get_variable_raw(variable_info)
 
+    def get_array(self, variable: Union[str, Variable]) -> np.ndarray:
+        """Read a whole array from the target as numpy array of its dimensions.
+
+        Arrays of numbers keep their dimensions, e.g. shape (16, 32) for float table[16][32], and are converted to
+        physical values if they have scaling. Arrays of structs are returned as numpy structured arrays, e.g.
+        table["id"] holds the member id of all elements. The array is read in one chunked transfer.
+
+        Args:
+            variable (str | Variable): The array variable or its name.
+
+        Returns:
+            np.ndarray: The values of all array elements.
+
+        Raises:
+            ValueError: If the variable is not found or not an array.
+        """
+        if isinstance(variable, Variable):
+            return variable.get_array()
+        variable_info = self.variable_factory.parser.get_var_info(variable)
+        if variable_info is None:
+            raise ValueError(f"Variable {variable} not found")
+        if variable_info.type != "array":
+            return self.get_variable_raw(variable_info).get_array()
+        dtype = self.variable_factory.get_struct_dtype(variable_info)
+        dump = self.dump_memory(variable_info.address, dtype.itemsize * variable_info.array_size)
+        return dump.view(dtype).reshape(get_array_shape(variable_info))
+
     def export_variables(self, filename: Optional[str] = None, ext: FileType = FileType.YAML, items=None):
         """Store the variables registered on the elf file to a pickle file.
 
@@ -177,6 +263,37 @@ class X2CScope:
         """
         self.variable_factory.import_variables(filename)
 
+    def set_scaling(
+        self, pattern: str, q_format: Optional[int] = None, gain: float = 1.0, offset: float = 0.0, unit: str = ""
+    ) -> int:
+        """Attach a Q format and an engineering unit to variables.
+
+        Variables with scaling read and write physical values, e.g. a Q15 current with gain 22.0 reads 11.0 for
+        the raw value 16384. Scope frames, decode_memory and the software scope convert whole channels at once.
+
+        Args:
+            pattern (str): The variable name or a shell style pattern, e.g. "motor.iabc.*".
+            q_format (int, optional): The number of fractional bits, e.g. 15 for Q15. Defaults to None.
+            gain (float): The physical value of 1.0 in the Q format. Defaults to 1.0.
+            offset (float): Added to the physical value after scaling. Defaults to 0.0.
+            unit (str): The engineering unit, e.g. "A". Defaults to "".
+
+        Returns:
+            int: The number of variables updated.
+        """
+        return self.variable_factory.set_scaling(pattern, q_format, gain, offset, unit)
+
+    def load_scaling(self, filename: str) -> int:
+        """Load Q formats and engineering units from a Yaml side file, see VariableFactory.load_scaling.
+
+        Args:
+            filename (str): The name of the file and its path.
+
+        Returns:
+            int: The number of variables updated.
+        """
+        return self.variable_factory.load_scaling(filename)
+
     def check_compatibility(self) -> dict:
         """Check whether the currently loaded ELF appears compatible with the connected target."""
         return self.variable_factory.check_device_compatibility()
@@ -192,8 +309,10 @@ class X2CScope:
             int: The ID of the added scope channel.
         """
         scope_channel = get_variable_as_scope_channel(variable)
-        self.convert_list[variable.info.name] = variable.bytes_to_value
-        return self.scope_setup.add_channel(scope_channel, trigger)
+        result = self.scope_setup.add_channel(scope_channel, trigger)
+        if variable.info.name in self.scope_setup.list_channels():
+            self.scope_variables[variable.info.name] = variable
+        return result
 
     def clear_all_scope_channel(self):
         """Remove all variables from the scope channel and reset any trigger.
@@ -201,12 +320,9 @@ class X2CScope:
         Returns:
             None.
         """
-        variables = set(
-            self.convert_list.keys()
-        )  # make a copy so we may delete inside the loop
-        for variable in variables:
-            self.convert_list.pop(variable)
-            self.scope_setup.remove_channel(variable)
+        for name in list(self.scope_setup.list_channels()):  # make a copy so we may delete inside the loop
+            self.scope_setup.remove_channel(name)
+        self.scope_variables.clear()
 
     def remove_scope_channel(self, variable: Variable):
         """Remove a variable from the scope channel.
@@ -217,8 +333,7 @@ class X2CScope:
         Returns:
             The result of the channel removal operation.
         """
-        if variable.info.name in self.convert_list:
-            self.convert_list.pop(variable.info.name)
+        self.scope_variables.pop(variable.info.name, None)
         return self.scope_setup.remove_channel(variable.info.name)
 
     def get_scope_channel_list(self) -> Dict[str, ScopeChannel]:
@@ -256,6 +371,30 @@ class X2CScope:
         """Reset the trigger configuration."""
         self.scope_setup.reset_trigger()
 
+    def add_computed_channel(self, name: str, expression: str):
+        """Add a channel computed from the scope channels to every ScopeFrame.
+
+        The expression is evaluated on the channel arrays of every frame, e.g. "motor.vdq.q * motor.idq.q". It may
+        use the scope channels and computed channels added before, see pyx2cscope.scope.computed for the syntax.
+        Computed channels are float64 and follow the scope channels in the frame.
+
+        Args:
+            name (str): The name of the computed channel.
+            expression (str): The expression over the channels.
+
+        Raises:
+            ValueError: If the name or the expression is invalid.
+        """
+        self.computed_channels.add(name, expression)
+
+    def remove_computed_channel(self, name: str):
+        """Remove a computed channel.
+
+        Args:
+            name (str): The name of the computed channel.
+        """
+        self.computed_channels.remove(name)
+
     def set_sample_time(self, sample_time: int):
         """Define the resolution how the samples will be buffered at the internal buffer.
 
@@ -277,13 +416,71 @@ class X2CScope:
         """
         self.scope_setup.set_scope_state(scope_state)
 
-    def request_scope_data(self):
+    def request_scope_data(self, force: bool = False):
         """Request scope data from the LNet layer.
 
         Calling this method will start the scope sampling at the microcontroller side.
         This function should be called once all the required settings are made for data acquisition.
+
+        The whole scope setup is sent with every request, the firmware has no service to update parts of it.
+        Hence, a request is skipped if a capture with the same configuration is still being sampled, as sending
+        it again would only restart that capture. Within scope_config_batch, the request is deferred to the end
+        of the batch.
+
+        Args:
+            force (bool, optional): Send the setup even if the running capture uses the same configuration.
+                Defaults to False.
         """
+        if self._scope_batch_depth:
+            self._scope_batch_request = force or bool(self._scope_batch_request)
+            return
+        key = self._get_scope_config_key()
+        if not force and self._is_scope_capture_running(key):
+            logging.debug("Scope setup unchanged and capture running, request skipped.")
+            return
         self.lnet.save_parameter()
+        self._scope_applied_key = key
+        self._scope_armed_at = time.perf_counter()
+        self._scope_capture_pending = True
+
+    def _is_scope_capture_running(self, key: tuple) -> bool:
+        # only within the predicted capture time, a lost capture is always armed again afterwards
+        return self._scope_capture_pending and key == self._scope_applied_key and self.get_scope_time_to_ready() > 0
+
+    def is_scope_config_changed(self) -> bool:
+        """Check if the scope configuration differs from the one sent with the last request_scope_data.
+
+        Returns:
+            bool: True if channels, trigger or sample time were changed or no configuration was sent yet.
+        """
+        return self._get_scope_config_key() != self._scope_applied_key
+
+    @contextmanager
+    def scope_config_batch(self):
+        """Group several scope configuration changes into one request.
+
+        Calls to request_scope_data within the batch are deferred, the setup is sent once when the outermost
+        batch ends. Nothing is sent if the batch is left with an exception.
+
+        Usage:
+            with x2c_scope.scope_config_batch():
+                x2c_scope.clear_all_scope_channel()
+                x2c_scope.add_scope_channel(variable)
+                x2c_scope.set_scope_trigger(trigger_config)
+                x2c_scope.request_scope_data()
+        """
+        self._scope_batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            if self._scope_batch_depth == 1:
+                self._scope_batch_request = None
+            raise
+        finally:
+            self._scope_batch_depth -= 1
+        if self._scope_batch_depth == 0 and self._scope_batch_request is not None:
+            force, self._scope_batch_request = self._scope_batch_request, None
+            self.request_scope_data(force)
 
     def is_scope_data_ready(self) -> bool:
         """Check if the sampling of scope data is ready.
@@ -295,10 +492,105 @@ class X2CScope:
             bool: True if the scope data is ready, False otherwise.
         """
         scope_data = self.lnet.load_parameters()
-        return (
+        ready = (
             scope_data.scope_state == 0
             or scope_data.data_array_pointer == scope_data.data_array_used_length
         )
+        if ready and self._scope_capture_pending:
+            self._scope_capture_pending = False
+            self._scope_capture += 1
+        return ready
+
+    def get_expected_capture_time(self) -> Optional[float]:
+        """Predict the time the firmware needs to fill the scope data array after request_scope_data.
+
+        The prediction is based on the sample time given to get_scope_sample_time, the sample time factor and the
+        number of datasets in the scope data array. A triggered capture takes at least as long: the datasets before
+        the trigger event are sampled before the trigger is accepted and the remaining ones after it, whatever the
+        trigger delay. The prediction is then the earliest possible end of the capture.
+
+        Returns:
+            float: The expected capture time in seconds, None if no sample time was given yet.
+        """
+        sample_period = self.get_scope_sample_period()
+        if sample_period is None:
+            return None
+        samples = self.lnet.scope_data.data_array_size // self.scope_setup.get_dataset_size()
+        return samples * sample_period / 1000
+
+    def get_scope_time_to_ready(self) -> float:
+        """Get the time left until the current capture is expected to be complete.
+
+        Pollers skip is_scope_data_ready while this time is above 0, which avoids status requests that cannot
+        succeed yet.
+
+        Returns:
+            float: The remaining time in seconds, 0.0 if the capture may already be complete or cannot be predicted.
+        """
+        expected = self.get_expected_capture_time()
+        if expected is None or self._scope_armed_at is None:
+            return 0.0
+        return max(self._scope_armed_at + expected - time.perf_counter(), 0.0)
+
+    def get_scope_poll_delay(self, max_delay: float) -> Optional[float]:
+        """Get the time to wait before the next is_scope_data_ready, for pollers with a loop of their own.
+
+        Until the predicted end of the capture this is the time left, at most max_delay. After it, the delay grows
+        with the time passed since the predicted end, from 1 ms up to max_delay, so a capture is detected soon after
+        it completes while a capture waiting for its trigger event causes few status requests.
+
+        Args:
+            max_delay (float): The longest delay in seconds, usually the regular cadence of the poller.
+
+        Returns:
+            float: The delay in seconds, None if the capture time cannot be predicted.
+        """
+        expected = self.get_expected_capture_time()
+        if expected is None or self._scope_armed_at is None:
+            return None
+        remaining = self._scope_armed_at + expected - time.perf_counter()
+        if remaining > 0:
+            return min(remaining, max_delay)
+        return min(max(-remaining, SCOPE_POLL_MIN_INTERVAL), max_delay)
+
+    def wait_for_scope_data(
+        self,
+        timeout: Optional[float] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> bool:
+        """Wait until the capture started by request_scope_data is complete.
+
+        The method sleeps until the scope data array is expected to be full (see get_expected_capture_time) and
+        polls is_scope_data_ready afterwards. The poll interval starts at 1 ms and doubles up to 8 ms, so a complete
+        capture is detected within 10 ms while only a few status requests are sent. Without a known sample time the
+        polling starts immediately.
+
+        Args:
+            timeout (float, optional): Maximum time to wait in seconds. Defaults to None, i.e. wait forever.
+            cancel (threading.Event, optional): Stops waiting once set. Defaults to None.
+
+        Returns:
+            bool: True if the scope data is ready, False on timeout or cancellation.
+        """
+        sleep = cancel.wait if cancel is not None else time.sleep
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        delay = self.get_scope_time_to_ready()
+        if deadline is not None:
+            delay = min(delay, max(deadline - time.perf_counter(), 0.0))
+        if delay > 0:
+            sleep(delay)
+        interval = SCOPE_POLL_MIN_INTERVAL
+        while cancel is None or not cancel.is_set():
+            if self.is_scope_data_ready():
+                return True
+            if deadline is not None:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    return False
+                interval = min(interval, remaining)
+            sleep(interval)
+            interval = min(interval * 2, SCOPE_POLL_MAX_INTERVAL)
+        return False
 
     def get_trigger_position(self) -> int:
         """Get the position of the trigger event.
@@ -332,29 +624,68 @@ class X2CScope:
         )
         return self.lnet.scope_data.data_array_size - bytes_not_used
 
-    def _read_array_chunks(self) -> List[bytearray]:
+    def _read_array_chunks(self) -> bytearray:
         """Read array chunks from the LNet layer.
 
+        The integrity figures of the read are kept in scope_read_stats.
+
         Returns:
-            List[bytearray]: A list containing the chunk data.
+            bytearray: The content of the used Scope Data Array.
         """
-        chunk_data = []
-        data_type = 1  # It will always be 1 for array data
-        chunk_size = 253  # Full chunk excluding Service-ID and Error-ID, total bytes 255 (0xFF)
-        num_chunks = self._calc_sda_used_length() // chunk_size
-        chunk_rest = self._calc_sda_used_length() % chunk_size
-        loop = num_chunks if chunk_rest == 0 else num_chunks + 1
-        for i in range(int(loop)):
-            current_address = self.lnet.scope_data.data_array_address + i * chunk_size
-            data_size = chunk_size if i < int(num_chunks) else int(chunk_rest)
-            try:
-                # Read the chunk of data
-                data = self.lnet.get_ram_array(current_address, data_size, data_type)
-                chunk_data.extend(data)
-            except Exception as e:
-                logging.error(f"Error reading chunk {i}: {str(e)}")
+        self.scope_read_stats = TransferStats()
+        return self.read_scope_range(0, int(self._calc_sda_used_length()), self.scope_read_stats)
 
-        return chunk_data
+    def read_scope_range(self, offset: int, size: int, stats: Optional[TransferStats] = None) -> bytearray:
+        """Read a part of the Scope Data Array.
+
+        Chunks which cannot be read, or are answered with a wrong length, are requested again once all other chunks
+        were read. At most scope_read_retries chunk requests are repeated per call.
+
+        Args:
+            offset (int): The first byte to read, relative to the start of the Scope Data Array.
+            size (int): The number of bytes to read.
+            stats (TransferStats, optional): Updated with the integrity figures of the read. Defaults to None.
+
+        Returns:
+            bytearray: The content of the requested range.
+
+        Raises:
+            ValueError: If a chunk could not be read within the retry budget.
+        """
+        data = bytearray(size)
+        stats = TransferStats() if stats is None else stats
+        start = self.lnet.scope_data.data_array_address + offset
+        data_type = 1  # It will always be 1 for array data
+        pending = get_transfer_planner(self.lnet).plan_read(start, size)
+        budget = self.scope_read_retries
+        retry = False
+        while pending:
+            failed = []
+            for address, data_size in pending:
+                if retry:
+                    if budget == 0:
+                        failed.append((address, data_size))
+                        continue
+                    budget -= 1
+                    stats.retries += 1
+                    stats.bytes_reread += data_size
+                try:
+                    chunk = self.lnet.get_ram_array(address, data_size, data_type)
+                    if len(chunk) != data_size:
+                        raise ValueError(f"Expecting {data_size} bytes from LNET, but got {len(chunk)}")
+                except Exception as e:
+                    logging.error(f"Error reading scope data chunk at {address:#x}: {str(e)}")
+                    failed.append((address, data_size))
+                    continue
+                data[address - start : address - start + data_size] = chunk
+                stats.chunks += 1
+                stats.bytes += data_size
+            if failed and budget == 0:
+                missing = ", ".join(f"{address:#x} ({data_size} bytes)" for address, data_size in failed)
+                raise ValueError(f"Scope data incomplete, unable to read chunks at {missing}")
+            pending = failed
+            retry = True
+        return data
 
     def read_array(self, data_type: int) -> List[bytearray]:
         """Read an array from the specified address in the MCU memory.
@@ -366,11 +697,9 @@ class X2CScope:
             List[bytearray]: The read data.
         """
         chunk_data = []
-        chunk_size = (
-            253  # Full chunk excluding CRC and Service-ID, total bytes 255 (0xFF)
-        )
-        for i in range(5):
-            current_address = self.lnet.scope_data.data_array_address + i * chunk_size
+        length = 5 * LNET_MAX_CHUNK_SIZE
+        plan = get_transfer_planner(self.lnet).plan_read(self.lnet.scope_data.data_array_address, length)
+        for i, (current_address, chunk_size) in enumerate(plan):
             try:
                 data = self.lnet.get_ram_array(current_address, chunk_size, data_type)
                 chunk_data.extend(data)
@@ -378,70 +707,549 @@ class X2CScope:
                 logging.error(f"Error reading chunk {i}: {str(e)}")
         return chunk_data
 
-    def _sort_channel_data(self, data: bytearray) -> Dict[str, List[Number]]:
-        """Sort and convert the dataset byte order into channel byte order.
+    def set_link_profile(self, profile: LinkProfile, max_chunk_size: Optional[int] = None):
+        """Select the link profile used to size bulk memory transfers.
+
+        The profile is detected from the interface on first use. Use this method to select a profile that cannot
+        be detected, e.g. CAN-FD, or to limit the chunk size for benchmarks.
 
         Args:
-            data (bytearray): The raw data read from the scope.
+            profile (LinkProfile): The link profile, e.g. transfer.CAN_FD.
+            max_chunk_size (int, optional): Upper limit of the chunk size. Defaults to the LNet frame limit.
+        """
+        set_transfer_planner(self.lnet, TransferPlanner(profile, self.uc_width, max_chunk_size))
+
+    def get_transfer_planner(self) -> TransferPlanner:
+        """Get the planner used to split bulk memory reads and writes.
 
         Returns:
-            Dict[str, List[Number]]: A dictionary with channel names as keys and lists of sorted data as values.
+            TransferPlanner: The planner of the current LNet instance.
         """
-        channels = {channel: [] for channel in self.scope_setup.list_channels()}
-        dataset_size = self.scope_setup.get_dataset_size()
+        return get_transfer_planner(self.lnet)
 
-        for i in range(0, len(data), dataset_size):
-            dataset = data[i : i + dataset_size]
-            if len(dataset) != dataset_size:
-                continue  # Skip this dataset if it's not the complete expected size
-
-            j = 0
-            for name, channel in self.scope_setup.list_channels().items():
-                k = channel.data_type_size + j
-                if k > len(dataset):  # Ensure the data chunk is complete
-                    break
-                value = self.convert_list[name](dataset[j:k])
-                channels[name].append(value)
-                j = k
-        return channels
+    def dump_memory(
+        self,
+        start: int,
+        length: int,
+        progress: Optional[Callable[[int, int], None]] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> np.ndarray:
+        """Read an arbitrary RAM region from the target.
+
+        The region is split in chunks sized by the transfer planner of the link, which are written in place into a
+        preallocated buffer, so a dump of a few KB is limited by the link and not by the host.
+
+        Args:
+            start (int): The start address of the region.
+            length (int): The number of bytes to read.
+            progress (Callable[[int, int], None], optional): Called after every chunk with (bytes_read, length).
+            cancel (threading.Event, optional): Stop reading once the event is set. The returned array holds
+                only the bytes read so far.
+
+        Returns:
+            np.ndarray: The memory content as uint8 array. Use ``bytes(dump)`` or ``dump.tobytes()`` for raw bytes.
+        """
+        if length < 0:
+            raise ValueError(f"Length must be positive, got {length}")
+        dump = np.zeros(length, dtype=np.uint8)
+        offset = 0
+        for address, size in get_transfer_planner(self.lnet).plan_read(start, length):
+            if cancel is not None and cancel.is_set():
+                logging.info(f"Memory dump cancelled after {offset} of {length} bytes")
+                return dump[:offset]
+            data = self.lnet.get_ram_array(address, size, 1)
+            if len(data) != size:
+                raise ValueError(f"Expecting {size} bytes from LNET at {address:#x}, but got {len(data)}")
+            dump[offset : offset + size] = np.frombuffer(bytes(data), dtype=np.uint8)
+            offset += size
+            if progress is not None:
+                progress(offset, length)
+        return dump
+
+    def decode_memory(
+        self, dump: Union[np.ndarray, bytes], start: int, variables: Optional[Iterable[Union[str, Variable]]] = None
+    ) -> Dict[str, Union[Number, np.ndarray]]:
+        """Decode a memory dump into named values using the parsed variable map.
+
+        Args:
+            dump (np.ndarray | bytes): The memory content as returned by dump_memory.
+            start (int): The start address of the dump.
+            variables (Iterable[str | Variable], optional): Variables to decode. Defaults to all variables
+                located entirely inside the dump.
+
+        Returns:
+            Dict[str, Number | np.ndarray]: Variable name and its value, arrays are returned as numpy arrays of
+                their dimensions, arrays of structs as structured arrays. Variables with scaling are converted to
+                physical values.
+        """
+        dump = np.frombuffer(bytes(dump), dtype=np.uint8) if isinstance(dump, (bytes, bytearray)) else dump
+        end = start + len(dump)
+        if variables is None:
+            variables = [
+                info.name
+                for info in self.variable_factory.parser.variable_map.values()
+                if info.address is not None and info.byte_size and start <= info.address
+                and info.address + info.byte_size <= end
+            ]
+
+        values = {}
+        for item in variables:
+            variable = item if isinstance(item, Variable) else self._get_decodable_variable(item)
+            if variable is None:
+                struct_array = None if isinstance(item, Variable) else self._decode_struct_array(dump, start, item)
+                if struct_array is not None:
+                    values[item] = struct_array
+                continue
+            offset = variable.info.address - start
+            size = variable.get_width() * max(variable.info.array_size, 1)
+            if offset < 0 or variable.info.address + size > end:
+                logging.warning(f"Variable {variable.info.name} is outside the memory dump")
+                continue
+            raw = dump[offset : offset + size]
+            if variable.is_array():
+                array = raw.view(variable.get_dtype()).reshape(variable.get_shape())
+                values[variable.info.name] = variable.to_physical(array)
+            else:
+                value = variable.bytes_to_value(raw.tobytes())
+                value = variable._get_bit_value(value) if variable.info.bit_size else value
+                values[variable.info.name] = variable.to_physical(value)
+        return values
+
+    def _decode_struct_array(self, dump: np.ndarray, start: int, name: str) -> Optional[np.ndarray]:
+        """Decode an array of structs located entirely inside the dump, None if name is no such array."""
+        variable_info = self.variable_factory.parser.get_var_info(name)
+        if variable_info is None or variable_info.type != "array":
+            return None
+        offset = variable_info.address - start
+        if offset < 0 or offset + variable_info.byte_size > len(dump):
+            logging.warning(f"Variable {name} is outside the memory dump")
+            return None
+        try:
+            dtype = self.variable_factory.get_struct_dtype(variable_info)
+        except ValueError:
+            return None
+        raw = dump[offset : offset + dtype.itemsize * variable_info.array_size]
+        return raw.view(dtype).reshape(get_array_shape(variable_info))
+
+    def _get_decodable_variable(self, name: str) -> Optional[Variable]:
+        """Return the variable for name or None if the type has no scalar representation, e.g. array of structs."""
+        variable_info = self.variable_factory.parser.get_var_info(name)
+        if variable_info is None:
+            return None
+        return self._get_variable_or_none(variable_info)
+
+    def _get_variable_or_none(self, variable_info: VariableInfo) -> Optional[Variable]:
+        """Return the variable for variable_info or None if there is no matching variable type."""
+        try:
+            return self.variable_factory.get_variable_raw(variable_info)
+        except KeyError:
+            return None
+
+    def write_memory(self, start: int, data: Union[np.ndarray, bytes]):
+        """Write an arbitrary RAM region of the target.
+
+        Args:
+            start (int): The start address of the region.
+            data (np.ndarray | bytes): The bytes to be written.
+        """
+        data = bytes(data) if not isinstance(data, np.ndarray) else data.astype(np.uint8, copy=False).tobytes()
+        for address, size in get_transfer_planner(self.lnet).plan_write(start, len(data)):
+            offset = address - start
+            self.lnet.put_ram(address, size, bytearray(data[offset : offset + size]))
+
+    def _get_state_selection(
+        self, selection: Optional[Iterable[Union[str, Variable]]], include_const: bool, include_sfr: bool
+    ) -> List[VariableInfo]:
+        """Resolve the save_state selection to the VariableInfo items allowed by the policy."""
+        parser = self.variable_factory.parser
+        if selection is None:
+            items = list(parser.variable_map.values())
+            items += list(parser.register_map.values()) if include_sfr else []
+        else:
+            items = []
+            for item in selection:
+                if isinstance(item, Variable):
+                    items.append(item.info)
+                elif item in parser.variable_map:
+                    items.append(parser.variable_map[item])
+                elif include_sfr and item in parser.register_map:
+                    items.append(parser.register_map[item])
+                else:
+                    logging.warning(f"Variable {item} not found or excluded, skipped on save_state.")
+        return [
+            info for info in items
+            if info.address is not None and info.byte_size and (include_const or not info.is_const)
+        ]
+
+    def save_state(
+        self,
+        selection: Optional[Iterable[Union[str, Variable]]] = None,
+        include_const: bool = False,
+        include_sfr: bool = False,
+        max_gap: int = 16,
+    ) -> StateSnapshot:
+        """Save the state of firmware variables, so it can be restored later by restore_state.
+
+        The variables are sorted by address and merged into regions, which are read in bulk.
+
+        Args:
+            selection (Iterable[str | Variable], optional): Variables to be saved. Defaults to all variables.
+            include_const (bool): Include const (read only) variables. Defaults to False.
+            include_sfr (bool): Include peripheral registers (SFR). Defaults to False.
+            max_gap (int): Variables separated by up to max_gap bytes are read together. Defaults to 16.
+
+        Returns:
+            StateSnapshot: The saved state, see StateSnapshot.save to store it in a file.
+        """
+        infos = self._get_state_selection(selection, include_const, include_sfr)
+        regions = plan_regions(((info.address, info.byte_size) for info in infos), max_gap)
+        data = [self.dump_memory(address, size) for address, size in regions]
+        dtypes = []
+        for info in infos:
+            variable = self._get_variable_or_none(info)
+            dtypes.append(variable.get_dtype().str if variable is not None and not info.bit_size else "")
+        return StateSnapshot(
+            names=[info.name for info in infos],
+            addresses=[info.address for info in infos],
+            sizes=[info.byte_size for info in infos],
+            dtypes=dtypes,
+            regions=regions,
+            data=np.concatenate(data) if data else np.zeros(0, dtype=np.uint8),
+        )
 
-    def _filter_channels(
-        self, channels: Dict[str, List[Number]]
-    ) -> Dict[str, List[Number]]:
-        """Filter the channels to include only valid data.
+    def restore_state(self, snapshot: StateSnapshot, names: Optional[Iterable[str]] = None):
+        """Restore the state of firmware variables saved by save_state.
+
+        Only the bytes of the saved variables are written, contiguous variables are written together.
 
         Args:
-            channels (Dict[str, List[Number]]): The dictionary of channels with raw data.
+            snapshot (StateSnapshot): The state to be restored.
+            names (Iterable[str], optional): Restore only these variables. Defaults to all variables.
+        """
+        for address, data in snapshot.get_write_plan(names):
+            self.write_memory(address, data)
+
+    def _sort_channel_data(self, data: bytearray) -> Dict[str, np.ndarray]:
+        """Sort and convert the dataset byte order into channel byte order.
+
+        Args:
+            data (bytearray): The raw data read from the scope.
 
         Returns:
-            Dict[str, List[Number]]: The filtered dictionary of channels with valid data only.
+            Dict[str, np.ndarray]: A dictionary with channel names as keys and views on the channel samples as values.
+        """
+        return demultiplex(data, self.scope_setup.list_channels())
+
+    def _get_valid_data_start(self) -> int:
+        """Get the index of the first valid dataset in the Scope Data Array.
+
+        Returns:
+            int: The dataset index where valid data starts, 0 if there is no need to rearrange the data.
         """
         # there is no need to rearrange the byte vector
         if self.scope_setup.scope_trigger.trigger_delay < 0:
-            return channels
+            return 0
+        return self.get_delay_trigger_position()
+
+    def read_scope_buffer(self) -> bytearray:
+        """Read the raw content of the Scope Data Array.
+
+        Together with decode_scope_frame, this allows to re-arm the scope with request_scope_data as soon as
+        the data is read, while decoding takes place in parallel with the next capture.
+
+        Returns:
+            bytearray: The used part of the Scope Data Array, empty if there is no scope channel.
+        """
+        # handle only if there is at least one channel added to the scope
+        if not self.scope_setup.channels:
+            return bytearray()
+        return self._read_array_chunks()
+
+    def decode_scope_channels(self, data: bytearray, valid_data: bool = True) -> Dict[str, RotatedView]:
+        """Split the raw Scope Data Array into channel views.
 
-        start = self.get_delay_trigger_position()
-        for channel in channels:
-            rest = channels[channel][0:start]
-            channels[channel] = channels[channel][start:]
-            channels[channel].extend(rest)
+        Args:
+            data (bytearray): The raw content read by read_scope_buffer.
+            valid_data (bool, optional): If True, start with the first valid dataset. Defaults to True.
+
+        Returns:
+            Dict[str, RotatedView]: A dictionary with channel names as keys and sample views as values.
+        """
+        if not self.scope_setup.channels:
+            return {}
+        records = get_records(data, self.scope_setup.list_channels())
+        rotated = RotatedView(records, self._get_valid_data_start() if valid_data else 0)
+        return {name: rotated[name] for name in self.scope_setup.list_channels()}
+
+    def get_scope_channel_views(self, valid_data: bool = True) -> Dict[str, RotatedView]:
+        """Get the scope channel data as views on the raw Scope Data Array.
+
+        The data array is read once and rotated to the first valid dataset without copying, every channel is a
+        view on the same buffer. Use np.asarray on a view to get a contiguous copy. Views always hold the raw
+        values as stored in the target, the other scope accessors convert channels with scaling to physical
+        values, see set_scaling.
+
+        Args:
+            valid_data (bool, optional): If True, start with the first valid dataset. Defaults to True.
+
+        Returns:
+            Dict[str, RotatedView]: A dictionary with channel names as keys and sample views as values.
+        """
+        return self.decode_scope_channels(self.read_scope_buffer(), valid_data)
+
+    def _convert_scope_channels(
+        self, views: Dict[str, RotatedView], dtype: Optional[Union[str, np.dtype]] = None, scaled: bool = True
+    ) -> Dict[str, np.ndarray]:
+        """Copy channel views into contiguous arrays, converting channels with scaling to physical values.
+
+        Args:
+            views (Dict[str, RotatedView]): The channel views as returned by decode_scope_channels.
+            dtype (str | np.dtype, optional): Convert all channels to this type. Scaled channels are converted to
+                float64 unless dtype is a float type. Defaults to None, i.e. the type of the variables.
+            scaled (bool): Convert channels with scaling to physical values. Defaults to True.
+
+        Returns:
+            Dict[str, np.ndarray]: The channel name and its samples.
+        """
+        channels = {}
+        for name, view in views.items():
+            variable = self.scope_variables.get(name)
+            if not scaled or variable is None or not variable.is_scaled():
+                channels[name] = np.ascontiguousarray(view, dtype=dtype)
+                continue
+            factor, offset = variable.get_scaling()
+            physical_dtype = dtype if dtype is not None and np.dtype(dtype).kind == "f" else np.float64
+            channels[name] = (np.asarray(view, dtype=np.float64) * factor + offset).astype(physical_dtype, copy=False)
         return channels
 
-    def get_scope_channel_data(self, valid_data: bool = True) -> Dict[str, List[Number]]:
+    def get_scope_channel_arrays(self, valid_data: bool = True, scaled: bool = True) -> Dict[str, np.ndarray]:
+        """Get the sorted and optionally filtered scope channel data as numpy arrays.
+
+        Args:
+            valid_data (bool, optional): If True, return only valid data. Defaults to True.
+            scaled (bool, optional): Convert channels with scaling to physical values, see set_scaling. Defaults
+                to True, like get_scope_frame.
+
+        Returns:
+            Dict[str, np.ndarray]: A dictionary with channel names as keys and sample arrays as values.
+        """
+        return self._convert_scope_channels(self.get_scope_channel_views(valid_data), scaled=scaled)
+
+    def get_scope_channel_data(self, valid_data: bool = True, scaled: bool = True) -> Dict[str, List[Number]]:
         """Get the sorted and optionally filtered scope channel data.
 
         Args:
             valid_data (bool, optional): If True, return only valid data. Defaults to True.
+            scaled (bool, optional): Convert channels with scaling to physical values, see set_scaling. Defaults
+                to True, like get_scope_frame.
 
         Returns:
             Dict[str, List[Number]]: A dictionary with channel names as keys and data lists as values.
         """
-        # handle only if there is at least one channel added to the scope
-        if self.scope_setup.channels:
-            data = self._read_array_chunks()
-            channels = self._sort_channel_data(data)
-            return self._filter_channels(channels) if valid_data else channels
-        return {}
+        return {channel: values.tolist() for channel, values in self.get_scope_channel_arrays(valid_data, scaled).items()}
+
+    def get_scope_frame(
+        self,
+        valid_data: bool = True,
+        dtype: Optional[Union[str, np.dtype]] = None,
+        scaled: bool = True,
+        computed: bool = True,
+    ) -> ScopeFrame:
+        """Read the scope data array into a ScopeFrame.
+
+        The frame holds contiguous channel arrays and the metadata needed to plot or store them. The time axis
+        requires the sample time given to get_scope_sample_time.
+
+        Args:
+            valid_data (bool, optional): If True, start with the first valid dataset. Defaults to True.
+            dtype (str | np.dtype, optional): Convert all channels to this type, e.g. np.float32 or np.float64.
+                Defaults to None, i.e. the type of the variables.
+            scaled (bool, optional): Convert channels with scaling to physical values, see set_scaling. Defaults
+                to True.
+            computed (bool, optional): Add the computed channels, see add_computed_channel. Defaults to True.
+
+        Returns:
+            ScopeFrame: The samples of every scope channel together with time axis and trigger information.
+        """
+        return self.decode_scope_frame(self.read_scope_buffer(), valid_data, dtype, scaled=scaled, computed=computed)
+
+    def _get_scope_config_key(self) -> tuple:
+        """Get a key identifying the scope configuration, i.e. channels, trigger and sample time."""
+        return tuple(self.scope_setup.get_buffer()), self.scope_sample_time_us
+
+    def get_current_scope_frame(
+        self, valid_data: bool = True, dtype: Optional[Union[str, np.dtype]] = None, scaled: bool = True
+    ) -> ScopeFrame:
+        """Get the frame of the last complete capture, reading the Scope Data Array only once per capture.
+
+        All consumers of the same X2CScope instance share the data of a capture: the SDA is read on the first
+        request after is_scope_data_ready reported a new capture, later requests get the same frame object, with
+        the same sequence number, until the next capture is complete or the scope configuration changes. Derived
+        data can be cached on the frame, see ScopeFrame.cached.
+
+        Args:
+            valid_data (bool, optional): If True, start with the first valid dataset. Defaults to True.
+            dtype (str | np.dtype, optional): Convert all channels to this type. Defaults to None.
+            scaled (bool, optional): Convert channels with scaling to physical values. Defaults to True.
+
+        Returns:
+            ScopeFrame: The samples of every scope channel together with time axis and trigger information.
+        """
+        key = (self._scope_capture, self._get_scope_config_key())
+        if key != self._scope_cache_key:
+            self._scope_cache_data = self.read_scope_buffer()
+            self._scope_cache_key = key
+            self._scope_cache_frames = {}
+        frame_key = (valid_data, None if dtype is None else np.dtype(dtype).str, scaled)
+        frame = self._scope_cache_frames.get(frame_key)
+        if frame is None:
+            sequence = next(iter(self._scope_cache_frames.values())).sequence if self._scope_cache_frames else None
+            frame = self.decode_scope_frame(
+                self._scope_cache_data, valid_data, dtype, sequence=sequence, scaled=scaled
+            )
+            self._scope_cache_frames[frame_key] = frame
+        return frame
+
+    def decode_scope_frame(
+        self,
+        data: bytearray,
+        valid_data: bool = True,
+        dtype: Optional[Union[str, np.dtype]] = None,
+        timestamp: Optional[float] = None,
+        complete: bool = True,
+        transfer_stats: Optional[TransferStats] = None,
+        sequence: Optional[int] = None,
+        scaled: bool = True,
+        computed: bool = True,
+    ) -> ScopeFrame:
+        """Decode the raw Scope Data Array into a ScopeFrame.
+
+        Trigger information is taken from the last scope state loaded, call this method before the next
+        is_scope_data_ready.
+
+        Args:
+            data (bytearray): The raw content read by read_scope_buffer.
+            valid_data (bool, optional): If True, start with the first valid dataset. Defaults to True.
+            dtype (str | np.dtype, optional): Convert all channels to this type. Defaults to None.
+            timestamp (float, optional): The time the data was read (seconds since epoch). Defaults to now.
+            complete (bool, optional): False if data is only the first part of a capture. Partial frames carry the
+                sequence number of the capture they belong to. Defaults to True.
+            transfer_stats (TransferStats, optional): The integrity figures of reading data. Defaults to the figures
+                of the last read_scope_buffer.
+            sequence (int, optional): The sequence number of a capture decoded before. Defaults to None, i.e. the
+                next sequence number.
+            scaled (bool, optional): Convert channels with scaling to physical values as float, see set_scaling.
+                Defaults to True. Units are only given for channels holding physical values.
+            computed (bool, optional): Add the computed channels, see add_computed_channel. Defaults to True.
+
+        Returns:
+            ScopeFrame: The samples of every scope channel and computed channel together with time axis and trigger
+                information.
+        """
+        views = self.decode_scope_channels(data, valid_data)
+        channels = self._convert_scope_channels(views, dtype, scaled)
+        units = {
+            name: variable.info.unit
+            for name, variable in self.scope_variables.items()
+            if name in channels and variable.info.unit and (scaled or not variable.is_scaled())
+        }
+        trigger_index = None
+        if views and self.scope_setup.scope_trigger.channel is not None:
+            view = next(iter(views.values()))
+            trigger_index = (self.get_trigger_position() - view.start) % len(view) if len(view) else None
+        if sequence is None:
+            sequence = self._scope_frame_sequence + 1
+            if complete:
+                self._scope_frame_sequence = sequence
+        frame = ScopeFrame(
+            channels=channels,
+            sample_period=self.get_scope_sample_period(),
+            trigger_index=trigger_index,
+            timestamp=time.time() if timestamp is None else timestamp,
+            sequence=sequence,
+            complete=complete,
+            transfer_stats=replace(self.scope_read_stats if transfer_stats is None else transfer_stats),
+            units=units,
+        )
+        return self.computed_channels.apply(frame) if computed else frame
+
+    def get_progressive_readout(self, dtype: Optional[Union[str, np.dtype]] = None) -> ProgressiveReadout:
+        """Read the current untriggered capture while the firmware is still sampling.
+
+        Call this method after request_scope_data. The returned object yields partial frames as soon as the
+        firmware wrote a chunk of data, see ProgressiveReadout.
+
+        Args:
+            dtype (str | np.dtype, optional): Convert all channels to this type. Defaults to None.
+
+        Returns:
+            ProgressiveReadout: The readout of the current capture.
+
+        Raises:
+            ValueError: If the scope is configured with a trigger.
+        """
+        return ProgressiveReadout(self, dtype)
+
+    def get_multiplexed_capture(self, variables: Iterable[Variable], trigger: TriggerConfig) -> MultiplexCapture:
+        """Capture more variables than scope channels by rotating channel groups over triggered captures.
+
+        The groups are captured one after the other on the same trigger condition and merged into one frame
+        aligned on the trigger event, see MultiplexCapture. The plan attribute reports the number of captures.
+
+        Args:
+            variables (Iterable[Variable]): The variables to be captured.
+            trigger (TriggerConfig): The trigger condition shared by all captures.
+
+        Returns:
+            MultiplexCapture: The capture, call its capture method to sample all groups.
+        """
+        return MultiplexCapture(self, list(variables), trigger)
+
+    def start_acquisition(
+        self,
+        valid_data: bool = True,
+        dtype: Optional[Union[str, np.dtype]] = None,
+        poll_interval: float = 0.005,
+        progressive: bool = False,
+    ) -> ScopeAcquisition:
+        """Start capturing scope frames continuously on a background thread.
+
+        The scope is re-armed as soon as a capture is read. Use subscribe on the returned object to receive the
+        frames. Configure the scope channels, trigger and sample time before starting the acquisition.
+
+        Args:
+            valid_data (bool, optional): If True, frames start with the first valid dataset. Defaults to True.
+            dtype (str | np.dtype, optional): Convert all channels to this type. Defaults to None.
+            poll_interval (float, optional): The time to wait before re-arming the scope after a failed capture
+                cycle, in seconds. Captures are awaited with wait_for_scope_data.
+            progressive (bool, optional): Publish partial frames of untriggered captures while they are sampled,
+                see get_progressive_readout. Defaults to False.
+
+        Returns:
+            ScopeAcquisition: The running acquisition.
+        """
+        self.stop_acquisition()
+        self.acquisition = ScopeAcquisition(self, valid_data, dtype, poll_interval, progressive)
+        self.acquisition.start()
+        return self.acquisition
+
+    def stop_acquisition(self):
+        """Stop the continuous acquisition started by start_acquisition."""
+        if self.acquisition is not None:
+            self.acquisition.stop()
+            self.acquisition = None
+
+    def get_scope_sample_period(self) -> Optional[float]:
+        """Get the time between two samples of the scope data array.
+
+        The period is the sample time last given to get_scope_sample_time multiplied by the sample time factor.
+
+        Returns:
+            float: The sample period in milliseconds, None if no sample time was given yet.
+        """
+        if self.scope_sample_time_us is None:
+            return None
+        return (self.scope_setup.sample_time_factor + 1) * self.scope_sample_time_us / 1000
 
     def get_scope_sample_time(self, time: float) -> float:
         """Evaluate the scope sample time based on user-provided time value.
@@ -450,7 +1258,7 @@ class X2CScope:
         The argument time relates to the sampling rate of each sample. The total scope
         channel time depends on the size of the internal buffer, the sampling rate, and
         the time factor (resolution) set when starting the scope channel. See also
-        set_sample_time
+        set_sample_time. The time value is kept to build the time axis of get_scope_frame.
 
         Args:
             time (float): The time value in microseconds of one sample.
@@ -462,6 +1270,9 @@ class X2CScope:
         # - `self.scope_setup.get_dataset_size()`: returns the total size of one dataset in bytes
         # - `self.lnet.scope_data.data_array_size`: the total size of the data array in bytes
 
+        # Keep the sample time to build the time axis of scope frames
+        self.scope_sample_time_us = time
+
         # Get the total number of channels and the dataset size
         dataset_size = self.scope_setup.get_dataset_size()
         buffer_size = self.lnet.scope_data.data_array_size
@@ -480,6 +1291,49 @@ class X2CScope:
         )
         return (self.scope_setup.sample_time_factor + 1) * total_time_milliseconds
 
+    def plan_scope(
+        self,
+        channels: Optional[Iterable[Union[str, Variable]]] = None,
+        desired_window_ms: Optional[float] = None,
+        sample_period_us: Optional[float] = None,
+    ) -> ScopePlan:
+        """Plan the capacity of a scope configuration before sampling, see pyx2cscope.scope.plan.
+
+        The plan reports the samples per channel, the window of one capture and the prescaler for set_sample_time
+        reaching the desired window with the finest resolution. It suggests narrower channel representations and
+        warns about unused bytes at the end of the Scope Data Array. Warnings are logged as well.
+
+        Args:
+            channels (Iterable[str | Variable], optional): Variables or variable names to be planned. Defaults to
+                None, i.e. the current scope channels.
+            desired_window_ms (float, optional): The time window one capture should cover. Defaults to None.
+            sample_period_us (float, optional): The period of the scope task in microseconds. Defaults to the
+                sample time last given to get_scope_sample_time.
+
+        Returns:
+            ScopePlan: The capacity figures of the configuration.
+
+        Raises:
+            ValueError: If no channel is given, a variable is unknown or the sample period is unknown.
+        """
+        if channels is None:
+            scope_channels = list(self.scope_setup.channels.values())
+        else:
+            scope_channels = []
+            for channel in channels:
+                variable = self.get_variable(channel) if isinstance(channel, str) else channel
+                if variable is None:
+                    raise ValueError(f"Variable {channel} not found")
+                scope_channels.append(get_variable_as_scope_channel(variable))
+        if sample_period_us is None:
+            sample_period_us = self.scope_sample_time_us
+        if sample_period_us is None:
+            raise ValueError("Sample period unknown, call get_scope_sample_time or give sample_period_us")
+        plan = plan_capacity(scope_channels, self.lnet.scope_data.data_array_size, sample_period_us, desired_window_ms)
+        for warning in plan.warnings:
+            logging.warning(warning)
+        return plan
+
     def get_device_info(self):
         """Returns the device information as a dictionary."""
         device_info = self.variable_factory.device_info
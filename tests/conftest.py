@@ -3,6 +3,7 @@
 This module provides common fixtures for CLI, Qt GUI, and Web GUI testing.
 """
 
+import logging
 import os
 
 import pytest
@@ -15,6 +16,10 @@ TEST_DATA_DIR = os.path.dirname(data.__file__)
 TEST_ELF_FILE = os.path.join(TEST_DATA_DIR, "mc_foc_sl_fip_dspic33ck_mclv48v300w.elf")
 TEST_ELF_FILE_32BIT = os.path.join(TEST_DATA_DIR, "qspin_foc_same54.elf")
 
+# pyx2cscope.x2cscope calls logging.basicConfig with a log file in the working directory on import, basicConfig does
+# nothing if the root logger has a handler already. Test output is captured by pytest instead.
+logging.getLogger().addHandler(logging.NullHandler())
+
 
 @pytest.fixture
 def elf_file_path():
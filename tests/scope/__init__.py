@@ -0,0 +1,8 @@
+"""Unit tests of the scope data path, one module per module of pyx2cscope.scope.
+
+Tests that need an X2CScope instance use the scope fixture, it reads the scope channels CHANNELS from a fake scope
+data array of SAMPLES datasets. All other tests build ScopeFrame instances directly.
+"""
+
+CHANNELS = ["tmpSize", "txBufFull", "Sin2_Table8[3]"]  # uint16, uint32 and int8 channels
+SAMPLES = 100
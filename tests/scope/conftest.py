@@ -0,0 +1,42 @@
+"""Shared pytest fixtures for the scope tests."""
+
+import copy
+
+import pytest
+
+from pyx2cscope.parser.generic_parser import GenericParser
+from pyx2cscope.x2cscope import X2CScope
+from tests.conftest import TEST_ELF_FILE
+from tests.scope import CHANNELS, SAMPLES
+from tests.utils.ram_stub import RamStub
+from tests.utils.serial_stub import fake_serial
+
+
+@pytest.fixture(scope="session")
+def elf_parser():
+    """Parse the 16 bit test ELF file once for all scope tests."""
+    return GenericParser(TEST_ELF_FILE)
+
+
+@pytest.fixture
+def scope(mocker, elf_parser):
+    """Create a 16 bit X2CScope instance with three scope channels and a fake scope data array.
+
+    The parsed ELF file is shared between tests, only the variable information a test may change, e.g. with
+    set_scaling, is copied.
+    """
+    parser = copy.copy(elf_parser)
+    parser.variable_map = {name: copy.copy(info) for name, info in elf_parser.variable_map.items()}
+    parser.register_map = {name: copy.copy(info) for name, info in elf_parser.register_map.items()}
+    mocker.patch("pyx2cscope.variable.variable_factory.GenericParser", return_value=parser)
+    fake_serial(mocker, 16)
+    x2c_scope = X2CScope(elf_file=TEST_ELF_FILE, port="COM1")
+    ram = RamStub(start=0x1000, size=0x2000).patch(mocker, x2c_scope.lnet)
+    for name in CHANNELS:
+        x2c_scope.add_scope_channel(x2c_scope.get_variable(name))
+    x2c_scope.lnet.scope_data.data_array_address = ram.start
+    x2c_scope.lnet.scope_data.data_array_size = SAMPLES * x2c_scope.scope_setup.get_dataset_size()
+    x2c_scope.lnet.scope_data.trigger_event_position = 0
+    x2c_scope.ram = ram
+    yield x2c_scope
+    x2c_scope.disconnect()
@@ -0,0 +1,77 @@
+"""Unit tests related to the accumulation of repeated captures."""
+
+import numpy as np
+import pytest
+
+from pyx2cscope.scope.accumulate import Accumulator, EnsembleAverage, Envelope, PersistenceMap
+from pyx2cscope.scope.frame import ScopeFrame
+
+
+class TestAccumulators:
+    """Tests related to the accumulation of repeated captures."""
+
+    @pytest.fixture
+    def frames(self):
+        """Create noisy captures of two channels."""
+        rng = np.random.default_rng(1)
+        signal = np.sin(np.linspace(0, 2 * np.pi, 50))
+        return [
+            ScopeFrame({"a": signal + rng.normal(0, 0.1, 50), "b": rng.integers(-100, 100, 50)}, sample_period=0.5)
+            for _ in range(200)
+        ]
+
+    def test_ensemble_average(self, frames):
+        """Check the running mean and variance match the statistics over all frames."""
+        average = EnsembleAverage()
+        assert average.variance == {}
+        for frame in frames:
+            average.add(frame)
+        average.add(ScopeFrame({"a": np.zeros(50)}, complete=False))
+        stacked = np.stack([frame["a"] for frame in frames])
+        assert average.count == len(frames)
+        np.testing.assert_allclose(average.mean["a"], stacked.mean(axis=0))
+        np.testing.assert_allclose(average.variance["a"], stacked.var(axis=0, ddof=1))
+        np.testing.assert_allclose(average.get_frame()["b"], np.stack([f["b"] for f in frames]).mean(axis=0))
+        assert average.time[-1] == pytest.approx(49 * 0.5)
+        with pytest.raises(ValueError):
+            average.add(ScopeFrame({"a": np.zeros(50)}))
+        average.reset()
+        average.add(ScopeFrame({"a": np.zeros(10)}))
+        assert np.isnan(average.std["a"]).all()
+
+    def test_envelope(self, frames):
+        """Check minimum and maximum of every sample index."""
+        envelope = Envelope()
+        for frame in frames:
+            envelope.add(frame)
+        stacked = np.stack([frame["b"] for frame in frames])
+        np.testing.assert_array_equal(envelope.minimum["b"], stacked.min(axis=0))
+        np.testing.assert_array_equal(envelope.maximum["b"], stacked.max(axis=0))
+
+    def test_persistence_map(self, frames):
+        """Check every sample inside the range is counted once in its bin."""
+        persistence = PersistenceMap({"a": (-1.0, 1.0), "b": (-50, 50)}, bins=20)
+        for frame in frames:
+            persistence.add(frame)
+        histogram = persistence.histograms["a"]
+        assert histogram.shape == (20, 50)
+        assert histogram.sum() + persistence.clipped["a"] == 50 * len(frames)
+        stacked = np.stack([frame["b"] for frame in frames])
+        expected = np.histogram(stacked[:, 7], bins=persistence.get_edges("b"))[0]
+        np.testing.assert_array_equal(persistence.histograms["b"][:, 7], expected)
+        assert persistence.clipped["b"] == np.count_nonzero((stacked < -50) | (stacked > 50))  # noqa: PLR2004
+        with pytest.raises(ValueError):
+            PersistenceMap({"a": (1.0, 1.0)})
+        missing = PersistenceMap({"c": (0, 1)})
+        with pytest.raises(ValueError):
+            missing.add(frames[0])
+        assert missing.samples is None
+        persistence.reset()
+        assert (persistence.count, persistence.samples, persistence.bins) == (0, None, 20)
+        persistence.add(ScopeFrame({"a": np.zeros(10), "b": np.zeros(10)}))
+        assert persistence.histograms["b"].shape == (20, 10)
+
+    def test_accumulator_is_abstract(self):
+        """Check the base class can not be used without an implementation of _add."""
+        with pytest.raises(TypeError):
+            Accumulator()
@@ -0,0 +1,46 @@
+"""Unit tests related to the continuous background acquisition."""
+
+import threading
+
+import numpy as np
+import pytest
+
+from pyx2cscope.scope.acquisition import DROP_NEWEST, DROP_OLDEST, Subscription
+from pyx2cscope.scope.frame import ScopeFrame
+from tests.scope import CHANNELS
+
+
+class TestScopeAcquisition:
+    """Tests related to the continuous background acquisition."""
+
+    def test_subscription_policies(self):
+        """Check full queues drop the oldest or the newest frame according to the policy."""
+        stop = threading.Event()
+        oldest, newest = Subscription(2, DROP_OLDEST), Subscription(2, DROP_NEWEST)
+        for sequence in range(1, 5):
+            frame = ScopeFrame({}, sequence=sequence)
+            oldest.put(frame, stop)
+            newest.put(frame, stop)
+        assert [oldest.get().sequence, oldest.get().sequence] == [3, 4]
+        assert [newest.get().sequence, newest.get().sequence] == [1, 2]
+        assert oldest.dropped == newest.dropped == 2  # noqa: PLR2004
+        with pytest.raises(ValueError):
+            Subscription(2, "unknown")
+
+    def test_acquisition_rearms_and_publishes(self, scope, mocker):
+        """Check frames are published continuously and the scope is re-armed after every readout."""
+        mocker.patch.object(scope, "is_scope_data_ready", return_value=True)
+        request = mocker.patch.object(scope, "request_scope_data")
+        acquisition = scope.start_acquisition(dtype=np.float64)
+        frames = acquisition.subscribe(maxsize=8)
+        first, second = frames.get(timeout=5), frames.get(timeout=5)
+        scope.stop_acquisition()
+
+        assert not acquisition.is_running()
+        assert second.sequence > first.sequence
+        assert first[CHANNELS[0]].dtype == np.float64
+        stats = acquisition.get_stats()
+        assert stats.captures >= 2  # noqa: PLR2004
+        assert stats.errors == 0
+        assert request.call_count >= stats.captures
+        assert 0 < stats.read_time <= stats.dead_time
@@ -0,0 +1,136 @@
+"""Unit tests related to the decoding of the scope data array."""
+
+import numpy as np
+import pytest
+
+from mchplnet.services.scope import ScopeChannel
+from pyx2cscope.scope.buffer import RotatedView, demultiplex, get_dataset_dtype
+from tests.scope import CHANNELS, SAMPLES
+
+
+def sort_reference(scope, raw):
+    """Decode the scope data array dataset by dataset, as done before the vectorised implementation."""
+    channels = {name: [] for name in CHANNELS}
+    dataset_size = scope.scope_setup.get_dataset_size()
+    for i in range(0, len(raw) - dataset_size + 1, dataset_size):
+        j = i
+        for name, channel in scope.scope_setup.list_channels().items():
+            channels[name].append(scope.scope_variables[name].bytes_to_value(raw[j : j + channel.data_type_size]))
+            j += channel.data_type_size
+    return channels
+
+
+class TestScopeBuffer:
+    """Tests related to the demultiplexing of the scope data array."""
+
+    def test_dataset_dtype(self):
+        """Check the structured data type follows the channel order, sizes and types without padding."""
+        channels = {
+            "a": ScopeChannel("a", 0, 2, 0, True, True),
+            "b": ScopeChannel("b", 0, 4, 0, False, True),
+            "c": ScopeChannel("c", 0, 1, 0, True, False),
+        }
+        dtype = get_dataset_dtype(channels)
+        assert dtype.itemsize == 7  # noqa: PLR2004
+        assert [dtype.fields[name][0].str for name in channels] == ["<i2", "<f4", "|u1"]
+
+        raw = np.zeros(3, dtype=dtype)
+        raw["b"] = [1.5, -2.0, 3.25]
+        values = demultiplex(raw.tobytes() + b"\x00", channels)  # trailing incomplete dataset is ignored
+        assert np.array_equal(values["b"], [1.5, -2.0, 3.25])
+
+    def test_channel_views_share_memory(self, scope):
+        """Check the channel arrays are views on the raw buffer and match the per dataset decoding."""
+        raw = scope._read_array_chunks()
+        channels = scope._sort_channel_data(raw)
+        for name, values in sort_reference(scope, raw).items():
+            assert channels[name].tolist() == values
+            assert np.shares_memory(channels[name], np.frombuffer(raw, dtype=np.uint8))
+
+    def test_scope_channel_data(self, scope):
+        """Check the scope channel data is rotated to the trigger position and returned as lists."""
+        scope.lnet.scope_data.trigger_event_position = 10 * scope.scope_setup.get_dataset_size()
+        reference = sort_reference(scope, scope._read_array_chunks())
+        channel_data = scope.get_scope_channel_data()
+        arrays = scope.get_scope_channel_arrays()
+        for name, values in reference.items():
+            assert channel_data[name] == values[10:] + values[:10]
+            assert isinstance(channel_data[name][0], int)
+            assert np.array_equal(arrays[name], channel_data[name])
+
+    def test_convert_list_deprecated(self, scope):
+        """Check the former conversion functions are still available with a deprecation warning."""
+        with pytest.warns(DeprecationWarning):
+            convert_list = scope.convert_list
+        assert list(convert_list) == CHANNELS
+        assert convert_list["tmpSize"](b"\x34\x12") == 0x1234  # noqa: PLR2004
+
+
+class TestScopeReadRetry:
+    """Tests related to re-reading scope data chunks after a failure."""
+
+    @staticmethod
+    def fail_at(scope, mocker, address, failures, short=False):
+        """Let the first reads of one chunk fail, with an exception or a short answer."""
+        remaining = [failures]
+
+        def get_ram_array(chunk_address, size, data_type):
+            data = scope.ram.get_ram_array(chunk_address, size, data_type)
+            if chunk_address == address and remaining[0] > 0:
+                remaining[0] -= 1
+                if short:
+                    return data[:-1]
+                raise TimeoutError("no answer")
+            return data
+
+        mocker.patch.object(scope.lnet, "get_ram_array", side_effect=get_ram_array)
+
+    def test_missing_chunk_is_reread(self, scope, mocker):
+        """Check only the failed chunk is requested again and the data stays aligned."""
+        reference = sort_reference(scope, scope._read_array_chunks())
+        plan = scope.get_transfer_planner().plan_read(scope.ram.start, len(scope.read_scope_buffer()))
+        address, size = plan[1]
+        scope.ram.reads.clear()
+        self.fail_at(scope, mocker, address, failures=1, short=True)
+        frame = scope.get_scope_frame(valid_data=False)
+
+        assert [read[0] for read in scope.ram.reads].count(address) == 2  # noqa: PLR2004
+        assert len(scope.ram.reads) == len(plan) + 1
+        assert frame.transfer_stats.retries == 1
+        assert frame.transfer_stats.bytes_reread == size
+        for name in CHANNELS:
+            assert frame[name].tolist() == reference[name]
+
+    def test_unrecoverable_gap(self, scope, mocker):
+        """Check a chunk failing more often than the retry budget raises an error."""
+        address = scope.ram.start
+        self.fail_at(scope, mocker, address, failures=10)
+        with pytest.raises(ValueError, match=f"{address:#x}"):
+            scope.read_scope_buffer()
+        assert [read[0] for read in scope.ram.reads].count(address) == 1 + scope.scope_read_retries
+
+
+class TestRotatedView:
+    """Tests related to the trigger position alignment of scope data."""
+
+    @pytest.mark.parametrize("start", [0, 3, -2, 9, 10, 25, -10, -11])
+    def test_rotation_matches_list_slicing(self, start):
+        """Check the view follows the list based rotation for any start index."""
+        values = list(range(10))
+        view = RotatedView(np.arange(10), start)
+        expected = values[start:] + values[:start]
+        assert view.tolist() == expected
+        assert list(view) == expected
+        assert np.array_equal(np.asarray(view), expected)
+        assert [view[i] for i in range(-10, 10)] == expected + expected
+        assert view[2:7].tolist() == expected[2:7]
+
+    def test_field_views_do_not_copy(self, scope):
+        """Check channel views of a rotated capture share the memory of the raw buffer."""
+        scope.lnet.scope_data.trigger_event_position = 10 * scope.scope_setup.get_dataset_size()
+        views = scope.get_scope_channel_views()
+        for view in views.values():
+            assert view.start == 10  # noqa: PLR2004
+            assert all(np.shares_memory(segment, views[CHANNELS[0]].data.base) for segment in view.segments)
+        with pytest.raises(IndexError):
+            views[CHANNELS[0]][SAMPLES]
@@ -0,0 +1,117 @@
+"""Unit tests related to arming the scope and waiting for a capture."""
+
+import threading
+import time
+
+import pytest
+
+from tests.scope import CHANNELS, SAMPLES
+
+
+class TestScopeReadiness:
+    """Tests related to waiting for a complete capture."""
+
+    def test_expected_capture_time(self, scope):
+        """Check the capture time follows sample time and prescaler and covers the whole array if triggered."""
+        assert scope.get_expected_capture_time() is None
+        scope.set_sample_time(2)
+        scope.get_scope_sample_time(50)
+        assert scope.get_expected_capture_time() == pytest.approx(SAMPLES * 0.1e-3)
+        scope.scope_setup.set_trigger(scope.scope_setup.scope_trigger)
+        scope.scope_setup.scope_trigger.channel = scope.scope_setup.channels[CHANNELS[0]]
+        scope.scope_setup.scope_trigger.trigger_delay = 20
+        assert scope.get_expected_capture_time() == pytest.approx(SAMPLES * 0.1e-3)
+
+    def test_poll_delay(self, scope, mocker):
+        """Check pollers wait for the predicted end of the capture and back off after it."""
+        mocker.patch.object(scope.lnet, "save_parameter")
+        assert scope.get_scope_poll_delay(0.25) is None
+        scope.get_scope_sample_time(1000)  # 100 samples of 1 ms
+        scope.request_scope_data()
+        assert 0.05 < scope.get_scope_poll_delay(0.25) <= 0.1  # noqa: PLR2004
+        assert scope.get_scope_poll_delay(0.02) == 0.02  # noqa: PLR2004
+        now = time.perf_counter()
+        mocker.patch("pyx2cscope.x2cscope.time.perf_counter", return_value=now + 0.1)
+        assert scope.get_scope_poll_delay(0.25) == pytest.approx(0.001, abs=0.001)
+        mocker.patch("pyx2cscope.x2cscope.time.perf_counter", return_value=now + 0.15)
+        assert scope.get_scope_poll_delay(0.25) == pytest.approx(0.05, abs=0.001)
+        mocker.patch("pyx2cscope.x2cscope.time.perf_counter", return_value=now + 10)
+        assert scope.get_scope_poll_delay(0.25) == 0.25  # noqa: PLR2004
+
+    def test_wait_sleeps_until_predicted_end(self, scope, mocker):
+        """Check the status is only requested once the capture is expected to be complete."""
+        scope.get_scope_sample_time(1000)  # 100 samples of 1 ms
+        mocker.patch.object(scope.lnet, "save_parameter")
+        scope.request_scope_data()
+        complete = time.perf_counter() + 0.1
+        ready = mocker.patch.object(scope, "is_scope_data_ready", side_effect=lambda: time.perf_counter() >= complete)
+        assert scope.get_scope_time_to_ready() > 0
+        assert scope.wait_for_scope_data(timeout=2)
+        assert time.perf_counter() - complete < 0.05  # noqa: PLR2004
+        assert ready.call_count <= 5  # noqa: PLR2004
+
+    def test_wait_timeout_and_cancel(self, scope, mocker):
+        """Check waiting ends on timeout or cancellation if the capture never completes."""
+        ready = mocker.patch.object(scope, "is_scope_data_ready", return_value=False)
+        start = time.perf_counter()
+        assert not scope.wait_for_scope_data(timeout=0.05)
+        assert 0.05 <= time.perf_counter() - start < 1  # noqa: PLR2004
+        assert ready.call_count > 1
+        cancel = threading.Event()
+        cancel.set()
+        assert not scope.wait_for_scope_data(cancel=cancel)
+
+
+class TestScopeConfigRequest:
+    """Tests related to sending the scope setup only when needed."""
+
+    def test_skip_unchanged_running_capture(self, scope, mocker):
+        """Check a request is skipped while the same configuration is sampled, but sent after a change."""
+        scope.get_scope_sample_time(1000)  # 100 samples of 1 ms
+        save = mocker.patch.object(scope.lnet, "save_parameter")
+        assert scope.is_scope_config_changed()
+        scope.request_scope_data()
+        assert not scope.is_scope_config_changed()
+        scope.request_scope_data()
+        assert save.call_count == 1
+        scope.request_scope_data(force=True)
+        assert save.call_count == 2  # noqa: PLR2004
+        scope.set_sample_time(2)
+        assert scope.is_scope_config_changed()
+        scope.request_scope_data()
+        assert save.call_count == 3  # noqa: PLR2004
+
+    def test_rearm_after_capture(self, scope, mocker):
+        """Check a completed or unpredictable capture is always armed again."""
+        save = mocker.patch.object(scope.lnet, "save_parameter")
+        scope.request_scope_data()
+        scope.request_scope_data()  # sample time unknown, the capture may be complete
+        assert save.call_count == 2  # noqa: PLR2004
+        scope.get_scope_sample_time(1000)
+        scope.request_scope_data()
+        scope.lnet.scope_data.scope_state = 0
+        mocker.patch.object(scope.lnet, "load_parameters", return_value=scope.lnet.scope_data)
+        assert scope.is_scope_data_ready()
+        scope.request_scope_data()
+        assert save.call_count == 4  # noqa: PLR2004
+
+    def test_batch(self, scope, mocker):
+        """Check the requests of a batch result in one save_parameter, none if the batch fails."""
+        save = mocker.patch.object(scope.lnet, "save_parameter")
+        with scope.scope_config_batch():
+            scope.remove_scope_channel(scope.get_variable(CHANNELS[0]))
+            scope.request_scope_data()
+            with scope.scope_config_batch():
+                scope.set_sample_time(3)
+                scope.request_scope_data()
+            assert save.call_count == 0
+        assert save.call_count == 1
+        assert not scope.is_scope_config_changed()
+        with pytest.raises(RuntimeError), scope.scope_config_batch():
+            scope.set_sample_time(4)
+            scope.request_scope_data()
+            raise RuntimeError("configuration failed")
+        assert save.call_count == 1
+        with scope.scope_config_batch():
+            pass
+        assert save.call_count == 1
@@ -0,0 +1,90 @@
+"""Unit tests related to computed channels."""
+
+import numpy as np
+import pytest
+
+from pyx2cscope.scope.computed import ComputedChannels, Expression, clarke, park, parse_definitions
+from pyx2cscope.scope.frame import ScopeFrame
+from tests.scope import CHANNELS
+
+
+class TestComputedChannels:
+    """Tests related to channels computed from expressions over real channels."""
+
+    def test_expression(self):
+        """Check channel references, arithmetic in float and the available functions."""
+        expression = Expression("motor.vdq.q * motor.idq.q + table[3] ** 2 - sqrt(abs(x)) if x > 0 else -1")
+        assert expression.channels == ("x", "motor.vdq.q", "motor.idq.q", "table[3]")
+        values = {
+            "motor.vdq.q": np.array([300, 400], dtype=np.int16),
+            "motor.idq.q": np.array([200, 300], dtype=np.int16),
+            "table[3]": np.array([2, 3], dtype=np.int8),
+            "x": np.array([4.0, -4.0]),
+        }
+        np.testing.assert_allclose(expression(values), [60002.0, -1.0])
+        assert Expression("atan2(y, 1) * 4 / pi")({"y": 1}) == pytest.approx(1.0)
+        assert isinstance(Expression("2 * pi")({}), float)
+        np.testing.assert_array_equal(Expression("0 < x <= 1 or not x")({"x": np.array([0.5, 2, 0])}), [1, 0, 1])
+        with pytest.raises(KeyError):
+            Expression("a + b")({"a": 1})
+
+    @pytest.mark.parametrize(
+        "source",
+        ["__import__('os')", "x.real()", "x[1:2]", "x[i]", "'text'", "lambda: 1", "open(x)", "sqrt(x=1)", "a +"],
+    )
+    def test_expression_rejected(self, source):
+        """Check everything but arithmetic over channels is rejected when compiling."""
+        with pytest.raises(ValueError):
+            Expression(source)
+
+    def test_computed_channels(self):
+        """Check channels are evaluated in order on frames and skipped if a source is missing."""
+        computed = ComputedChannels()
+        computed.add("power", "v * i")
+        computed.add("energy", "power * 0.5")
+        computed.add("v", "0")  # the real channel is kept
+        computed.add("offset", "1.5")
+        computed.add("other", "missing + 1")
+        with pytest.raises(ValueError):
+            computed.add("a b", "1")
+        frame = ScopeFrame({"v": np.array([1, 2, 3]), "i": np.array([2, 2, 2])}, sample_period=0.1)
+        result = computed.apply(frame)
+        assert result.names == ["v", "i", "power", "energy", "offset"]
+        np.testing.assert_array_equal(result["energy"], [1.0, 2.0, 3.0])
+        np.testing.assert_array_equal(result["offset"], [1.5, 1.5, 1.5])
+        assert result.sample_period == frame.sample_period
+        assert computed.evaluate({"v": 2.0, "i": 3.0}) == {"power": 6.0, "energy": 3.0, "offset": 1.5}
+        computed.remove("power")
+        assert ComputedChannels().apply(frame) is frame
+        assert computed.apply(frame).names == ["v", "i", "offset"]
+
+    def test_definitions_and_transformations(self):
+        """Check parsing definitions and the Clarke and Park transformations of balanced phases."""
+        assert parse_definitions("p = v * i;\n e = x == 1") == {"p": "v * i", "e": "x == 1"}
+        with pytest.raises(ValueError):
+            parse_definitions("v * i")
+        angle = np.linspace(0, 4 * np.pi, 50)
+        values = {
+            "theta": angle,
+            "ia": 2 * np.cos(angle),
+            "ib": 2 * np.cos(angle - 2 * np.pi / 3),
+            "ic": 2 * np.cos(angle + 2 * np.pi / 3),
+        }
+        computed = ComputedChannels()
+        for name, expression in clarke("ia", "ib", "ic").items():
+            computed.add(name, expression)
+        for name, expression in park("alpha", "beta", "theta").items():
+            computed.add(name, expression)
+        result = computed.evaluate(values)
+        np.testing.assert_allclose(result["alpha"], values["ia"], atol=1e-12)
+        np.testing.assert_allclose(result["d"], 2.0)
+        np.testing.assert_allclose(result["q"], 0.0, atol=1e-12)
+
+    def test_scope_frame(self, scope):
+        """Check computed channels follow the scope channels of every frame read."""
+        scope.add_computed_channel("product", "tmpSize * txBufFull")
+        frame = scope.get_scope_frame()
+        assert frame.names == [*CHANNELS, "product"]
+        np.testing.assert_array_equal(frame["product"], frame["tmpSize"].astype(float) * frame["txBufFull"])
+        scope.remove_computed_channel("product")
+        assert scope.get_scope_frame().names == CHANNELS
@@ -0,0 +1,61 @@
+"""Unit tests related to the decimation of scope data for plotting."""
+
+import numpy as np
+import pytest
+
+from pyx2cscope.scope.decimate import LTTB, MINMAX, lttb_indices, minmax_indices
+from pyx2cscope.scope.frame import ScopeFrame
+
+
+def lttb_reference(y, points):
+    """Select samples with a straightforward Largest-Triangle-Three-Buckets loop."""
+    size = len(y)
+    edges = [int(edge) for edge in np.linspace(1, size - 1, points - 1)]
+    selected = [0]
+    for bucket in range(points - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_start, next_stop = edges[bucket + 1], edges[bucket + 2]
+            next_x = sum(range(next_start, next_stop)) / (next_stop - next_start)
+            next_y = sum(y[next_start:next_stop]) / (next_stop - next_start)
+        else:
+            next_x, next_y = size - 1, y[-1]
+        px, py = selected[-1], y[selected[-1]]
+        areas = [abs((px - next_x) * (y[i] - py) - (px - i) * (next_y - py)) for i in range(start, stop)]
+        selected.append(start + areas.index(max(areas)))
+    return selected + [size - 1]
+
+
+class TestDecimation:
+    """Tests related to the decimation of scope data for plotting."""
+
+    def test_minmax_keeps_peaks(self):
+        """Check min/max decimation keeps the extremes of every bucket."""
+        rng = np.random.default_rng(1)
+        values = rng.normal(size=10001)
+        values[1234], values[8765] = 100.0, -100.0
+        indices = minmax_indices(values, 200)
+        assert len(indices) <= 200  # noqa: PLR2004
+        assert {1234, 8765} <= set(indices.tolist())
+        assert np.array_equal(minmax_indices(values[:150], 200), np.arange(150))
+
+    def test_lttb_matches_reference(self):
+        """Check the vectorised LTTB selects the same samples as the reference loop."""
+        values = np.sin(np.linspace(0, 20, 3000)) + np.linspace(0, 1, 3000) ** 3
+        indices = lttb_indices(values, 100)
+        assert len(indices) == 100  # noqa: PLR2004
+        assert indices.tolist() == lttb_reference(values.tolist(), 100)
+
+    def test_frame_decimate_window(self):
+        """Check a decimated frame keeps its time axis and a window decimates only the zoomed range."""
+        samples = 10000
+        frame = ScopeFrame({"a": np.sin(np.arange(samples) / 50.0), "b": np.arange(samples)}, sample_period=0.05)
+        decimated = frame.decimate(500, MINMAX)
+        assert len(decimated) <= 2 * 500  # noqa: PLR2004
+        assert np.allclose(decimated.time, decimated["b"] * 0.05)
+        assert decimated["a"].max() == frame["a"].max()
+        zoomed = frame.decimate(500, LTTB, window=(100.0, 110.0))  # 201 samples, not decimated
+        assert zoomed["b"].tolist() == list(range(2000, 2201))
+        assert len(frame) == samples
+        with pytest.raises(ValueError):
+            frame.decimate(500, "unknown")
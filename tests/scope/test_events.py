@@ -0,0 +1,50 @@
+"""Unit tests related to the event capture of scope frames."""
+
+import threading
+
+import numpy as np
+import pytest
+
+from pyx2cscope.scope.acquisition import Subscription
+from pyx2cscope.scope.events import EventCapture, exceeds, glitch
+from pyx2cscope.scope.frame import ScopeFrame
+
+
+class TestEventCapture:
+    """Tests related to keeping only the frames of events."""
+
+    @staticmethod
+    def make_frame(values, sequence=0, complete=True):
+        """Create a frame of one channel."""
+        return ScopeFrame({"i_a": np.asarray(values, dtype=float)}, sequence=sequence, complete=complete)
+
+    def test_predicates(self):
+        """Check the peak and glitch width detectors."""
+        assert exceeds("i_a", 12)(self.make_frame([0, -13, 2]))
+        assert not exceeds("i_a", 12)(self.make_frame([0, 12, -12]))
+        detector = glitch("i_a", 5, max_width=2)
+        assert detector(self.make_frame([0, 9, 9, 0, 0, 0]))
+        assert not detector(self.make_frame([0, 9, 9, 9, 0, 0]))
+        assert not detector(self.make_frame([9, 9, 0, 0, 0, 9]))  # pulses at the borders have no known width
+        assert detector(self.make_frame([9, 0, 0, 9, 9, 9, 0, 7, 0]))
+
+    def test_frames_before_events(self):
+        """Check matching frames are kept with the frames before them and counted."""
+        event = EventCapture(exceeds("i_a", 12), pre_frames=2)
+        subscription = Subscription(maxsize=10, event=event)
+        peaks = {3, 4, 9}
+        stop = threading.Event()
+        for sequence in range(12):
+            subscription.put(self.make_frame([0, 20 if sequence in peaks else 1], sequence), stop)
+        subscription.put(self.make_frame([0, 20], 12, complete=False), stop)
+        kept = [subscription.get(timeout=1).sequence for _ in range(len(subscription))]
+        assert kept == [1, 2, 3, 4, 7, 8, 9]
+        assert (event.evaluated, event.matched, event.kept) == (12, 3, 7)
+
+    def test_predicate_error(self):
+        """Check a failing predicate drops the frame and is counted."""
+        event = EventCapture(exceeds("unknown", 1))
+        assert event.process(self.make_frame([1, 2])) == []
+        assert event.errors == 1
+        with pytest.raises(ValueError):
+            EventCapture(exceeds("i_a", 1), pre_frames=-1)
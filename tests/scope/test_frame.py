@@ -0,0 +1,89 @@
+"""Unit tests related to ScopeFrame and sharing one readout of a capture."""
+
+import os
+
+import numpy as np
+import pytest
+
+from pyx2cscope.scope.frame import ScopeFrame
+from tests.scope import CHANNELS, SAMPLES
+
+
+class TestScopeFrame:
+    """Tests related to ScopeFrame and get_scope_frame."""
+
+    def test_frame_metadata(self, scope):
+        """Check time axis, trigger index and sequence number of consecutive frames."""
+        scope.set_sample_time(2)
+        scope.get_scope_sample_time(50)
+        first = scope.get_scope_frame()
+        second = scope.get_scope_frame()
+        assert second.sequence == first.sequence + 1
+        assert len(first) == SAMPLES
+        assert first.sample_period == pytest.approx(0.1)
+        assert first.time[-1] == pytest.approx(0.1 * (SAMPLES - 1))
+        assert first.trigger_index is None
+        assert first.to_dict() == scope.get_scope_channel_data()
+
+    def test_frame_dtype_and_trigger(self, scope):
+        """Check channels are contiguous arrays of the requested type and the trigger index is located."""
+        scope.scope_setup.scope_trigger.channel = scope.scope_setup.channels[CHANNELS[0]]
+        scope.scope_setup.scope_trigger.trigger_delay = 5
+        scope.lnet.scope_data.trigger_event_position = 30 * scope.scope_setup.get_dataset_size()
+        frame = scope.get_scope_frame(dtype=np.float32)
+        assert frame.trigger_index == 5  # noqa: PLR2004
+        assert frame.sample_period is None
+        for name in CHANNELS:
+            assert frame[name].dtype == np.float32
+            assert frame[name].flags["C_CONTIGUOUS"]
+
+    def test_frame_to_csv(self, tmp_path):
+        """Check the frame is stored with time axis and channel columns."""
+        frame = ScopeFrame({"a": np.arange(4), "b": np.arange(4) * 0.5}, sample_period=0.05)
+        filename = os.path.join(tmp_path, "frame.csv")
+        frame.to_csv(filename)
+        with open(filename) as file:
+            assert file.readline().strip() == "time (ms),a,b"
+        assert np.allclose(np.loadtxt(filename, delimiter=",", skiprows=1)[:, 2], frame["b"])
+
+
+class TestScopeFrameCache:
+    """Tests related to sharing one readout of a capture between consumers."""
+
+    def test_one_readout_per_capture(self, scope, mocker):
+        """Check the SDA is read once per capture and configuration, whatever the consumers ask for."""
+        mocker.patch.object(scope.lnet, "save_parameter")
+        mocker.patch.object(scope.lnet, "load_parameters", return_value=scope.lnet.scope_data)
+        scope.lnet.scope_data.scope_state = 0
+        first = scope.get_current_scope_frame()
+        reads = len(scope.ram.reads)
+        assert scope.get_current_scope_frame() is first
+        as_float = scope.get_current_scope_frame(dtype=np.float32)
+        assert as_float.sequence == first.sequence
+        assert as_float[CHANNELS[0]].dtype == np.float32
+        assert len(scope.ram.reads) == reads
+
+        scope.request_scope_data()
+        assert scope.get_current_scope_frame() is first  # the next capture is not complete yet
+        assert scope.is_scope_data_ready()
+        second = scope.get_current_scope_frame()
+        assert second.sequence == first.sequence + 1
+        assert len(scope.ram.reads) == 2 * reads
+
+        scope.set_sample_time(2)
+        assert scope.get_current_scope_frame() is not second
+        assert len(scope.ram.reads) == 3 * reads  # noqa: PLR2004
+
+    def test_derived_data_computed_once(self):
+        """Check derived data is computed on the first request and decimated frames are reused."""
+        frame = ScopeFrame({"a": np.arange(5000)}, sample_period=0.1)
+        calls = []
+
+        def scaled():
+            calls.append(1)
+            return frame.scaled("a", 2.0).tolist()
+
+        assert frame.cached(("scaled", "a", 2.0), scaled) is frame.cached(("scaled", "a", 2.0), scaled)
+        assert len(calls) == 1
+        assert frame.decimate(100) is frame.decimate(100)
+        assert frame.decimate(100) is not frame.decimate(200)
@@ -0,0 +1,69 @@
+"""Unit tests related to the motor analysis of scope frames."""
+
+import numpy as np
+import pytest
+
+from pyx2cscope.scope.decimate import MINMAX
+from pyx2cscope.scope.frame import ScopeFrame
+from pyx2cscope.scope.motor import analyze_cycles, find_rising_crossings, get_speed
+
+
+class TestMotorAnalysis:
+    """Tests related to the analysis of electrical cycles."""
+
+    FREQUENCY = 123.0  # Hz
+
+    @pytest.fixture
+    def frame(self):
+        """Create a capture of a distorted current, a leading voltage and a wrapping 16 bit angle at 20 kHz."""
+        t = np.arange(2000) * 0.05 / 1000
+        phase = 2 * np.pi * self.FREQUENCY * t
+        return ScopeFrame(
+            {
+                "i": 10 * np.sin(phase) + np.sin(3 * phase),
+                "v": 20 * np.sin(phase + np.pi / 6),
+                "angle": (np.mod(phase / (2 * np.pi) * 65536, 65536) - 32768).astype(np.int16),
+            },
+            sample_period=0.05,
+        )
+
+    def test_crossings(self):
+        """Check interpolated rising crossings and the hysteresis against noise."""
+        np.testing.assert_allclose(find_rising_crossings(np.array([-1, 1, -1, 0, 2, -1])), [0.5, 3.0])
+        noisy = np.array([-2, 0.1, -0.1, 0.1, 2, -2])
+        assert len(find_rising_crossings(noisy)) == 2  # noqa: PLR2004
+        np.testing.assert_allclose(find_rising_crossings(noisy, hysteresis=0.5), [3 + 0.4 / 1.9])
+        assert len(find_rising_crossings(np.array([1.0]))) == 0
+
+    def test_cycles(self, frame):
+        """Check frequency, RMS, THD and phase of every cycle."""
+        analysis = analyze_cycles(frame, "i", ["i", "v"])
+        assert len(analysis) == int(0.1 * self.FREQUENCY) - 1
+        np.testing.assert_allclose(analysis.frequency, self.FREQUENCY, rtol=1e-4)
+        assert np.all(analysis.starts[1:] == analysis.starts[:-1] + analysis.lengths[:-1])
+        np.testing.assert_allclose(analysis.rms["i"], np.sqrt((100 + 1) / 2), rtol=1e-2)
+        np.testing.assert_allclose(analysis.harmonics["i"][:, 2], 1.0, rtol=5e-2)
+        np.testing.assert_allclose(analysis.get_thd("i"), 0.1, rtol=5e-2)
+        np.testing.assert_allclose(analysis.get_phase("i", "v"), 30, atol=0.5)
+        summary = analysis.get_summary()
+        assert summary["cycles"] == len(analysis)
+        assert summary["thd"]["v"] < 0.01  # noqa: PLR2004
+        assert summary["phase"]["i"] == pytest.approx(0)
+        assert summary["phase"]["v"] == pytest.approx(30, abs=0.5)
+        assert "phase" not in analyze_cycles(frame, "i", ["v"]).get_summary()
+        silent = ScopeFrame({"i": np.sin(np.arange(100)), "z": np.zeros(100)})
+        assert analyze_cycles(silent, "i").get_summary()["phase"]["z"] is None
+        assert analyze_cycles(frame, "i", ["i", "v"]) is analysis
+        flat = analyze_cycles(ScopeFrame({"i": np.ones(100)}), "i")
+        assert len(flat) == 0
+        assert flat.get_summary() == {"reference": "i", "cycles": 0}
+        with pytest.raises(ValueError):
+            analyze_cycles(frame.decimate(100, MINMAX), "i")
+
+    def test_speed(self, frame):
+        """Check the speed from a wrapping angle."""
+        speed = get_speed(frame, "angle", 65536)
+        np.testing.assert_allclose(speed[1:-1], self.FREQUENCY * 60, rtol=1e-2)
+        np.testing.assert_allclose(get_speed(frame, "angle", 65536, pole_pairs=5), speed / 5)
+        with pytest.raises(ValueError):
+            get_speed(ScopeFrame({"angle": np.zeros(4)}), "angle", 65536)
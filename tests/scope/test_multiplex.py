@@ -0,0 +1,93 @@
+"""Unit tests related to time multiplexed captures."""
+
+import numpy as np
+import pytest
+
+from mchplnet.services.scope import ScopeChannel
+from pyx2cscope.scope.frame import ScopeFrame
+from pyx2cscope.scope.multiplex import MultiplexCapture, merge_frames, plan_groups
+from pyx2cscope.x2cscope import TriggerConfig
+from tests.scope import CHANNELS, SAMPLES
+
+
+class TestMultiplexCapture:
+    """Tests related to capturing more channels than the scope supports."""
+
+    def test_plan_groups(self):
+        """Check channels are distributed over the least groups with balanced dataset sizes."""
+        widths = [4, 4, 4, 2, 2, 2, 1, 1, 1, 1]
+        channels = [ScopeChannel(f"ch{i}", 0x1000 + 4 * i, width, 0) for i, width in enumerate(widths)]
+        plan = plan_groups(channels, 1200, max_channels=4)
+        assert plan.captures == 3  # noqa: PLR2004
+        assert sorted(name for group in plan.groups for name in group) == sorted(ch.name for ch in channels)
+        assert max(plan.dataset_sizes) == 8  # noqa: PLR2004
+        assert plan.samples == 150  # noqa: PLR2004
+
+    def test_merge_frames(self):
+        """Check frames are cut to the samples all have around the trigger event."""
+        first = ScopeFrame({"a": np.arange(9)}, sample_period=0.1, trigger_index=4)
+        second = ScopeFrame({"b": np.arange(8)}, sample_period=0.1, trigger_index=2, sequence=7)
+        merged = merge_frames([first, second])
+        assert merged.trigger_index == 2  # noqa: PLR2004
+        np.testing.assert_array_equal(merged["a"], np.arange(2, 9))
+        np.testing.assert_array_equal(merged["b"], np.arange(7))
+        assert merged.sequence == 7  # noqa: PLR2004
+        with pytest.raises(ValueError):
+            merge_frames([first, ScopeFrame({"c": np.arange(8)}, sample_period=0.1)])
+
+    def test_capture(self, scope, mocker):
+        """Check every group is armed once with the shared trigger and all channels end up in one frame."""
+        save = mocker.patch.object(scope.lnet, "save_parameter")
+        mocker.patch.object(scope, "wait_for_scope_data", return_value=True)
+
+        def get_scope_frame(computed=True):
+            assert not computed
+            assert scope.scope_setup.scope_trigger.channel.name == CHANNELS[0]
+            names = list(scope.scope_setup.channels)
+            return ScopeFrame({name: np.arange(SAMPLES) for name in names}, sample_period=0.1, trigger_index=10)
+
+        mocker.patch.object(scope, "get_scope_frame", side_effect=get_scope_frame)
+        variables = [scope.get_variable(name) for name in CHANNELS]
+        trigger = TriggerConfig(variables[0], trigger_level=1)
+        capture = MultiplexCapture(scope, variables, trigger, max_channels=2)
+        assert capture.plan.captures == 2  # noqa: PLR2004
+        frame = capture.capture(timeout=1)
+        assert save.call_count == 2  # noqa: PLR2004
+        assert sorted(frame) == sorted(CHANNELS)
+        assert len(frame) == SAMPLES
+        mocker.patch.object(scope, "wait_for_scope_data", return_value=False)
+        assert capture.capture(timeout=1) is None
+
+    def test_computed_channels_across_groups(self, scope, mocker, caplog):
+        """Check computed channels combine channels of different groups and unsatisfiable ones are reported."""
+        mocker.patch.object(scope.lnet, "save_parameter")
+        mocker.patch.object(scope, "wait_for_scope_data", return_value=True)
+
+        def get_scope_frame(computed=True):
+            frame = ScopeFrame(
+                {
+                    name: np.full(SAMPLES, index + 1)
+                    for index, name in enumerate(CHANNELS)
+                    if name in scope.scope_setup.channels
+                },
+                sample_period=0.1,
+                trigger_index=10,
+            )
+            return scope.computed_channels.apply(frame) if computed else frame
+
+        mocker.patch.object(scope, "get_scope_frame", side_effect=get_scope_frame)
+        scope.add_computed_channel("total", f"{CHANNELS[0]} + {CHANNELS[2]}")
+        scope.add_computed_channel("double", "2 * total")
+        variables = [scope.get_variable(name) for name in CHANNELS]
+        capture = MultiplexCapture(scope, variables, TriggerConfig(variables[0], trigger_level=1), max_channels=1)
+        assert capture.get_unavailable_computed_channels() == []
+        frame = capture.capture(timeout=1)
+        np.testing.assert_array_equal(frame["total"], np.full(SAMPLES, 4.0))
+        np.testing.assert_array_equal(frame["double"], np.full(SAMPLES, 8.0))
+        assert "not covered" not in caplog.text
+
+        scope.add_computed_channel("offset", "unknown - 1")
+        assert capture.get_unavailable_computed_channels() == ["offset"]
+        frame = capture.capture(timeout=1)
+        assert "offset" not in frame
+        assert "not covered by the multiplexed variables: offset" in caplog.text
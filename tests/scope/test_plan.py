@@ -0,0 +1,50 @@
+"""Unit tests related to planning the capacity of the scope data array."""
+
+import pytest
+
+from mchplnet.services.scope import ScopeChannel
+from pyx2cscope.scope.plan import MAX_PRESCALER, plan_capacity
+from tests.scope import SAMPLES
+
+
+class TestScopePlan:
+    """Tests related to planning the capacity of the scope data array."""
+
+    def test_plan_current_channels(self, scope):
+        """Check samples, prescaler and window of the current channels and the narrowing suggestion."""
+        scope.get_scope_sample_time(50)
+        plan = scope.plan_scope(desired_window_ms=8)
+        assert plan.dataset_size == 7  # noqa: PLR2004
+        assert plan.samples == SAMPLES
+        assert plan.prescaler == 2  # noqa: PLR2004
+        assert plan.window_ms == pytest.approx(10)
+        assert plan.unused_bytes == 0
+        assert not plan.warnings
+        assert [(item.name, item.representation, item.samples) for item in plan.suggestions] == [
+            ("txBufFull", "uint16", 140)
+        ]
+        assert plan.narrowed_samples == 140  # noqa: PLR2004
+
+    def test_plan_warnings(self, scope):
+        """Check unused tail bytes and unreachable windows are reported."""
+        plan = scope.plan_scope(["tmpSize", "Sin2_Table8[3]"], desired_window_ms=1e9, sample_period_us=50)
+        assert plan.samples == 233  # noqa: PLR2004
+        assert plan.unused_bytes == 1
+        assert plan.prescaler == MAX_PRESCALER
+        assert len(plan.warnings) == 2  # noqa: PLR2004
+        with pytest.raises(ValueError):
+            scope.plan_scope(["tmpSize"])
+        with pytest.raises(ValueError):
+            scope.plan_scope(["unknown_variable"], sample_period_us=50)
+
+    def test_float_suggestion(self):
+        """Check a float channel is suggested as Q15 value."""
+        channels = [
+            ScopeChannel("speed", 0x1000, 4, 0, is_integer=False, is_signed=True),
+            ScopeChannel("current", 0x1004, 2, 0, is_integer=True, is_signed=True),
+        ]
+        plan = plan_capacity(channels, 600, 100)
+        assert plan.samples == 100  # noqa: PLR2004
+        assert plan.prescaler == 1
+        assert plan.suggestions[0].representation == "Q15 int16"
+        assert plan.narrowed_samples == 150  # noqa: PLR2004
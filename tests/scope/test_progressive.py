@@ -0,0 +1,44 @@
+"""Unit tests related to reading untriggered captures progressively."""
+
+import numpy as np
+import pytest
+
+from pyx2cscope.scope.progressive import ProgressiveReadout
+from tests.scope import CHANNELS, SAMPLES
+
+
+class TestProgressiveReadout:
+    """Tests related to reading untriggered captures while they are sampled."""
+
+    def test_partial_frames(self, scope, mocker):
+        """Check written datasets are read once, in chunks, and the last frame matches a complete readout."""
+        scope_data = scope.lnet.scope_data
+        dataset_size = scope.scope_setup.get_dataset_size()
+        scope_data.scope_state = 2
+        scope_data.data_array_used_length = SAMPLES * dataset_size
+        pointers = iter([0, 100, 300, 350, scope_data.data_array_used_length])
+
+        def load_parameters():
+            scope_data.data_array_pointer = next(pointers)
+            return scope_data
+
+        mocker.patch.object(scope.lnet, "load_parameters", side_effect=load_parameters)
+        readout = scope.get_progressive_readout()
+        frames = list(readout.frames(timeout=5))
+
+        assert [len(frame) for frame in frames] == [300 // dataset_size, SAMPLES]
+        assert [frame.complete for frame in frames] == [False, True]
+        assert frames[0].sequence == frames[1].sequence
+        assert sum(size for _, size in scope.ram.reads) == readout.size
+        expected = scope.get_scope_channel_arrays(valid_data=False)
+        for name in CHANNELS:
+            assert np.array_equal(frames[-1][name], expected[name])
+            assert np.array_equal(frames[0][name], expected[name][: len(frames[0])])
+
+    def test_triggered_capture_not_supported(self, scope):
+        """Check a triggered capture cannot be read progressively."""
+        scope.scope_setup.set_trigger(scope.scope_setup.scope_trigger)
+        scope.scope_setup.scope_trigger.channel = scope.scope_setup.channels[CHANNELS[0]]
+        assert not ProgressiveReadout.is_supported(scope)
+        with pytest.raises(ValueError):
+            scope.get_progressive_readout()
@@ -0,0 +1,157 @@
+"""Unit tests related to streaming scope frames to disk and querying recordings."""
+
+import os
+import shutil
+import time
+
+import numpy as np
+import pytest
+
+from pyx2cscope.scope.frame import ScopeFrame
+from pyx2cscope.scope.index import RecordingIndex
+from pyx2cscope.scope.recorder import ScopeRecorder, ScopeRecording, get_zone, iter_recording
+from tests.scope import CHANNELS
+
+
+class TestScopeRecorder:
+    """Tests related to streaming scope frames to disk."""
+
+    @staticmethod
+    def make_frame(sequence, samples=50):
+        """Create a frame with an int16 and a float32 channel depending on the sequence number."""
+        channels = {
+            "a": np.arange(samples, dtype=np.int16) + sequence,
+            "b": np.linspace(0, 1, samples, dtype=np.float32) * sequence,
+        }
+        return ScopeFrame(channels, sample_period=0.05, timestamp=1000.0 + sequence, sequence=sequence)
+
+    def test_rotation_and_memmap(self, tmp_path):
+        """Check frames are split into parts and read back as memory mapped views."""
+        prefix = os.path.join(tmp_path, "run")
+        frame_size = 50 * 6
+        with ScopeRecorder(prefix, max_file_size=256 + 3 * frame_size) as recorder:
+            for sequence in range(1, 6):
+                recorder.write(self.make_frame(sequence))
+            recorder.write(ScopeFrame(self.make_frame(6).channels, complete=False))  # partial frames are skipped
+        assert recorder.captures == 5  # noqa: PLR2004
+        parts = list(iter_recording(prefix))
+        assert [len(part) for part in parts] == [3, 2]
+        assert isinstance(parts[0]["a"], np.memmap)
+        assert parts[1]["a"].shape == (2, 50)
+        assert np.array_equal(parts[1]["b"][1], self.make_frame(5)["b"])
+        frame = parts[0].get_frame(2)
+        assert frame.sequence == 3  # noqa: PLR2004
+        assert frame.timestamp == 1003.0  # noqa: PLR2004
+        assert frame.trigger_index is None
+        assert np.array_equal(frame["a"], self.make_frame(3)["a"])
+
+    def test_new_part_on_configuration_change(self, tmp_path):
+        """Check a different number of samples starts a new part and incomplete captures are ignored."""
+        prefix = os.path.join(tmp_path, "run")
+        with ScopeRecorder(prefix) as recorder:
+            recorder.write(self.make_frame(1))
+            recorder.write(self.make_frame(2, samples=20))
+            recorder.write(self.make_frame(3, samples=20))
+        with open(recorder.files[1], "ab") as file:
+            file.write(b"\x00" * 10)  # capture interrupted while writing
+        assert len(recorder.files) == 2  # noqa: PLR2004
+        assert len(ScopeRecording(recorder.files[1])) == 2  # noqa: PLR2004
+
+    def test_existing_recording_is_kept(self, tmp_path):
+        """Check an existing prefix is refused and parts of another session are not merged."""
+        prefix = os.path.join(tmp_path, "run")
+        with ScopeRecorder(prefix, max_file_size=256 + 50 * 6) as recorder:
+            for sequence in range(1, 4):
+                recorder.write(self.make_frame(sequence))
+        assert len(recorder.files) == 3  # noqa: PLR2004
+        with pytest.raises(FileExistsError):
+            ScopeRecorder(prefix)
+
+        # a shorter recording replacing the first part by hand
+        other = os.path.join(tmp_path, "other")
+        with ScopeRecorder(other) as recorder:
+            recorder.write(self.make_frame(4))
+        for extension in (".x2crec", ".x2cidx", ".x2czone"):
+            shutil.copy(f"{other}_0000{extension}", f"{prefix}_0000{extension}")
+        parts = list(iter_recording(prefix))
+        assert len(parts) == 1
+        assert parts[0].header["session"] == recorder.session
+        assert parts[0].get_frame(0).sequence == 4  # noqa: PLR2004
+
+    def test_empty_frame_is_skipped(self, tmp_path):
+        """Check a frame without samples is not written and its zone summary is NaN."""
+        empty = self.make_frame(1, samples=0)
+        assert np.isnan(get_zone(empty)["channels"]["a"]["max"][0])
+        with ScopeRecorder(os.path.join(tmp_path, "run")) as recorder:
+            recorder.write(empty)
+            recorder.write(self.make_frame(2))
+        assert recorder.captures == 1
+        assert len(ScopeRecording(recorder.files[0])) == 1
+
+    def test_attach_to_acquisition(self, scope, mocker, tmp_path):
+        """Check every frame of a continuous acquisition is written."""
+        mocker.patch.object(scope, "is_scope_data_ready", return_value=True)
+        mocker.patch.object(scope, "request_scope_data")
+        recorder = ScopeRecorder(os.path.join(tmp_path, "acquisition"))
+        acquisition = scope.start_acquisition()
+        recorder.attach(acquisition)
+        while recorder.captures < 3:  # noqa: PLR2004
+            time.sleep(0.01)
+        scope.stop_acquisition()
+        recorder.close()
+        recording = ScopeRecording(recorder.files[0])
+        assert len(recording) == recorder.captures
+        assert recording.names == CHANNELS
+        assert np.array_equal(recording[CHANNELS[0]][0], scope.get_scope_channel_arrays()[CHANNELS[0]])
+
+    def test_write_error_releases_acquisition(self, scope, mocker, tmp_path):
+        """Check a failing recorder unsubscribes, so the acquisition keeps serving its other consumers."""
+        mocker.patch.object(scope, "is_scope_data_ready", return_value=True)
+        mocker.patch.object(scope, "request_scope_data")
+        recorder = ScopeRecorder(os.path.join(tmp_path, "full"))
+        mocker.patch.object(recorder, "write", side_effect=OSError("No space left on device"))
+        acquisition = scope.start_acquisition()
+        frames = acquisition.subscribe(maxsize=1)
+        recorder.attach(acquisition, maxsize=2)
+        sequences = [frames.get(timeout=5).sequence for _ in range(10)]
+        scope.stop_acquisition()
+        assert sequences == sorted(sequences)
+        assert isinstance(recorder.error, OSError)
+        with pytest.raises(OSError):
+            recorder.close()
+
+    def test_zone_map_query(self, tmp_path):
+        """Check time range and value queries skip captures by their zone map."""
+        prefix = os.path.join(tmp_path, "run")
+        with ScopeRecorder(prefix, max_file_size=256 + 3 * 50 * 6) as recorder:
+            for sequence in range(1, 6):
+                recorder.write(self.make_frame(sequence))
+        index = RecordingIndex(prefix)
+        assert len(index) == 5  # noqa: PLR2004
+
+        frames = list(index.query(start=1002.0, end=1004.0))
+        assert [frame.sequence for frame in frames] == [2, 3, 4]
+        frames = list(index.query(start=1002.0, where={"a": (52, None), "b": (3.5, 4.5)}))
+        assert [frame.sequence for frame in frames] == [4, 5]
+        assert (index.stats.captures, index.stats.candidates, index.stats.matches) == (4, 2, 2)
+
+        # the zone map of every capture overlaps the bounds, but no integer sample is inside
+        assert len(index.find(where={"a": (10.5, 10.7)}, exact=False)) == 5  # noqa: PLR2004
+        assert index.find(where={"a": (10.5, 10.7)}) == []
+        with pytest.raises(ValueError):
+            index.find(where={"unknown": (0, 1)})
+
+    def test_zone_map_rebuilt(self, tmp_path):
+        """Check the zone map is computed from the data if its file is missing."""
+        prefix = os.path.join(tmp_path, "run")
+        with ScopeRecorder(prefix) as recorder:
+            for sequence in range(1, 4):
+                recorder.write(self.make_frame(sequence))
+        stored = ScopeRecording(recorder.files[0]).zones
+        os.remove(recorder.files[0].replace(".x2crec", ".x2czone"))
+        rebuilt = ScopeRecording(recorder.files[0]).zones
+        for name in ["a", "b"]:
+            for field in ["min", "max", "mean"]:
+                assert np.allclose(rebuilt["channels"][name][field], stored["channels"][name][field])
+        assert np.allclose(rebuilt["t_start"], stored["t_start"])
+        assert stored["channels"]["a"]["max"].tolist() == [50, 51, 52]
@@ -0,0 +1,45 @@
+"""Unit tests related to scope channels of scaled variables."""
+
+import os
+
+import numpy as np
+
+from pyx2cscope.scope.recorder import ScopeRecorder, ScopeRecording
+
+
+class TestScaling:
+    """Tests related to scope channels of variables with Q format."""
+
+    def test_scope_frame_physical(self, scope):
+        """Check scaled channels are converted to float and carry their unit, other channels are unchanged."""
+        raw = scope.get_scope_frame()
+        scope.set_scaling("tmpSize", q_format=8, gain=10.0, offset=-1.0, unit="A")
+        frame = scope.get_scope_frame()
+        assert frame["tmpSize"].dtype == np.float64
+        assert np.allclose(frame["tmpSize"], raw["tmpSize"] * 10.0 / 256 - 1.0)
+        assert np.array_equal(frame["txBufFull"], raw["txBufFull"])
+        assert frame.units == {"tmpSize": "A"}
+        assert scope.get_scope_frame(dtype=np.float32)["tmpSize"].dtype == np.float32
+
+    def test_scaled_accessors_agree(self, scope):
+        """Check all scope accessors return physical values by default and raw values with scaled=False."""
+        scope.set_scaling("tmpSize", q_format=8, gain=10.0, offset=-1.0, unit="A")
+        frame = scope.get_scope_frame()
+        assert np.array_equal(scope.get_scope_channel_arrays()["tmpSize"], frame["tmpSize"])
+        assert scope.get_scope_channel_data()["tmpSize"] == frame["tmpSize"].tolist()
+        raw = np.asarray(scope.get_scope_channel_views()["tmpSize"])
+        assert np.array_equal(scope.get_scope_channel_arrays(scaled=False)["tmpSize"], raw)
+        assert scope.get_scope_channel_data(scaled=False)["tmpSize"] == raw.tolist()
+        raw_frame = scope.get_scope_frame(scaled=False)
+        assert np.array_equal(raw_frame["tmpSize"], raw)
+        assert raw_frame.units == {}
+
+    def test_units_are_recorded(self, scope, tmp_path):
+        """Check the units of a frame are stored in the recording header."""
+        scope.set_scaling("tmpSize", q_format=15, unit="V")
+        prefix = os.path.join(tmp_path, "run")
+        with ScopeRecorder(prefix) as recorder:
+            recorder.write(scope.get_scope_frame())
+        frame = ScopeRecording(recorder.files[0]).get_frame(0)
+        assert frame.units == {"tmpSize": "V"}
+        assert frame["tmpSize"].dtype == np.float64
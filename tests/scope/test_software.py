@@ -0,0 +1,79 @@
+"""Unit tests related to the software scope sampling variables from the host."""
+
+import os
+import time
+
+import numpy as np
+import pytest
+
+from pyx2cscope.scope.recorder import ScopeRecorder, ScopeRecording
+from pyx2cscope.scope.software import TIME_CHANNEL, SoftwareScope
+from tests.utils.ram_stub import RamStub
+
+
+class TestSoftwareScope:
+    """Tests related to sampling variables from the host."""
+
+    names = ["x2cScope.ID", "x2cScope.arraySize", "x2cScope.state", "x2cScope.stf", "x2cScope.trgCount"]
+
+    @pytest.fixture
+    def software_scope(self, scope, mocker):
+        """Create a software scope on a larger fake RAM."""
+        scope.ram = RamStub(start=0x1000, size=0xA000).patch(mocker, scope.lnet)
+        return SoftwareScope(scope, [scope.get_variable(name) for name in self.names], capacity=50, block_size=20)
+
+    def test_coalesced_samples(self, scope, software_scope):
+        """Check all variables are read in merged regions and decoded like single reads."""
+        reads = len(scope.ram.reads)
+        software_scope.read_sample()
+        assert len(scope.ram.reads) - reads == len(software_scope.regions) < len(self.names)
+        frame = software_scope.get_samples()
+        assert len(frame) == 1
+        for name in self.names:
+            info = scope.variable_factory.parser.variable_map[name]
+            offset = info.address - scope.ram.start
+            assert frame[name][0] == int.from_bytes(scope.ram.memory[offset : offset + info.byte_size], "little")
+        assert software_scope.get_latency()[0] > 0
+
+    def test_ring_buffer_and_blocks(self, software_scope):
+        """Check blocks are published in order and the ring buffer keeps the latest samples."""
+        frames = software_scope.subscribe(maxsize=10)
+        for _ in range(70):
+            software_scope.poll()
+        assert len(frames) == 3  # noqa: PLR2004
+        assert [frames.get(timeout=1).sequence for _ in range(3)] == [1, 2, 3]
+        samples = software_scope.get_samples()
+        assert len(samples) == 50  # noqa: PLR2004
+        assert np.all(np.diff(samples[TIME_CHANNEL]) > 0)
+        assert len(software_scope.get_samples(last=5)) == 5  # noqa: PLR2004
+
+    def test_trigger(self, scope, software_scope):
+        """Check the trigger fires on the rising edge of the condition and frames hold pre and post samples."""
+        info = scope.variable_factory.parser.variable_map["x2cScope.state"]
+        offset = info.address - scope.ram.start
+        software_scope.set_trigger(lambda sample: sample["x2cScope.state"] == 1, pre=3, post=4)
+        frames = software_scope.subscribe(maxsize=10)
+        for number in range(30):
+            scope.ram.memory[offset : offset + 2] = bytes([1 if 10 <= number < 15 else 0, 0])  # noqa: PLR2004
+            software_scope.poll()
+        assert len(frames) == 1
+        frame = frames.get(timeout=1)
+        assert len(frame) == 7  # noqa: PLR2004
+        assert frame.trigger_index == 3  # noqa: PLR2004
+        assert list(frame["x2cScope.state"]) == [0, 0, 0, 1, 1, 1, 1]
+        with pytest.raises(ValueError):
+            software_scope.set_trigger(lambda sample: True, pre=40, post=20)
+
+    def test_thread_and_recording(self, software_scope, tmp_path):
+        """Check the sampling thread feeds a recorder."""
+        prefix = os.path.join(tmp_path, "software")
+        with ScopeRecorder(prefix) as recorder:
+            recorder.attach(software_scope)
+            software_scope.start()
+            deadline = time.perf_counter() + 5
+            while recorder.captures < 2 and time.perf_counter() < deadline:  # noqa: PLR2004
+                time.sleep(0.01)
+            software_scope.stop()
+        assert software_scope.get_stats().samples >= 40  # noqa: PLR2004
+        recording = ScopeRecording(recorder.files[0])
+        assert recording[TIME_CHANNEL].shape[1] == 20  # noqa: PLR2004
@@ -0,0 +1,72 @@
+"""Unit tests related to the spectrum analysis of scope frames."""
+
+import numpy as np
+import pytest
+
+from pyx2cscope.scope.decimate import MINMAX
+from pyx2cscope.scope.frame import ScopeFrame
+from pyx2cscope.scope.spectrum import HANN, RECTANGULAR, Spectrogram, SpectrumAnalyzer, get_spectrum, get_window
+
+
+class TestSpectrum:
+    """Tests related to the spectrum of scope captures."""
+
+    @staticmethod
+    def sine(amplitude, frequency, offset=0.0, samples=200, sample_period=0.1):
+        """Create a capture of a sine, sample_period in milliseconds."""
+        t = np.arange(samples) * sample_period / 1000
+        return ScopeFrame({"a": offset + amplitude * np.sin(2 * np.pi * frequency * t)}, sample_period=sample_period)
+
+    def test_amplitude(self):
+        """Check the peak is at the frequency of the sine and shows its amplitude."""
+        frame = self.sine(3.0, 100, offset=5.0)
+        spectrum = get_spectrum(frame, RECTANGULAR)
+        assert spectrum.frequencies[1] == pytest.approx(50)  # 200 samples at 10 kHz
+        assert spectrum.frequencies[np.argmax(spectrum.amplitudes["a"])] == pytest.approx(100)
+        assert spectrum.amplitudes["a"].max() == pytest.approx(3.0)
+        assert spectrum.amplitudes["a"][0] == pytest.approx(0, abs=1e-9)
+        undetrended = get_spectrum(frame, RECTANGULAR, detrend=False)
+        assert undetrended.amplitudes["a"][0] == pytest.approx(5.0)
+        assert get_spectrum(frame, HANN).amplitudes["a"].max() == pytest.approx(3.0, rel=1e-2)
+        assert get_spectrum(frame, RECTANGULAR).amplitudes["a"] is spectrum.amplitudes["a"]
+        assert get_window(HANN, 200) is get_window(HANN, 200)
+        with pytest.raises(ValueError):
+            get_window("triangle", 10)
+        with pytest.raises(ValueError):
+            get_spectrum(frame.decimate(50, MINMAX))
+
+    def test_analyzer_average(self):
+        """Check the average converges to the amplitude and restarts on a new layout."""
+        analyzer = SpectrumAnalyzer(RECTANGULAR, averages=4)
+        for amplitude in (1.0, 2.0, 3.0):
+            spectrum = analyzer.add(self.sine(amplitude, 100))
+        assert spectrum.frames == 3  # noqa: PLR2004
+        assert spectrum.amplitudes["a"].max() == pytest.approx(np.sqrt((1 + 4 + 9) / 3))
+        assert analyzer.add(ScopeFrame({"a": np.zeros(200)}, complete=False)) is None
+        spectrum = analyzer.add(self.sine(1.0, 100, samples=100))
+        assert analyzer.count == 1
+        assert spectrum.amplitudes["a"].max() == pytest.approx(1.0)
+        analyzer.reset()
+        assert analyzer.count == 0
+        assert (analyzer.window, analyzer.averages) == (RECTANGULAR, 4)
+        assert analyzer.add(self.sine(2.0, 100, samples=100)).amplitudes["a"].max() == pytest.approx(2.0)
+        with pytest.raises(ValueError):
+            SpectrumAnalyzer(averages=0)
+
+    def test_spectrogram(self):
+        """Check the spectrogram keeps the latest spectra in time order."""
+        spectrogram = Spectrogram("a", rows=3, window=RECTANGULAR)
+        assert spectrogram.get_image().shape == (0, 0)
+        for i, frequency in enumerate((100, 200, 300, 400)):
+            frame = self.sine(1.0, frequency)
+            frame.timestamp = float(i)
+            spectrogram.add(frame)
+        image = spectrogram.get_image()
+        assert image.shape == (3, 101)
+        np.testing.assert_allclose(spectrogram.frequencies[np.argmax(image, axis=1)], [200, 300, 400])
+        np.testing.assert_array_equal(spectrogram.timestamps, [1.0, 2.0, 3.0])
+        spectrogram.reset()
+        assert spectrogram.count == 0
+        assert spectrogram.frequencies is None
+        assert spectrogram.get_image().shape == (0, 0)
+        assert spectrogram.rows == 3  # noqa: PLR2004
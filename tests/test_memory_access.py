@@ -0,0 +1,224 @@
+"""Unit tests related to bulk memory access of the X2CScope class."""
+
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from pyx2cscope.snapshot import StateSnapshot, plan_regions
+from pyx2cscope.transfer import CAN, CAN_FD, SERIAL, TransferPlanner
+from pyx2cscope.variable.variable import VariableInfo
+from pyx2cscope.x2cscope import X2CScope
+from tests import data
+from tests.utils.ram_stub import RamStub
+from tests.utils.serial_stub import fake_serial
+
+ELF_FILE = os.path.join(os.path.dirname(data.__file__), "mc_foc_sl_fip_dspic33ck_mclv48v300w.elf")
+
+
+@pytest.fixture
+def scope(mocker):
+    """Create a 16 bit X2CScope instance connected to a fake serial port."""
+    fake_serial(mocker, 16)
+    x2c_scope = X2CScope(elf_file=ELF_FILE, port="COM1")
+    yield x2c_scope
+    x2c_scope.disconnect()
+
+
+@pytest.fixture
+def ram(mocker, scope):
+    """Replace the LNet RAM access of the scope instance by a fake RAM."""
+    return RamStub(start=0x1000, size=0xA000).patch(mocker, scope.lnet)
+
+
+class TestDumpMemory:
+    """Tests related to dump_memory and decode_memory."""
+
+    def test_dump_memory_reads_whole_region(self, scope, ram):
+        """Check the dump content matches the RAM and chunks do not exceed the LNet limit."""
+        dump = scope.dump_memory(0x1010, 1000)
+        assert isinstance(dump, np.ndarray)
+        assert dump.tobytes() == bytes(ram.memory[0x10:0x10 + 1000])
+        assert max(size for _, size in ram.reads) <= 253  # noqa: PLR2004
+
+    def test_dump_memory_progress_and_cancel(self, scope, ram):
+        """Check progress is reported per chunk and cancellation returns the partial dump."""
+        cancel = threading.Event()
+        progress = []
+
+        def on_progress(done, total):
+            progress.append(done)
+            if len(progress) == 2:  # noqa: PLR2004
+                cancel.set()
+
+        dump = scope.dump_memory(0x1000, 2000, progress=on_progress, cancel=cancel)
+        assert len(dump) == progress[-1]
+        assert len(progress) == 2  # noqa: PLR2004
+
+    def test_decode_memory(self, scope, ram):
+        """Check named values are decoded from a dump using the variable map."""
+        info = scope.variable_factory.parser.variable_map["Atan_Table16"]
+        dump = scope.dump_memory(info.address, info.byte_size)
+        values = scope.decode_memory(dump, info.address)
+        expected = np.frombuffer(dump.tobytes(), dtype="<i2")
+        assert np.array_equal(values["Atan_Table16"], expected)
+        assert values["Atan_Table16[1]"] == expected[1]
+
+
+class TestScaling:
+    """Tests related to Q format variables and their physical values."""
+
+    def test_set_scaling_pattern(self, scope):
+        """Check a pattern updates the array and all its elements, an exact name only one variable."""
+        assert scope.set_scaling("Atan_Table16*", q_format=15, gain=2.0, unit="rad") > 1
+        assert scope.set_scaling("Atan_Table16[1]", q_format=14) == 1
+        variable = scope.get_variable("Atan_Table16[2]")
+        assert variable.is_scaled()
+        assert variable.get_scaling() == (2.0 / 32768, 0.0)
+        assert variable.info.unit == "rad"
+        assert scope.get_variable("Atan_Table16[1]").get_scaling() == (1.0 / 16384, 0.0)
+        with pytest.raises(ValueError):
+            scope.set_scaling("Atan_Table16", gain=0)
+
+    def test_physical_read_and_write(self, scope, ram):
+        """Check arrays are read as physical values and writes store the rounded raw value."""
+        scope.set_scaling("Atan_Table16*", q_format=15, gain=2.0, offset=1.0)
+        variable = scope.get_variable("Atan_Table16")
+        raw = np.frombuffer(bytes(ram.memory[variable.info.address - ram.start :]), dtype="<i2", count=len(variable))
+        assert np.allclose(variable.get_value(), raw * 2.0 / 32768 + 1.0)
+
+        element = scope.get_variable("Atan_Table16[1]")
+        element.set_value(1.5)
+        offset = element.info.address - ram.start
+        assert int.from_bytes(ram.memory[offset : offset + 2], "little", signed=True) == 8192  # noqa: PLR2004
+        assert element.to_raw(np.array([1.0, 2.0])).tolist() == [0, 16384]
+        with pytest.raises(ValueError):
+            element.set_value(3.0)  # raw value 32768 exceeds int16
+
+    def test_decode_memory_and_side_file(self, scope, ram, tmp_path):
+        """Check scaling loaded from a side file is applied when decoding a dump."""
+        filename = os.path.join(tmp_path, "scaling.yml")
+        with open(filename, "w") as file:
+            file.write("Atan_Table16*: {q_format: 15, unit: rad}\nno_such_variable: {gain: 2}\n")
+        assert scope.load_scaling(filename) > 0
+        info = scope.variable_factory.parser.variable_map["Atan_Table16"]
+        dump = scope.dump_memory(info.address, info.byte_size)
+        values = scope.decode_memory(dump, info.address)
+        expected = np.frombuffer(dump.tobytes(), dtype="<i2") / 32768
+        assert np.allclose(values["Atan_Table16"], expected)
+        assert values["Atan_Table16[1]"] == pytest.approx(expected[1])
+
+        with open(filename, "w") as file:
+            file.write("Atan_Table16: {q: 15}\n")
+        with pytest.raises(ValueError):
+            scope.load_scaling(filename)
+
+
+class TestArrayRead:
+    """Tests related to reading arrays as shaped numpy arrays."""
+
+    def test_get_array_shape(self, scope, ram):
+        """Check a 2D array is returned with its dimensions in one chunked transfer."""
+        info = VariableInfo("table", "int", 24, 0, 0, 0x1100, 12, {}, dims=[3, 4])
+        variable = scope.get_variable_raw(info)
+        array = scope.get_array(variable)
+        expected = np.frombuffer(bytes(ram.memory[0x100:0x118]), dtype="<i2").reshape(3, 4)
+        assert array.shape == (3, 4)
+        assert np.array_equal(array, expected)
+        assert len(ram.reads) == 1
+        assert variable.get_value() == expected.ravel().tolist()
+
+    def test_get_struct_array(self, scope, mocker):
+        """Check an array of structs is decoded as structured array, by get_array and decode_memory."""
+        ram = RamStub(start=0x1000, size=0xB000).patch(mocker, scope.lnet)
+        info = scope.variable_factory.parser.get_var_info("inportParamIdTable")
+        array = scope.get_array("inportParamIdTable")
+        assert array.shape == (5,)
+        for k in range(5):
+            member = scope.variable_factory.parser.get_var_info(f"inportParamIdTable.id[{k}]")
+            offset = member.address - ram.start
+            assert array["id"][k] == int.from_bytes(ram.memory[offset : offset + 2], "little")
+        dump = scope.dump_memory(info.address, info.byte_size)
+        values = scope.decode_memory(dump, info.address, ["inportParamIdTable"])
+        assert np.array_equal(values["inportParamIdTable"], array)
+        with pytest.raises(ValueError):
+            scope.get_array("no_such_variable")
+
+
+class TestStateSnapshot:
+    """Tests related to save_state, restore_state and StateSnapshot."""
+
+    selection = ["x2cScope.ID", "x2cScope.dataSize", "x2cScope.arraySize", "x2cScope.state", "Atan_Table16"]
+
+    def test_const_variables_are_skipped(self, scope, ram):
+        """Check const variables are excluded by default and included on request."""
+        snapshot = scope.save_state(self.selection)
+        assert "Atan_Table16" not in snapshot
+        assert "x2cScope.state" in snapshot
+        assert "Atan_Table16" in scope.save_state(self.selection, include_const=True)
+
+    def test_save_restore_roundtrip(self, scope, ram, tmp_path):
+        """Check a restored snapshot brings back the original memory content."""
+        snapshot = scope.save_state(self.selection)
+        original = bytes(ram.memory)
+
+        ram.memory[0x1000:] = bytes(len(ram.memory) - 0x1000)
+        scope.restore_state(snapshot)
+        info = scope.variable_factory.parser.variable_map["x2cScope.dataSize"]
+        offset = info.address - ram.start
+        assert ram.memory[offset : offset + info.byte_size] == original[offset : offset + info.byte_size]
+
+        filename = os.path.join(tmp_path, "state.npz")
+        snapshot.save(filename)
+        loaded = StateSnapshot.load(filename)
+        assert loaded.names == snapshot.names
+        assert loaded.get_value("x2cScope.ID") == snapshot.get_value("x2cScope.ID")
+
+    def test_diff(self, scope, ram):
+        """Check the diff reports only variables that changed between two snapshots."""
+        before = scope.save_state(self.selection)
+        info = scope.variable_factory.parser.variable_map["x2cScope.arraySize"]
+        ram.memory[info.address - ram.start] ^= 0xFF
+        after = scope.save_state(self.selection)
+        assert list(before.diff(after)) == ["x2cScope.arraySize"]
+
+    def test_plan_regions(self):
+        """Check ranges are sorted and merged according to the gap tolerance."""
+        ranges = [(100, 4), (0, 2), (2, 2), (10, 2)]
+        assert plan_regions(ranges) == [(0, 4), (10, 2), (100, 4)]
+        assert plan_regions(ranges, max_gap=8) == [(0, 12), (100, 4)]
+
+
+class TestTransferPlanner:
+    """Tests related to the interface aware chunking of bulk transfers."""
+
+    def test_chunk_sizes(self):
+        """Check chunks fill whole packets on CAN and use the full frame on stream links."""
+        assert TransferPlanner(SERIAL, 2).read_chunk_size == 253  # noqa: PLR2004
+        assert TransferPlanner(SERIAL, 4).write_chunk_size == 249  # noqa: PLR2004
+        can = TransferPlanner(CAN, 2)
+        assert (can.read_chunk_size + 6) % 8 == 0
+        assert (can.write_chunk_size + 8) % 8 == 0  # frame: SYN, SIZE, NODE, Service-ID, address, size, data, CRC
+        assert TransferPlanner(CAN_FD, 2).read_chunk_size + 6 == 256  # noqa: PLR2004
+        assert TransferPlanner(SERIAL, 2, max_chunk_size=64).read_chunk_size == 64  # noqa: PLR2004
+
+    def test_plan_covers_region(self):
+        """Check the plan covers the region without gaps and CAN needs fewer packets than 253 byte chunks."""
+        can = TransferPlanner(CAN, 2)
+        plan = can.plan_read(0x1000, 2500)
+        assert plan[0][0] == 0x1000  # noqa: PLR2004
+        assert sum(size for _, size in plan) == 2500  # noqa: PLR2004
+        assert all(a + s == b for (a, s), (b, _) in zip(plan, plan[1:]))
+        assert can.count_read_packets(2500) < TransferPlanner(CAN, 2, max_chunk_size=253).count_read_packets(2500)
+
+    def test_bulk_access_uses_planner(self, scope, ram):
+        """Check dumps, writes and array reads are chunked by the selected link profile."""
+        scope.set_link_profile(CAN)
+        planner = scope.get_transfer_planner()
+        scope.dump_memory(0x1000, 1000)
+        scope.write_memory(0x1000, bytes(1000))
+        scope.get_variable("ScopeArray").get_value()
+        assert max(size for _, size in ram.reads) == planner.read_chunk_size
+        assert max(size for _, size in ram.writes) == planner.write_chunk_size
+        assert bytes(ram.memory[:1000]) == bytes(1000)
@@ -142,6 +142,25 @@ class TestParser:
         assert variable.is_array() == True, "variable should be an array"
         assert len(variable) == array_size_test, "array has wrong length"
 
+    def test_multi_dimensional_array_32(self, mocker):
+        """Given a valid 32 bit elf file, check the dimensions of a 2D array are kept."""
+        fake_serial(mocker, 32, device_profile=DEVICE_PROFILE_ARM)
+        x2c_scope = X2CScope(port="COM14", elf_file=self.elf_file_32)
+        variable = x2c_scope.get_variable("mcKeyI_AlgorithmKeys_gds.Keys")
+        assert variable.info.dims == [2, 32]
+        assert variable.get_shape() == (2, 32)
+        element = x2c_scope.get_variable("mcKeyI_AlgorithmKeys_gds.Keys[1][0]")
+        assert element.info.address == variable.info.address + 32  # noqa: PLR2004
+
+    def test_struct_array_dtype_16(self, mocker):
+        """Given a valid 16 bit elf file, check an array of structs maps to a structured type."""
+        fake_serial(mocker, 16)
+        x2c_scope = X2CScope(port="COM14", elf_file=self.elf_file_16)
+        info = x2c_scope.variable_factory.parser.get_var_info("motor.estimator.pll.lastIalphabeta")
+        dtype = x2c_scope.variable_factory.get_struct_dtype(info)
+        assert dtype.names == ("alpha", "beta")
+        assert dtype.itemsize * info.array_size == info.byte_size
+
     def test_variable_enum_32(self, mocker, size6=6, size3=3):
         """Given a valid dspic33ck elf file, check if an enum variable is read correctly."""
         fake_serial(mocker, 32, device_profile=DEVICE_PROFILE_ARM)
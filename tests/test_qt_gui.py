@@ -398,6 +398,77 @@ class TestQtWidgetCreation:
 
         assert tab is not None
 
+    def test_single_shot_waits_for_complete_capture(self, qt_application, mocker):
+        """Test single-shot sampling is not stopped by the partial frames of a progressive readout."""
+        import numpy as np
+
+        from pyx2cscope.gui.qt.models.app_state import AppState
+        from pyx2cscope.gui.qt.tabs.scope_view_tab import ScopeViewTab
+        from pyx2cscope.scope.frame import ScopeFrame
+
+        tab = ScopeViewTab(AppState())
+        stop = mocker.patch.object(tab, "_stop_sampling")
+        tab._sampling_active = True
+        tab._single_shot_checkbox.setChecked(True)
+
+        tab.on_scope_data_ready(ScopeFrame({"a": np.arange(10)}, sample_period=0.1, complete=False))
+        stop.assert_not_called()
+        tab.on_scope_data_ready(ScopeFrame({"a": np.arange(100)}, sample_period=0.1))
+        stop.assert_called_once()
+
+    def test_spectrogram_of_selected_channel(self, qt_application):
+        """Test the spectrogram offers the channels of the capture and adds a row per complete capture."""
+        import numpy as np
+
+        from pyx2cscope.gui.qt.models.app_state import AppState
+        from pyx2cscope.gui.qt.tabs.scope_view_tab import ScopeViewTab
+        from pyx2cscope.scope.frame import ScopeFrame
+
+        tab = ScopeViewTab(AppState())
+        tab._sampling_active = True
+        tab._spectrogram_checkbox.setChecked(True)
+        frame = ScopeFrame({"a": np.arange(100), "b": np.sin(np.arange(100) * 0.5)}, sample_period=0.1)
+
+        tab.on_scope_data_ready(frame)
+        assert [tab._spectrogram_combo.itemText(i) for i in range(tab._spectrogram_combo.count())] == ["a", "b"]
+        tab._spectrogram_combo.setCurrentText("b")
+        tab.on_scope_data_ready(frame)
+        tab.on_scope_data_ready(ScopeFrame(frame.channels, sample_period=0.1, complete=False))
+        tab.on_scope_data_ready(frame)
+        assert tab._spectrogram.channel == "b"
+        assert tab._spectrogram_image.image.shape == (2, 51)
+
+    def test_cycle_analysis_reference_and_speed(self, qt_application):
+        """Test the cycle analysis shows the phase relative to the selected channel and the speed."""
+        import numpy as np
+
+        from pyx2cscope.gui.qt.models.app_state import AppState
+        from pyx2cscope.gui.qt.tabs.scope_view_tab import ScopeViewTab
+        from pyx2cscope.scope.frame import ScopeFrame
+
+        tab = ScopeViewTab(AppState())
+        tab._sampling_active = True
+        tab._analysis_checkbox.setChecked(True)
+        phase = 2 * np.pi * 50 * np.arange(2000) * 0.05e-3
+        frame = ScopeFrame(
+            {
+                "i": np.sin(phase),
+                "v": np.sin(phase + np.pi / 6),
+                "angle": (np.mod(phase / (2 * np.pi) * 65536, 65536) - 32768).astype(np.int16),
+            },
+            sample_period=0.05,
+        )
+
+        tab.on_scope_data_ready(frame)
+        assert "cycles of i" in tab._analysis_label.text()
+        assert "v: RMS 0.7071, THD 0.00 %, phase 30.0°" in tab._analysis_label.text()
+        tab._reference_combo.setCurrentText("v")
+        tab._speed_combo.setCurrentText("angle")
+        tab.on_scope_data_ready(frame)
+        assert "cycles of v" in tab._analysis_label.text()
+        assert "i: RMS 0.7071, THD 0.00 %, phase -30.0°" in tab._analysis_label.text()
+        assert "speed from angle: 3000 rpm" in tab._analysis_label.text()
+
     def test_watch_view_tab_creation(self, qt_application):
         """Test WatchViewTab can be created."""
         from pyx2cscope.gui.qt.models.app_state import AppState
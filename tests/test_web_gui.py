@@ -12,6 +12,7 @@ import json
 import os
 from unittest.mock import MagicMock
 
+import numpy as np
 import pytest
 
 # HTTP status codes for test assertions
@@ -396,6 +397,66 @@ class TestWebScopeClass:
         """Test scope sample time default."""
         assert web_scope.scope_sample_time == 1
 
+    def test_scope_poll_delay(self, web_scope):
+        """Test the scope is polled at the predicted end of a running capture."""
+        assert web_scope.get_scope_poll_delay(0.1) == 0.1  # noqa: PLR2004
+        web_scope.x2c_scope = MagicMock()
+        web_scope.scope_trigger = True
+        web_scope.x2c_scope.get_scope_poll_delay.return_value = 0.02
+        assert web_scope.get_scope_poll_delay(0.1) == 0.02  # noqa: PLR2004
+        web_scope.x2c_scope.get_scope_poll_delay.return_value = None
+        assert web_scope.get_scope_poll_delay(0.1) == 0.1  # noqa: PLR2004
+
+    def test_spectrogram_data(self, web_scope):
+        """Test the spectrogram of the selected channel is sent as dB heatmap with reduced frequency bins."""
+        from pyx2cscope.gui.web.scope import SPECTROGRAM_BINS
+        from pyx2cscope.scope.frame import ScopeFrame
+
+        web_scope.set_spectrogram("a")
+        assert web_scope._get_spectrogram_data(ScopeFrame({"b": np.zeros(100)}, sample_period=0.1)) == {}
+        frame = ScopeFrame({"a": np.sin(np.arange(2000) * 0.1)}, sample_period=0.1)
+        web_scope._get_spectrogram_data(frame)
+        data = web_scope._get_spectrogram_data(frame)
+        assert data["channel"] == "a"
+        assert data["unit"] == "Hz"
+        assert data["max_frequency"] == 5000  # noqa: PLR2004
+        assert len(data["image"]) == 2  # noqa: PLR2004
+        assert len(data["image"][0]) <= SPECTROGRAM_BINS
+        web_scope.set_spectrogram("")
+        assert web_scope.spectrogram is None
+
+    def test_cycle_analysis_reference_and_speed(self, web_scope):
+        """Test the cycles and phase are referenced to the selected channel and the speed is sent if selected."""
+        from pyx2cscope.scope.frame import ScopeFrame
+
+        phase = 2 * np.pi * 50 * np.arange(2000) * 0.05e-3
+        frame = ScopeFrame(
+            {
+                "i": np.sin(phase),
+                "v": np.sin(phase + np.pi / 6),
+                "angle": (np.mod(phase / (2 * np.pi) * 65536, 65536) - 32768).astype(np.int16),
+            },
+            sample_period=0.05,
+        )
+        for name in ["i", "v"]:
+            variable = MagicMock()
+            variable.info.name = name
+            web_scope.scope_vars.append({"variable": variable, "enable": True, "gain": 1, "offset": 0})
+
+        web_scope.set_cycle_analysis(True)
+        summary = web_scope._get_cycle_analysis(frame)
+        assert summary["reference"] == "i"
+        assert summary["phase"]["v"] == pytest.approx(30, abs=0.5)
+        assert "speed" not in summary
+
+        web_scope.set_cycle_analysis(True, reference="v", position="angle", counts_per_revolution=65536)
+        summary = web_scope._get_cycle_analysis(frame)
+        assert summary["reference"] == "v"
+        assert summary["phase"]["i"] == pytest.approx(-30, abs=0.5)
+        assert summary["speed"]["rpm"] == pytest.approx(50 * 60, rel=1e-2)
+        with pytest.raises(ValueError):
+            web_scope.set_cycle_analysis(True, counts_per_revolution=0)
+
 
 class TestWebScopeVariableManagement:
     """Tests for WebScope variable management with mocked X2CScope."""
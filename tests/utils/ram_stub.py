@@ -0,0 +1,50 @@
+"""This module contains the implementation of RamStub.
+
+RamStub fakes the target RAM on LNet level, i.e. get_ram_array and put_ram, so bulk memory operations can be tested
+without building LNet frames byte by byte.
+"""
+
+
+class RamStub:
+    """Fakes the target RAM for get_ram_array and put_ram requests."""
+
+    def __init__(self, start: int = 0x1000, size: int = 0x4000):
+        """Constructor of the RamStub class.
+
+        Args:
+            start (int): The first valid RAM address.
+            size (int): The number of valid RAM bytes.
+        """
+        self.start = start
+        self.memory = bytearray(i & 0xFF for i in range(size))
+        self.reads = []
+        self.writes = []
+
+    def _offset(self, address: int, size: int) -> int:
+        offset = address - self.start
+        if offset < 0 or offset + size > len(self.memory):
+            raise ValueError(f"Address {address:#x} outside fake RAM")
+        return offset
+
+    def get_ram_array(self, address: int, bytes_to_read: int, data_type: int) -> bytearray:
+        """Return the fake RAM content, mimics LNet.get_ram_array."""
+        self.reads.append((address, bytes_to_read))
+        offset = self._offset(address, bytes_to_read)
+        return bytearray(self.memory[offset : offset + bytes_to_read])
+
+    def put_ram(self, address: int, size: int, value: bytearray):
+        """Store value into the fake RAM, mimics LNet.put_ram."""
+        self.writes.append((address, size))
+        offset = self._offset(address, size)
+        self.memory[offset : offset + size] = value[:size]
+
+    def patch(self, mocker, lnet):
+        """Patch the LNet instance to use this fake RAM.
+
+        Args:
+            mocker: Mocker inheritance
+            lnet: the LNet instance to be patched
+        """
+        mocker.patch.object(lnet, "get_ram_array", self.get_ram_array)
+        mocker.patch.object(lnet, "put_ram", self.put_ram)
+        return self